@@ -16,7 +16,8 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from database.operations import get_industries, save_edited_companies, clear_all_caches
-from database.connection import test_write_permission
+from database.connection import test_write_permission, invalidate_write_capability
+from database.companies import forget_company_codes
 
 
 def editable_companies_grid(companies_df, conn):
@@ -204,41 +205,90 @@ def simple_company_editor(companies_df, conn):
                         current_data['업체코드']
                     ))
                     conn.commit()
+                    forget_company_codes([current_data['업체코드']], [new_company_name])
                     st.success("✅ 기업 정보가 성공적으로 업데이트되었습니다!")
                     clear_all_caches()
                     st.rerun()
                     return True
                 except Exception as e:
+                    invalidate_write_capability()
                     st.error(f"❌ 업데이트 실패: {str(e)}")
                     return False
     
     return False
 
 
-def display_data_with_stats(df, title, key_prefix=""):
+def keyset_page_cursor(state_key, reset_token=None):
+    """
+    키셋 페이지 이동의 현재 커서 (세션별 커서 스택)
+    
+    Args:
+        state_key (str): 세션 상태 키
+        reset_token: 값이 바뀌면 첫 페이지로 (예: 선택한 기업)
+    
+    Returns:
+        tuple or None: 현재 페이지 커서 (첫 페이지면 None)
+    """
+    if st.session_state.get(f"{state_key}_reset") != reset_token or state_key not in st.session_state:
+        st.session_state[f"{state_key}_reset"] = reset_token
+        st.session_state[state_key] = [None]
+    return st.session_state[state_key][-1]
+
+
+def keyset_page_buttons(state_key, next_cursor, prev_label="⬅️ 이전", next_label="다음 ➡️"):
+    """
+    키셋 페이지 이동 버튼 (keyset_page_cursor와 함께 사용)
+    
+    Args:
+        state_key (str): keyset_page_cursor에 준 세션 상태 키
+        next_cursor (tuple): 조회 결과의 df.attrs['next_cursor']
+        prev_label (str): 이전 페이지 버튼 이름
+        next_label (str): 다음 페이지 버튼 이름
+    """
+    cursors = st.session_state[state_key]
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button(prev_label, disabled=len(cursors) == 1, key=f"{state_key}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button(next_label, disabled=next_cursor is None, key=f"{state_key}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.caption(f"{len(cursors)}페이지")
+
+
+def display_data_with_stats(df, title, key_prefix="", stats=None):
     """
     데이터프레임을 통계와 함께 표시
     
     Args:
-        df (pd.DataFrame): 표시할 데이터프레임
+        df (pd.DataFrame): 표시할 데이터프레임 (페이지일 수 있음)
         title (str): 제목
         key_prefix (str): 위젯 키 접두사
+        stats (dict): get_data_stats() 결과 (없으면 df에서 계산)
     """
     st.subheader(title)
     
     if not df.empty:
-        # 통계 정보 표시
+        # 통계 정보 표시 (stats가 있으면 SQL 집계값 사용)
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("총 레코드 수", len(df))
+            st.metric("총 레코드 수", stats['record_count'] if stats else len(df))
         
         with col2:
-            if '기업명' in df.columns:
+            if stats:
+                st.metric("기업 수", stats['company_count'])
+            elif '기업명' in df.columns:
                 st.metric("기업 수", df['기업명'].nunique())
         
         with col3:
-            if '매출액_2024' in df.columns and not df['매출액_2024'].isna().all():
+            if stats:
+                if stats['avg_revenue'] is not None:
+                    st.metric("평균 매출액", f"{stats['avg_revenue']:,.0f}")
+            elif '매출액_2024' in df.columns and not df['매출액_2024'].isna().all():
                 avg_revenue = df['매출액_2024'].mean()
                 st.metric("평균 매출액", f"{avg_revenue:,.0f}" if not pd.isna(avg_revenue) else "N/A")
         
@@ -0,0 +1,12 @@
+"""
+crm 패키지 초기화
+
+명령줄 도구 (python -m crm) - 화면 없이 일괄 작업 실행
+- 기업/연락처/상담 이력 일괄 가져오기 (xlsx/csv, 청크 단위 커밋)
+- 목록/변경분 내보내기, 백업, VACUUM/ANALYZE, 벤치마크
+- database 계층을 직접 사용하며 streamlit을 import하지 않음
+"""
+
+__all__ = [
+    'cli'
+]
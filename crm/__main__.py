@@ -0,0 +1,12 @@
+"""
+crm/__main__.py
+
+python -m crm 진입점
+"""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,461 @@
+"""
+crm/cli.py
+
+명령줄 도구 (cron, 대량 이전 작업용)
+
+사용법:
+    python -m crm [--db crm_database.db] import-companies FILE [--chunk-size 5000] [--sheet 시트명]
+    python -m crm import-contacts FILE
+    python -m crm import-consultations FILE
+    python -m crm export companies|contacts|consultations|integrated [--format csv|ndjson|xlsx] [--output PATH]
+    python -m crm export changes --consumer nightly [--format ndjson|csv] [--output PATH]
+    python -m crm backup OUTPUT [--excel]
+    python -m crm vacuum
+    python -m crm analyze
+    python -m crm benchmark [database.benchmark 인자...]
+
+가져오기 파일의 첫 행은 헤더이며, 화면 다운로드와 같은 한글 컬럼명
+(기업명, 고객명, 상담내역 등) 또는 DB 컬럼명(company_name 등)을 사용합니다.
+청크마다 커밋하므로 중간에 실패하면 그 전 청크까지는 저장되어 있습니다.
+"""
+
+import argparse
+import os
+import runpy
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+from database.settings import configure_database, create_connection, get_db_file_path
+from database.migrations import initialize_schema
+from database.paging import iter_pages, DEFAULT_PAGE_SIZE
+
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# 가져오기: 파일 컬럼명 → 저장 함수 입력 키 (DB 컬럼명은 그대로 허용)
+IMPORT_COLUMNS = {
+    'companies': {
+        '업체코드': 'company_code',
+        '기업명': 'company_name',
+        '매출액_2024': 'revenue_2024',
+        '업종': 'industry',
+        '종업원수': 'employee_count',
+        '주소': 'address',
+        '상품': 'products',
+        '고객구분': 'customer_category',
+    },
+    'contacts': {
+        '기업명': 'company_name',
+        '고객명': 'customer_name',
+        '직위': 'position',
+        '전화': 'phone',
+        '이메일': 'email',
+        '획득경로': 'acquisition_path',
+    },
+    'consultations': {
+        '기업명': 'company_name',
+        '고객명': 'customer_name',
+        '상담날짜': 'consultation_date',
+        '상담내역': 'consultation_content',
+        '프로젝트명': 'project_name',
+    },
+}
+
+EXPORT_DATASETS = ('companies', 'contacts', 'consultations', 'integrated', 'changes')
+
+# 내보내기 xlsx 시트명
+EXPORT_SHEETS = {
+    'companies': '기업목록',
+    'contacts': '고객연락처',
+    'consultations': '상담이력',
+    'integrated': '통합데이터',
+}
+
+
+def _log(message):
+    """진행 상황 출력 (표준 출력은 내보내기 데이터용)"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def _connect():
+    """쓰기 가능한 연결 (스키마 마이그레이션 적용 후)"""
+    conn = create_connection()
+    initialize_schema(conn)
+    return conn
+
+
+def _clean_value(value):
+    """빈 문자열/NaN은 None, 문자열은 앞뒤 공백 제거"""
+    if value is None:
+        return None
+    if isinstance(value, float) and pd.isna(value):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _iter_file_chunks(path, chunk_size, sheet=None):
+    """
+    xlsx/csv 파일을 헤더 기준 dict 목록으로 청크 단위 읽기 (파일 전체를 올리지 않음)
+
+    Yields:
+        list: [{컬럼명: 값}, ...]
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in ('.csv', '.txt'):
+        # 전화번호 앞자리 0 등이 숫자로 바뀌지 않도록 문자열로 읽음
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, encoding='utf-8-sig'):
+            yield [
+                {str(column).strip(): _clean_value(value) for column, value in row.items()}
+                for row in chunk.to_dict('records')
+            ]
+        return
+
+    if extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            rows = worksheet.iter_rows(values_only=True)
+            header = [str(column).strip() if column is not None else '' for column in next(rows, ())]
+            chunk = []
+            for row in rows:
+                record = {
+                    column: _clean_value(value) for column, value in zip(header, row) if column
+                }
+                if any(value is not None for value in record.values()):
+                    chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            workbook.close()
+        return
+
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {extension} (xlsx, csv만 가능)")
+
+
+def _map_records(dataset, records):
+    """파일 컬럼을 저장 함수 입력 키로 변환하고 값 형식 정리, 유효하지 않은 행 제외"""
+    from database.connection import parse_revenue
+    from utils.validators import validate_email, validate_consultation_content
+
+    mapping = IMPORT_COLUMNS[dataset]
+    allowed = set(mapping.values())
+    mapped = []
+    skipped = 0
+
+    for record in records:
+        row = {}
+        for column, value in record.items():
+            key = mapping.get(column, column)
+            if key in allowed:
+                row[key] = value
+
+        if dataset == 'companies':
+            row['revenue_2024'] = parse_revenue(row.get('revenue_2024'))
+            try:
+                employee_count = row.get('employee_count')
+                row['employee_count'] = int(float(employee_count)) if employee_count is not None else None
+            except (TypeError, ValueError):
+                row['employee_count'] = None
+        elif dataset == 'contacts':
+            valid, _ = validate_email(row.get('email'))
+            if not valid:
+                skipped += 1
+                continue
+        elif dataset == 'consultations':
+            content = row.get('consultation_content')
+            if content is not None:
+                valid, _ = validate_consultation_content(content)
+                if not valid:
+                    skipped += 1
+                    continue
+
+        mapped.append(row)
+
+    return mapped, skipped
+
+
+def import_file(conn, dataset, path, chunk_size=DEFAULT_CHUNK_SIZE, sheet=None):
+    """
+    파일을 청크 단위로 읽어 청크마다 한 트랜잭션으로 저장
+
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 autocommit 연결
+        dataset (str): 'companies', 'contacts', 'consultations'
+        path (str): xlsx/csv 파일 경로
+        chunk_size (int): 커밋 단위 행 수
+        sheet (str): xlsx 시트명 (기본값: 첫 시트)
+
+    Returns:
+        dict: rows (읽은 행), skipped (유효성 검사 제외), chunks (커밋한 청크)
+
+    Raises:
+        RuntimeError: 저장 실패 (이전 청크까지는 커밋됨)
+    """
+    from database.operations import insert_company_batch, insert_contact_batch, insert_consultation_batch
+    insert_batch = {
+        'companies': insert_company_batch,
+        'contacts': insert_contact_batch,
+        'consultations': insert_consultation_batch,
+    }[dataset]
+
+    summary = {'rows': 0, 'skipped': 0, 'chunks': 0}
+    for records in _iter_file_chunks(path, chunk_size, sheet):
+        rows, skipped = _map_records(dataset, records)
+        summary['skipped'] += skipped
+
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        success, message = insert_batch(conn, rows)
+        if not success:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise RuntimeError(f"{summary['rows']}행 이후 청크 저장 실패: {message}")
+        conn.execute("COMMIT")
+
+        summary['rows'] += len(records)
+        summary['chunks'] += 1
+        _log(f"[{summary['chunks']}] {summary['rows']:,}행 커밋 - {message} "
+             f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    return summary
+
+
+def export_dataset(conn, dataset, out, fmt='csv', page_size=DEFAULT_PAGE_SIZE):
+    """
+    목록을 키셋 페이지 단위로 읽어 CSV/NDJSON으로 스트리밍 기록
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        dataset (str): 'companies', 'contacts', 'consultations', 'integrated'
+        out: 텍스트 파일 객체
+        fmt (str): 'csv' 또는 'ndjson'
+        page_size (int): 한 번에 읽을 행 수
+
+    Returns:
+        int: 기록한 행 수
+    """
+    from database import operations
+    loader = getattr(operations, f"get_{dataset}_data")
+
+    def load(conn, cursor=None, page_size=None):
+        return loader(conn, cursor=cursor, page_size=page_size, compact=False)
+
+    rows = 0
+    for page in iter_pages(load, conn, page_size):
+        if fmt == 'csv':
+            page.to_csv(out, header=rows == 0, index=False)
+        elif not page.empty:
+            lines = page.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+            out.write(lines if lines.endswith('\n') else lines + '\n')
+        rows += len(page)
+    return rows
+
+
+def _open_output(path, binary=False):
+    """출력 파일 열기 ('-'는 표준 출력)"""
+    if path == '-':
+        return sys.stdout.buffer if binary else sys.stdout
+    if binary:
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def command_import(args, dataset):
+    """import-companies / import-contacts / import-consultations"""
+    conn = _connect()
+    try:
+        summary = import_file(conn, dataset, args.file, args.chunk_size, args.sheet)
+    except (RuntimeError, ValueError) as e:
+        _log(str(e))
+        return 1
+    finally:
+        conn.close()
+    _log(f"완료: {summary['rows']:,}행, 청크 {summary['chunks']}개, 유효성 제외 {summary['skipped']:,}행")
+    return 0
+
+
+def command_export(args):
+    """export - 목록 전체 또는 변경분"""
+    conn = _connect()
+    try:
+        if args.dataset == 'changes':
+            from database.exports import export_changes
+            if not args.consumer:
+                _log("변경분 내보내기에는 --consumer가 필요합니다.")
+                return 2
+            fmt = args.format if args.format != 'xlsx' else 'ndjson'
+            out = _open_output(args.output)
+            try:
+                summary = export_changes(conn, args.consumer, out, fmt=fmt, commit=not args.dry_run)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            _log(f"변경분 내보내기 ({summary['mode']}): 추가/수정 {summary['upserts']:,}건, "
+                 f"삭제 {summary['deletes']:,}건, 워터마크 {summary['cursor']} → {summary['next_cursor']}")
+            return 0
+
+        if args.format == 'xlsx':
+            from database import operations
+            from utils.file_handlers import create_excel_file
+            df = getattr(operations, f"get_{args.dataset}_data")(conn, compact=False)
+            out = _open_output(args.output, binary=True)
+            try:
+                out.write(create_excel_file({EXPORT_SHEETS[args.dataset]: df}))
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+            _log(f"{len(df):,}행 내보냄")
+            return 0
+
+        out = _open_output(args.output)
+        try:
+            rows = export_dataset(conn, args.dataset, out, fmt=args.format)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        _log(f"{rows:,}행 내보냄")
+        return 0
+    finally:
+        conn.close()
+
+
+def command_backup(args):
+    """backup - SQLite 온라인 백업 (쓰기를 막지 않고 페이지 단위 복사) 또는 전체 엑셀"""
+    if args.excel:
+        from database import operations
+        from utils.file_handlers import create_excel_file
+        conn = _connect()
+        try:
+            backup_data = {
+                EXPORT_SHEETS[dataset]: getattr(operations, f"get_{dataset}_data")(conn, compact=False)
+                for dataset in ('integrated', 'companies', 'contacts', 'consultations')
+            }
+        finally:
+            conn.close()
+        with open(args.output, 'wb') as f:
+            f.write(create_excel_file(backup_data))
+        _log(f"엑셀 백업 완료: {args.output}")
+        return 0
+
+    source = create_connection(readonly=True)
+    target = sqlite3.connect(args.output)
+    try:
+        def progress(status, remaining, total):
+            _log(f"백업 {total - remaining:,}/{total:,} 페이지")
+        source.backup(target, pages=4096, progress=progress)
+    finally:
+        target.close()
+        source.close()
+    _log(f"백업 완료: {args.output} ({os.path.getsize(args.output) / 2 ** 20:.1f} MB)")
+    return 0
+
+
+def command_vacuum(args):
+    """vacuum - 파일 정리 (검색 인덱스는 고정 ID 기준이라 다시 만들 필요 없음)"""
+    conn = _connect()
+    try:
+        db_path = get_db_file_path()
+        before = os.path.getsize(db_path) if db_path and os.path.exists(db_path) else 0
+        started = time.perf_counter()
+        conn.execute("VACUUM")
+
+        after = os.path.getsize(db_path) if db_path and os.path.exists(db_path) else 0
+        _log(f"VACUUM 완료: {before / 2 ** 20:.1f} MB → {after / 2 ** 20:.1f} MB "
+             f"({time.perf_counter() - started:.1f}s)")
+    finally:
+        conn.close()
+    return 0
+
+
+def command_analyze(args):
+    """analyze - 쿼리 플래너 통계 갱신"""
+    conn = _connect()
+    try:
+        started = time.perf_counter()
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        _log(f"ANALYZE 완료 ({time.perf_counter() - started:.1f}s)")
+    finally:
+        conn.close()
+    return 0
+
+
+def command_benchmark(args):
+    """benchmark - database.benchmark에 나머지 인자 전달"""
+    sys.argv = ['database.benchmark'] + args.benchmark_args
+    runpy.run_module('database.benchmark', run_name='__main__', alter_sys=True)
+    return 0
+
+
+def build_parser():
+    """명령줄 인자 파서"""
+    parser = argparse.ArgumentParser(prog='python -m crm', description="CRM 일괄 작업 명령줄 도구")
+    parser.add_argument('--db', default=None, help="DB 파일 경로 (기본값: CRM_DB_PATH 또는 crm_database.db)")
+    parser.add_argument('--profile', default=None, help="PRAGMA 프로필 (기본값: CRM_DB_PROFILE 또는 tuned)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for dataset in ('companies', 'contacts', 'consultations'):
+        sub = subparsers.add_parser(f'import-{dataset}', help=f"{dataset} xlsx/csv 가져오기")
+        sub.add_argument('file', help="xlsx 또는 csv 파일")
+        sub.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="커밋 단위 행 수")
+        sub.add_argument('--sheet', default=None, help="xlsx 시트명 (기본값: 첫 시트)")
+        sub.set_defaults(handler=lambda args, dataset=dataset: command_import(args, dataset))
+
+    sub = subparsers.add_parser('export', help="목록 또는 변경분 내보내기")
+    sub.add_argument('dataset', choices=EXPORT_DATASETS)
+    sub.add_argument('--format', choices=('csv', 'ndjson', 'xlsx'), default='csv', help="출력 형식")
+    sub.add_argument('--output', default='-', help="출력 파일 (기본값: 표준 출력)")
+    sub.add_argument('--consumer', default=None, help="변경분 소비자 이름 (changes)")
+    sub.add_argument('--dry-run', action='store_true', help="변경분 워터마크를 전진하지 않음 (changes)")
+    sub.set_defaults(handler=command_export)
+
+    sub = subparsers.add_parser('backup', help="DB 백업 (온라인 백업 또는 엑셀)")
+    sub.add_argument('output', help="백업 파일 경로")
+    sub.add_argument('--excel', action='store_true', help="전체 데이터를 엑셀 파일로 저장")
+    sub.set_defaults(handler=command_backup)
+
+    sub = subparsers.add_parser('vacuum', help="VACUUM (파일 정리)")
+    sub.set_defaults(handler=command_vacuum)
+
+    sub = subparsers.add_parser('analyze', help="ANALYZE / PRAGMA optimize")
+    sub.set_defaults(handler=command_analyze)
+
+    # benchmark 뒤의 인자는 main()에서 잘라 그대로 전달
+    sub = subparsers.add_parser('benchmark', help="database.benchmark 실행 (뒤의 인자는 그대로 전달)")
+    sub.set_defaults(handler=command_benchmark)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    명령줄 진입점
+
+    Args:
+        argv (list): 인자 목록 (기본값: sys.argv[1:])
+
+    Returns:
+        int: 종료 코드
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    benchmark_args = []
+    if 'benchmark' in argv:
+        split = argv.index('benchmark') + 1
+        argv, benchmark_args = argv[:split], argv[split:]
+
+    args = build_parser().parse_args(argv)
+    args.benchmark_args = benchmark_args
+    configure_database(path=args.db, profile=args.profile)
+    return args.handler(args)
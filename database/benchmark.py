@@ -0,0 +1,768 @@
+"""
+database/benchmark.py
+
+DB 위치/PRAGMA 프로필 벤치마크 (개발/운영 점검용)
+- 합성 데이터로 일괄 삽입, 기업명 조회, 조인 조회 시간 측정
+- 프로필별, 위치별 (파일 디렉토리 / 인메모리) 비교
+- get_*_data 조회 함수의 프로필별 (default / tuned / mmap) 비교, 첫/마지막 페이지 시간
+- 상담 이력 전문 검색 및 통합 검색 응답 시간
+- 중복 연락처 탐지 처리량
+- 업체코드 할당 왕복 횟수
+- 조회 결과 DataFrame 행당 메모리 (dtype 변환 전후)
+- 세션별 조회 대비 공유 스냅샷 메모리와 증분 갱신 시간
+- 디스크 결과 캐시 적중 시간 (재시작 직후 첫 요청)
+- 전체 내보내기 대비 변경분(델타) 내보내기 시간/크기
+
+사용법:
+    python -m database.benchmark [--rows 20000] [--dir /dev/shm] [--profiles default,fast]
+    python -m database.benchmark --loaders [--rows 20000] [--repeats 3]
+    python -m database.benchmark --search [--rows 200000]
+    python -m database.benchmark --dedup [--rows 20000]
+    python -m database.benchmark --codes [--rows 100000]
+    python -m database.benchmark --frames [--rows 20000]
+    python -m database.benchmark --snapshots [--rows 20000] [--sessions 40]
+    python -m database.benchmark --result-cache [--rows 20000]
+    python -m database.benchmark --delta-export [--rows 20000] [--changes 300]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from .migrations import initialize_schema
+from .contacts import link_consultation_contacts
+from .paging import iter_pages, DEFAULT_PAGE_SIZE
+from .frames import compact_frame, frame_bytes_per_row
+from .settings import (
+    PRAGMA_PROFILES,
+    get_db_settings,
+    resolve_profile,
+    create_connection,
+    configure_database
+)
+
+
+def make_settings(profile, path=None, memory=False, memory_name='crm_benchmark'):
+    """
+    벤치마크용 DB 설정 생성
+
+    Args:
+        profile (str): PRAGMA 프로필 이름
+        path (str): DB 파일 경로 (memory=False일 때)
+        memory (bool): 공유 캐시 인메모리 DB 사용 여부
+        memory_name (str): 인메모리 DB 이름
+
+    Returns:
+        dict: create_connection에 넘길 설정
+    """
+    settings = get_db_settings()
+    settings.update({
+        'path': path or ':memory:',
+        'readonly': False,
+        'memory': memory,
+        'memory_name': memory_name,
+        'profile': profile,
+        'pragmas': resolve_profile(profile, settings['memory_budget_mb']),
+    })
+    return settings
+
+
+def seed_data(conn, rows):
+    """
+    합성 데이터 삽입
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        rows (int): 기업 수 (연락처는 3배, 상담은 5배)
+
+    Returns:
+        list: 생성된 기업명 목록
+    """
+    rng = random.Random(42)
+    industries = ['제조', 'IT', '유통', '금융', '건설', '바이오', '교육']
+    categories = ['신규', '기존', '잠재', 'VIP']
+    positions = ['사원', '대리', '과장', '차장', '부장', '이사']
+
+    company_names = [f"벤치기업{i:07d}" for i in range(rows)]
+
+    vocabulary = build_vocabulary()
+
+    conn.execute("BEGIN")
+    conn.executemany('''
+        INSERT INTO companies
+        (company_code, company_name, revenue_2024, industry, employee_count, address, products, customer_category)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        (f"BENCH{i:07d}", name, rng.random() * 1e10, rng.choice(industries),
+         rng.randint(1, 5000), f"서울시 {i % 25}구", "제품", rng.choice(categories))
+        for i, name in enumerate(company_names)
+    ))
+    conn.executemany('''
+        INSERT INTO customer_contacts
+        (company_code, customer_name, position, phone, email, acquisition_path, phone_key, email_key)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        (f"BENCH{i % rows:07d}", f"고객{i}", rng.choice(positions),
+         f"010-{i % 10000:04d}-{(i * 7) % 10000:04d}", f"user{i}@example.com", "홈페이지",
+         f"010{i % 10000:04d}{(i * 7) % 10000:04d}", f"user{i}@example.com")
+        for i in range(rows * 3)
+    ))
+    conn.executemany('''
+        INSERT INTO consultations (company_code, customer_name, consultation_date, consultation_content, project_name)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (
+        (f"BENCH{i % rows:07d}", f"고객{i % (rows * 3)}",
+         f"2024.{1 + i % 12:02d}.{1 + i % 28:02d}",
+         ' '.join(rng.choice(vocabulary) for _ in range(12)), f"프로젝트{i % 100}")
+        for i in range(rows * 5)
+    ))
+    link_consultation_contacts(conn)
+    conn.execute("COMMIT")
+
+    return company_names
+
+
+def build_vocabulary(size=5000):
+    """
+    상담 내용용 합성 어휘 생성
+
+    자주 쓰는 단어와 무작위 3음절 한글 단어를 섞어 검색 선택도를
+    현실적으로 분산합니다.
+
+    Args:
+        size (int): 무작위 단어 수
+
+    Returns:
+        list: 단어 목록 (앞 10개는 자주 쓰는 단어)
+    """
+    rng = random.Random(1)
+    common_words = ['견적', '일정', '협의', '미팅', '제안서', '계약', '납품', '검토', '요청', '회신']
+    words = set()
+    while len(words) < size:
+        words.add(''.join(chr(0xAC00 + rng.randrange(11172)) for _ in range(3)))
+    return common_words + sorted(words)
+
+
+def _timed(func):
+    """함수 실행 시간 (밀리초)"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_workload(conn, rows, lookups=1000):
+    """
+    삽입/조회 작업 시간 측정
+
+    Args:
+        conn (sqlite3.Connection): 스키마가 생성된 빈 DB 연결
+        rows (int): 기업 수
+        lookups (int): 기업명 조회 횟수
+
+    Returns:
+        dict: 작업별 소요 시간 (밀리초)
+    """
+    company_names = []
+    insert_ms = _timed(lambda: company_names.extend(seed_data(conn, rows)))
+
+    rng = random.Random(7)
+    targets = [rng.choice(company_names) for _ in range(lookups)]
+
+    def lookup():
+        for name in targets:
+            conn.execute("SELECT company_code FROM companies WHERE company_name = ?", (name,)).fetchone()
+
+    def join_scan():
+        conn.execute('''
+            SELECT c.company_name, con.consultation_date, con.consultation_content
+            FROM consultations con
+            JOIN companies c ON con.company_code = c.company_code
+            ORDER BY con.consultation_date DESC, c.company_name
+        ''').fetchall()
+
+    return {
+        'insert_ms': insert_ms,
+        'lookup_ms': _timed(lookup),
+        'join_scan_ms': _timed(join_scan),
+    }
+
+
+def benchmark_profiles(rows=20000, directory=None, profiles=None, include_memory=True):
+    """
+    PRAGMA 프로필과 DB 위치별 벤치마크 실행
+
+    Args:
+        rows (int): 기업 수
+        directory (str): 파일 DB를 만들 디렉토리 (예: /dev/shm, NVMe 마운트)
+        profiles (list): 비교할 프로필 이름 목록 (기본값: 전체)
+        include_memory (bool): 공유 캐시 인메모리 DB도 측정할지 여부
+
+    Returns:
+        list: 측정 결과 dict 목록
+    """
+    profiles = profiles or list(PRAGMA_PROFILES)
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    results = []
+
+    try:
+        for profile in profiles:
+            targets = [('file', make_settings(profile, path=os.path.join(work_dir, f"{profile}.db")))]
+            if include_memory:
+                targets.append(('memory', make_settings(profile, memory=True, memory_name=f"bench_{profile}")))
+
+            for location, settings in targets:
+                conn = create_connection(settings=settings)
+                initialize_schema(conn)
+                timings = run_workload(conn, rows)
+                conn.close()
+
+                results.append({'profile': profile, 'location': location, **timings})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_loaders(rows=20000, directory=None, profiles=('default', 'tuned', 'mmap'), repeats=3):
+    """
+    get_*_data 조회 함수의 PRAGMA 프로필별 실행 시간 비교
+
+    같은 파일 DB를 프로필마다 새 연결로 열어, 첫 호출(연결 캐시가 빈 상태)과
+    반복 호출 평균을 측정합니다. OS 페이지 캐시는 프로필 간에 공유됩니다.
+    키셋 페이지 조회는 첫 페이지와 마지막 페이지 시간을 함께 기록합니다
+    (두 값이 비슷해야 위치와 무관한 비용).
+
+    Args:
+        rows (int): 기업 수
+        directory (str): 파일 DB를 만들 디렉토리
+        profiles (tuple): 비교할 프로필 이름 목록
+        repeats (int): 반복 호출 횟수
+
+    Returns:
+        list: 측정 결과 dict 목록
+    """
+    from .operations import (
+        get_companies_data,
+        get_contacts_data,
+        get_consultations_data,
+        get_integrated_data
+    )
+    loaders = [get_companies_data, get_contacts_data, get_consultations_data, get_integrated_data]
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    db_path = os.path.join(work_dir, 'loaders.db')
+    results = []
+
+    try:
+        seed_conn = create_connection(settings=make_settings('default', path=db_path))
+        initialize_schema(seed_conn)
+        seed_data(seed_conn, rows)
+        seed_conn.close()
+
+        for profile in profiles:
+            conn = create_connection(settings=make_settings(profile, path=db_path))
+            for loader in loaders:
+                first_ms = _timed(lambda: loader(conn))
+                warm_ms = sum(_timed(lambda: loader(conn)) for _ in range(repeats)) / repeats
+
+                cursors = [page.attrs['next_cursor'] for page in iter_pages(loader, conn)]
+                last_cursor = cursors[-2] if len(cursors) > 1 else None
+                results.append({
+                    'profile': profile,
+                    'loader': loader.__name__,
+                    'first_ms': first_ms,
+                    'warm_ms': warm_ms,
+                    'pages': len(cursors),
+                    'first_page_ms': _timed(lambda: loader(conn, page_size=DEFAULT_PAGE_SIZE)),
+                    'last_page_ms': _timed(
+                        lambda: loader(conn, cursor=last_cursor, page_size=DEFAULT_PAGE_SIZE)
+                    ),
+                })
+            conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_search(rows=200000, directory=None, queries=None, limit=20, repeats=5):
+    """
+    상담 이력 전문 검색 및 통합 검색(search_all) 응답 시간 측정
+
+    rows=200000이면 상담 이력 100만 건에서 측정합니다.
+
+    Args:
+        rows (int): 기업 수 (상담 이력은 5배)
+        directory (str): 파일 DB를 만들 디렉토리
+        queries (list): 검색어 목록 (기본값: 흔한 단어, 드문 단어, 복합 검색어)
+        limit (int): 페이지 크기
+        repeats (int): 검색어별 반복 횟수
+
+    Returns:
+        list: 검색어별 측정 결과 dict 목록
+    """
+    from .search import search_consultations, search_all
+
+    if queries is None:
+        vocabulary = build_vocabulary()
+        queries = [
+            vocabulary[42],                         # 드문 단어
+            f"{vocabulary[100]} {vocabulary[200]}",  # 드문 단어 두 개
+            vocabulary[300][:2],                    # 2글자 접두어
+            '견적',                                  # 흔한 단어
+            '견적 일정',                             # 흔한 단어 두 개
+            '프로젝트7',                             # 프로젝트명 (11% 일치, 최근 등록 순)
+            '프로젝트',                              # 모든 행에 일치하는 4글자 접두어
+        ]
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    results = []
+
+    try:
+        settings = make_settings('tuned', path=os.path.join(work_dir, 'search.db'))
+        conn = create_connection(settings=settings)
+        initialize_schema(conn)
+        seed_data(conn, rows)
+
+        def connect():
+            return create_connection(readonly=True, settings=settings)
+
+        for query in queries:
+            hits = []
+            first_page_ms = [
+                _timed(lambda: hits.append(search_consultations(conn, query, limit=limit)[0]))
+                for _ in range(repeats)
+            ]
+            global_ms = [
+                _timed(lambda: search_all(query, connect=connect))
+                for _ in range(repeats)
+            ]
+            results.append({
+                'query': query,
+                'consultations': rows * 5,
+                'hits_on_page': len(hits[-1]),
+                'best_ms': min(first_page_ms),
+                'avg_ms': sum(first_page_ms) / repeats,
+                'global_best_ms': min(global_ms),
+            })
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_dedup(rows=20000, directory=None, duplicate_ratio=0.05):
+    """
+    중복 연락처 탐지 처리량 측정
+
+    합성 연락처 중 일부를 표기만 바꿔 다시 넣은 뒤 탐지합니다.
+
+    Args:
+        rows (int): 기업 수 (연락처는 3배)
+        directory (str): 파일 DB를 만들 디렉토리
+        duplicate_ratio (float): 표기만 바꿔 다시 넣을 연락처 비율
+
+    Returns:
+        list: 측정 결과 dict 목록
+    """
+    from .dedup import find_duplicate_contacts
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+
+    try:
+        conn = create_connection(settings=make_settings('tuned', path=os.path.join(work_dir, 'dedup.db')))
+        initialize_schema(conn)
+        seed_data(conn, rows)
+
+        # 띄어쓰기/국가번호 표기만 다른 중복 연락처
+        step = max(int(1 / duplicate_ratio), 1)
+        conn.execute(f'''
+            INSERT INTO customer_contacts
+            (company_code, customer_name, position, phone, email, acquisition_path, phone_key, email_key)
+            SELECT company_code, substr(customer_name, 1, 2) || ' ' || substr(customer_name, 3),
+                   position, '+82 ' || substr(phone, 2), NULL, acquisition_path, phone_key, NULL
+            FROM customer_contacts
+            WHERE id % {step} = 0
+        ''')
+
+        _, stats = find_duplicate_contacts(conn)
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return [stats]
+
+
+def benchmark_allocator(rows=100000, companies=20000, batch_size=10000, directory=None):
+    """
+    업체코드 할당 왕복 횟수 측정 (상담 이력 가져오기 기준)
+
+    insert_consultation_batch로 rows건을 batch_size씩 가져오면서
+    code_sequences에 접근한 SQL 문 수를 셉니다. 이전 방식은 새 기업마다
+    코드를 만들고 행마다 존재 여부를 다시 조회했습니다.
+
+    Args:
+        rows (int): 가져올 상담 이력 수
+        companies (int): 서로 다른 기업명 수 (모두 새 기업)
+        batch_size (int): 배치 크기 (파일 하나의 행 수)
+        directory (str): 파일 DB를 만들 디렉토리
+
+    Returns:
+        list: 측정 결과 dict 목록
+    """
+    from .operations import insert_consultation_batch
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+
+    try:
+        conn = create_connection(settings=make_settings('tuned', path=os.path.join(work_dir, 'codes.db')))
+        initialize_schema(conn)
+
+        counts = {'allocator': 0}
+
+        def trace(statement):
+            if 'code_sequences' in statement:
+                counts['allocator'] += 1
+
+        data = [
+            {
+                'company_name': f"할당기업{i % companies:06d}",
+                'customer_name': f"고객{i}",
+                'consultation_content': "코드 할당 벤치마크 상담",
+            }
+            for i in range(rows)
+        ]
+
+        conn.set_trace_callback(trace)
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            success, message = insert_consultation_batch(conn, data[offset:offset + batch_size])
+            if not success:
+                raise RuntimeError(message)
+        elapsed = time.perf_counter() - start
+        conn.set_trace_callback(None)
+
+        company_count = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+        first_code, last_code = conn.execute(
+            "SELECT MIN(company_code), MAX(company_code) FROM companies"
+        ).fetchone()
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return [{
+        'rows': rows,
+        'batches': -(-rows // batch_size),
+        'companies': company_count,
+        'codes': f"{first_code}..{last_code}",
+        'allocator_round_trips': counts['allocator'],
+        'codes_per_round_trip': company_count / max(counts['allocator'], 1),
+        'elapsed_seconds': elapsed,
+    }]
+
+
+def benchmark_frame_memory(rows=20000, directory=None):
+    """
+    get_*_data 조회 결과의 행당 메모리 비교 (변환 전 / compact_frame 적용 후)
+
+    Args:
+        rows (int): 기업 수 (연락처 3배, 상담 5배)
+        directory (str): 파일 DB를 만들 디렉토리
+
+    Returns:
+        list: 조회 함수별 측정 결과 dict 목록
+    """
+    from .operations import (
+        get_companies_data,
+        get_contacts_data,
+        get_consultations_data,
+        get_integrated_data
+    )
+    loaders = [get_companies_data, get_contacts_data, get_consultations_data, get_integrated_data]
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    db_path = os.path.join(work_dir, 'frames.db')
+    results = []
+
+    try:
+        conn = create_connection(settings=make_settings('default', path=db_path))
+        initialize_schema(conn)
+        seed_data(conn, rows)
+
+        for loader in loaders:
+            raw_df = loader(conn, compact=False)
+            convert_ms = _timed(lambda: compact_frame(raw_df))
+            compact_df = compact_frame(raw_df)
+            before = frame_bytes_per_row(raw_df)
+            after = frame_bytes_per_row(compact_df)
+            results.append({
+                'loader': loader.__name__,
+                'rows': len(raw_df),
+                'before_bytes_per_row': before,
+                'after_bytes_per_row': after,
+                'saved_pct': (1 - after / before) * 100 if before else 0.0,
+                'convert_ms': convert_ms,
+            })
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_snapshots(rows=20000, sessions=40, directory=None):
+    """
+    세션별 조회와 공유 스냅샷의 메모리/시간 비교
+
+    세션마다 get_*_data를 호출하면 세션 수만큼 DataFrame이 생기고,
+    스냅샷은 세션 수와 관계없이 하나를 공유합니다. 한 행 수정 후
+    증분 갱신 시간도 함께 측정합니다.
+
+    Args:
+        rows (int): 기업 수 (연락처 3배, 상담 5배)
+        sessions (int): 동시 세션 수
+        directory (str): 파일 DB를 만들 디렉토리
+
+    Returns:
+        list: 목록별 측정 결과 dict 목록
+    """
+    from .operations import get_companies_data, get_contacts_data, get_consultations_data
+    from .snapshots import get_shared_data, get_snapshot_stats, clear_snapshots
+    loaders = {
+        'companies': get_companies_data,
+        'contacts': get_contacts_data,
+        'consultations': get_consultations_data,
+    }
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    db_path = os.path.join(work_dir, 'snapshots.db')
+    settings = make_settings('default', path=db_path)
+    connect = lambda: create_connection(readonly=True, settings=settings)
+    results = []
+
+    try:
+        conn = create_connection(settings=settings)
+        initialize_schema(conn)
+        seed_data(conn, rows)
+        clear_snapshots()
+
+        for dataset, loader in loaders.items():
+            per_session_df = loader(conn)
+            load_ms = _timed(lambda: get_shared_data(dataset, connect))
+            cached_ms = _timed(lambda: get_shared_data(dataset, connect))
+            shared_bytes = get_shared_data(dataset, connect).memory_usage(deep=True).sum()
+
+            # 시드 데이터는 모두 같은 초에 기록되어 첫 갱신은 경계 시각의 행을 다시 읽으므로
+            # 한 번 갱신한 뒤의 두 번째 갱신 시간을 측정
+            for offset in (1, 2):
+                conn.execute(
+                    "UPDATE companies SET products = products || '+', "
+                    f"updated_at = datetime('now', '+{offset} second') WHERE rowid = 1"
+                )
+                refresh_ms = _timed(lambda: get_shared_data(dataset, connect))
+
+            results.append({
+                'dataset': dataset,
+                'rows': len(per_session_df),
+                'sessions_mb': per_session_df.memory_usage(deep=True).sum() * sessions / 2 ** 20,
+                'shared_mb': shared_bytes / 2 ** 20,
+                'full_load_ms': load_ms,
+                'cached_ms': cached_ms,
+                'refresh_ms': refresh_ms,
+            })
+
+        # 표시 데이터가 참조하는 테이블 스냅샷 자체의 크기
+        for table, stats in get_snapshot_stats().items():
+            results.append({
+                'dataset': f"snapshot:{table}",
+                'rows': stats['rows'],
+                'sessions_mb': 0.0,
+                'shared_mb': stats['bytes'] / 2 ** 20,
+                'full_load_ms': 0.0,
+                'cached_ms': 0.0,
+                'refresh_ms': 0.0,
+            })
+        clear_snapshots()
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_result_cache(rows=20000, directory=None):
+    """
+    디스크 결과 캐시 적중 시 첫 요청 시간 비교
+
+    등록된 결과(자동완성 목록, 목록 다운로드 엑셀)마다 캐시 없이 계산한
+    시간과, 재시작 직후처럼 프로세스 메모리가 빈 상태에서 디스크 캐시를
+    읽는 시간을 측정합니다.
+
+    Args:
+        rows (int): 기업 수 (연락처 3배, 상담 5배)
+        directory (str): 파일 DB를 만들 디렉토리
+
+    Returns:
+        list: 결과별 측정 결과 dict 목록
+    """
+    from . import result_cache
+    from .snapshots import clear_snapshots
+    import utils.file_handlers  # 목록 다운로드 엑셀 등록
+    from . import operations  # 자동완성 목록 등록
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    db_path = os.path.join(work_dir, 'result_cache.db')
+    configure_database(path=db_path, memory=False, readonly=False)
+    results = []
+
+    try:
+        conn = create_connection()
+        initialize_schema(conn)
+        seed_data(conn, rows)
+        conn.close()
+
+        clear_snapshots()
+        cold = result_cache.warm_result_cache()
+
+        # 재시작 직후: 스냅샷/메모리 캐시 없음, 디스크 캐시만 있음
+        clear_snapshots()
+        warm = result_cache.warm_result_cache()
+
+        for name, cold_ms in cold.items():
+            results.append({
+                'result': name,
+                'compute_ms': cold_ms,
+                'disk_hit_ms': warm[name],
+                'speedup': cold_ms / warm[name] if warm[name] else 0.0,
+            })
+        clear_snapshots()
+    finally:
+        configure_database(path=None, memory=None, readonly=None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_delta_export(rows=20000, changes=300, directory=None):
+    """
+    전체 내보내기와 변경분(델타) 내보내기 비교
+
+    첫 내보내기(전체) 후 상담 이력 changes건 수정, 연락처 10건 삭제 뒤
+    같은 소비자로 다시 내보내 시간과 출력 크기를 측정합니다.
+
+    Args:
+        rows (int): 기업 수 (연락처 3배, 상담 5배)
+        changes (int): 수정할 상담 이력 수
+        directory (str): 파일 DB를 만들 디렉토리
+
+    Returns:
+        list: 내보내기별 측정 결과 dict 목록
+    """
+    import io
+    from .exports import export_changes
+
+    work_dir = tempfile.mkdtemp(prefix='crm_bench_', dir=directory)
+    db_path = os.path.join(work_dir, 'delta_export.db')
+    settings = make_settings('default', path=db_path)
+    results = []
+
+    try:
+        conn = create_connection(settings=settings)
+        initialize_schema(conn)
+        seed_data(conn, rows)
+
+        def run(label):
+            out = io.StringIO()
+            started = time.perf_counter()
+            summary = export_changes(conn, 'benchmark', out)
+            results.append({
+                'export': label,
+                'mode': summary['mode'],
+                'records': summary['upserts'] + summary['deletes'],
+                'deletes': summary['deletes'],
+                'ms': (time.perf_counter() - started) * 1000,
+                'mb': len(out.getvalue().encode('utf-8')) / 2 ** 20,
+            })
+
+        run('first')
+        conn.execute(
+            "UPDATE consultations SET project_name = 'delta', updated_at = CURRENT_TIMESTAMP "
+            "WHERE id IN (SELECT id FROM consultations ORDER BY random() LIMIT ?)",
+            (changes,)
+        )
+        conn.execute("DELETE FROM customer_contacts WHERE id IN (SELECT id FROM customer_contacts LIMIT 10)")
+        run('delta')
+        run('unchanged')
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def print_results(results):
+    """벤치마크 결과 표 출력"""
+    if not results:
+        return
+    columns = list(results[0])
+    rows = [
+        [f"{value:.1f}" if isinstance(value, float) else str(value) for value in result.values()]
+        for result in results
+    ]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+    print(" | ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print(" | ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB PRAGMA 프로필 벤치마크")
+    parser.add_argument('--rows', type=int, default=20000, help="기업 수 (연락처 3배, 상담 5배)")
+    parser.add_argument('--dir', default=None, help="파일 DB를 만들 디렉토리 (기본값: 임시 디렉토리)")
+    parser.add_argument('--profiles', default=None, help="쉼표로 구분한 프로필 목록")
+    parser.add_argument('--no-memory', action='store_true', help="인메모리 DB 측정 생략")
+    parser.add_argument('--loaders', action='store_true', help="get_*_data 조회 함수 프로필 비교")
+    parser.add_argument('--repeats', type=int, default=3, help="조회 함수 반복 호출 횟수")
+    parser.add_argument('--search', action='store_true', help="전문 검색/통합 검색 응답 시간 측정")
+    parser.add_argument('--dedup', action='store_true', help="중복 연락처 탐지 처리량 측정")
+    parser.add_argument('--codes', action='store_true', help="업체코드 할당 왕복 횟수 측정 (--rows는 상담 건수)")
+    parser.add_argument('--frames', action='store_true', help="조회 결과 DataFrame 행당 메모리 비교")
+    parser.add_argument('--snapshots', action='store_true', help="세션별 조회 대비 공유 스냅샷 비교")
+    parser.add_argument('--sessions', type=int, default=40, help="동시 세션 수 (--snapshots)")
+    parser.add_argument('--result-cache', action='store_true', help="디스크 결과 캐시 적중 시간 측정")
+    parser.add_argument('--delta-export', action='store_true', help="전체 대비 변경분 내보내기 비교")
+    parser.add_argument('--changes', type=int, default=300, help="수정할 상담 이력 수 (--delta-export)")
+    args = parser.parse_args()
+    profiles = args.profiles.split(',') if args.profiles else None
+
+    if args.search:
+        print_results(benchmark_search(rows=args.rows, directory=args.dir, repeats=args.repeats))
+    elif args.dedup:
+        print_results(benchmark_dedup(rows=args.rows, directory=args.dir))
+    elif args.codes:
+        print_results(benchmark_allocator(rows=args.rows, directory=args.dir))
+    elif args.snapshots:
+        print_results(benchmark_snapshots(rows=args.rows, sessions=args.sessions, directory=args.dir))
+    elif args.delta_export:
+        print_results(benchmark_delta_export(rows=args.rows, changes=args.changes, directory=args.dir))
+    elif args.result_cache:
+        print_results(benchmark_result_cache(rows=args.rows, directory=args.dir))
+    elif args.frames:
+        print_results(benchmark_frame_memory(rows=args.rows, directory=args.dir))
+    elif args.loaders:
+        print_results(benchmark_loaders(
+            rows=args.rows,
+            directory=args.dir,
+            profiles=profiles or ('default', 'tuned', 'mmap'),
+            repeats=args.repeats
+        ))
+    else:
+        print_results(benchmark_profiles(
+            rows=args.rows,
+            directory=args.dir,
+            profiles=profiles,
+            include_memory=not args.no_memory
+        ))
@@ -0,0 +1,433 @@
+"""
+database/changelog.py
+
+변경 데이터 캡처 (CDC) 로그
+- change_log: 트리거로 기록되는 (순번, 테이블, 행 키, 작업) - 값은 저장하지 않음
+- 순번(seq)은 AUTOINCREMENT로 단조 증가 (압축으로 행을 지워도 재사용하지 않음)
+- 소비자 커서: 소비자별 마지막 처리 순번 (내보내기, 캐시, BI 작업 등)
+- 압축: 키별 마지막 변경만 유지, 모든 소비자가 처리한 구간 삭제, 최대 행 수 제한
+
+소비자는 커서 이후 변경을 읽어 해당 행만 다시 조회(작업 I/U)하거나
+삭제(D)하면 됩니다. 커서가 압축된 구간(floor) 이전이면 변경 일부가
+사라졌으므로 전체를 다시 읽어야 합니다 (expired).
+"""
+
+import os
+import threading
+import time
+
+
+# 테이블: (행 키 컬럼, 변경으로 기록할 컬럼 - 파생 컬럼 name_key 등은 제외)
+CHANGE_LOG_TABLES = {
+    'companies': (
+        'company_code',
+        ['company_code', 'company_name', 'revenue_2024', 'industry', 'employee_count',
+         'address', 'products', 'customer_category'],
+    ),
+    'customer_contacts': (
+        'id',
+        ['company_code', 'customer_name', 'position', 'phone', 'email', 'acquisition_path'],
+    ),
+    'consultations': (
+        'id',
+        ['company_code', 'customer_name', 'consultation_date', 'consultation_content',
+         'project_name', 'contact_id'],
+    ),
+}
+
+CHANGE_OPERATIONS = {'I': 'insert', 'U': 'update', 'D': 'delete'}
+
+# 압축 후 남길 최대 행 수 (CRM_CHANGE_LOG_MAX_ROWS로 변경)
+CHANGE_LOG_MAX_ROWS = int(os.environ.get('CRM_CHANGE_LOG_MAX_ROWS', 200000))
+
+# 압축 주기 (초)
+DEFAULT_COMPACTION_INTERVAL = 60 * 60
+
+DEFAULT_CHANGE_LIMIT = 1000
+
+_compaction_lock = threading.Lock()
+_compaction_thread = None
+
+
+def create_change_log_schema(conn):
+    """
+    변경 로그/소비자 커서/압축 이력 테이블과 기록 트리거 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_key TEXT NOT NULL,
+            operation TEXT NOT NULL CHECK (operation IN ('I', 'U', 'D')),
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_consumers (
+            consumer TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            snapshot_at TIMESTAMP
+        )
+    ''')
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(change_consumers)")}
+    if 'snapshot_at' not in columns:
+        conn.execute("ALTER TABLE change_consumers ADD COLUMN snapshot_at TIMESTAMP")
+
+    # 압축으로 지운 구간 (floor 이전 커서는 만료)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_log_compactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            compacted_through INTEGER NOT NULL,
+            deduplicated INTEGER NOT NULL DEFAULT 0,
+            trimmed INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    for table, (key, columns) in CHANGE_LOG_TABLES.items():
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_change_log_{table}_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_key, operation)
+                VALUES ('{table}', NEW.{key}, 'I');
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_change_log_{table}_update
+            AFTER UPDATE OF {', '.join(columns)} ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_key, operation)
+                SELECT '{table}', OLD.{key}, 'D' WHERE OLD.{key} IS NOT NEW.{key};
+                INSERT INTO change_log (table_name, row_key, operation)
+                VALUES ('{table}', NEW.{key}, 'U');
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_change_log_{table}_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_key, operation)
+                VALUES ('{table}', OLD.{key}, 'D');
+            END
+        ''')
+
+
+def get_change_log_head(conn):
+    """
+    마지막으로 기록된 변경 순번
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        int: 순번 (변경이 없으면 0)
+    """
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+
+def get_change_log_floor(conn):
+    """
+    압축으로 지워진 마지막 순번 (이보다 작은 커서는 변경 일부를 놓침)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        int: 순번 (압축 이력이 없으면 0)
+    """
+    return conn.execute(
+        "SELECT COALESCE(MAX(compacted_through), 0) FROM change_log_compactions"
+    ).fetchone()[0]
+
+
+def read_changes(conn, after_seq=0, limit=DEFAULT_CHANGE_LIMIT, tables=None):
+    """
+    순번 이후의 변경 조회 (순번 오름차순)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        after_seq (int): 이 순번 이후부터
+        limit (int): 최대 건수
+        tables (iterable): 조회할 테이블 (None이면 전체)
+
+    Returns:
+        list: [{'seq', 'table', 'key', 'operation', 'changed_at'}, ...]
+            operation은 'I'(추가), 'U'(수정), 'D'(삭제)
+    """
+    where = "seq > ?"
+    params = [after_seq]
+    if tables is not None:
+        tables = list(tables)
+        where += f" AND table_name IN ({', '.join('?' for _ in tables)})"
+        params += tables
+
+    rows = conn.execute(f'''
+        SELECT seq, table_name, row_key, operation, changed_at
+        FROM change_log
+        WHERE {where}
+        ORDER BY seq
+        LIMIT ?
+    ''', params + [limit]).fetchall()
+
+    return [
+        {'seq': seq, 'table': table, 'key': key, 'operation': operation, 'changed_at': changed_at}
+        for seq, table, key, operation, changed_at in rows
+    ]
+
+
+def register_consumer(conn, consumer, start_seq=None):
+    """
+    소비자 등록 (이미 있으면 기존 커서 유지)
+
+    새 소비자는 보통 전체를 한 번 읽은 뒤 그 이후 변경만 처리하므로,
+    기본값으로 현재 마지막 순번에서 시작합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        consumer (str): 소비자 이름
+        start_seq (int): 시작 커서 (기본값: 현재 마지막 순번)
+
+    Returns:
+        int: 소비자 커서
+    """
+    if start_seq is None:
+        start_seq = get_change_log_head(conn)
+    conn.execute(
+        "INSERT OR IGNORE INTO change_consumers (consumer, last_seq) VALUES (?, ?)",
+        (consumer, start_seq)
+    )
+    return get_consumer_cursor(conn, consumer)
+
+
+def get_consumer_cursor(conn, consumer):
+    """
+    소비자 커서 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        consumer (str): 소비자 이름
+
+    Returns:
+        int or None: 마지막 처리 순번 (등록되지 않았으면 None)
+    """
+    row = conn.execute(
+        "SELECT last_seq FROM change_consumers WHERE consumer = ?", (consumer,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def read_consumer_changes(conn, consumer, limit=DEFAULT_CHANGE_LIMIT, tables=None):
+    """
+    소비자 커서 이후 변경 조회 (커서는 commit_consumer_cursor로 직접 전진)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        consumer (str): 소비자 이름 (register_consumer로 등록)
+        limit (int): 최대 건수
+        tables (iterable): 조회할 테이블 (None이면 전체)
+
+    Returns:
+        dict: changes (read_changes 결과), cursor (현재 커서),
+            next_cursor (처리 후 커밋할 순번), expired (압축으로 변경이 사라져 전체 재조회 필요)
+
+    Raises:
+        ValueError: 등록되지 않은 소비자
+    """
+    cursor = get_consumer_cursor(conn, consumer)
+    if cursor is None:
+        raise ValueError(f"등록되지 않은 변경 소비자입니다: {consumer}")
+
+    # 조회 전 마지막 순번 (조회 중 커밋된 변경을 건너뛰지 않도록 먼저 읽음)
+    head = get_change_log_head(conn)
+    changes = read_changes(conn, cursor, limit, tables)
+    if len(changes) == limit:
+        next_cursor = changes[-1]['seq']
+    else:
+        # 끝까지 읽었으면 다른 테이블의 변경도 건너뛰도록 마지막 순번까지 전진
+        next_cursor = max([cursor, head] + [change['seq'] for change in changes])
+
+    return {
+        'changes': changes,
+        'cursor': cursor,
+        'next_cursor': next_cursor,
+        'expired': cursor < get_change_log_floor(conn),
+    }
+
+
+def commit_consumer_cursor(conn, consumer, seq, snapshot_at=None):
+    """
+    소비자 커서 전진 (되돌아가지 않음)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        consumer (str): 소비자 이름
+        seq (int): 처리를 마친 마지막 순번
+        snapshot_at (str): seq를 읽은 트랜잭션 안의 CURRENT_TIMESTAMP
+            (None이면 이전 값 유지)
+    """
+    conn.execute('''
+        UPDATE change_consumers
+        SET last_seq = MAX(last_seq, ?), updated_at = CURRENT_TIMESTAMP,
+            snapshot_at = COALESCE(?, snapshot_at)
+        WHERE consumer = ?
+    ''', (seq, snapshot_at, consumer))
+
+
+def remove_consumer(conn, consumer):
+    """
+    소비자 삭제 (더 이상 압축을 막지 않음)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        consumer (str): 소비자 이름
+    """
+    conn.execute("DELETE FROM change_consumers WHERE consumer = ?", (consumer,))
+
+
+def compact_change_log(conn, max_rows=CHANGE_LOG_MAX_ROWS):
+    """
+    변경 로그 압축
+
+    1. 같은 (테이블, 키)의 변경은 마지막 것만 유지 (어느 커서에서 읽어도 결과 동일)
+    2. 모든 소비자가 처리한 구간 삭제
+    3. 그래도 max_rows를 넘으면 오래된 변경 삭제 (뒤처진 소비자 커서는 만료)
+
+    트랜잭션 안에서 호출되면 해당 트랜잭션을 그대로 사용하고,
+    그렇지 않으면 자체 트랜잭션으로 실행합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        max_rows (int): 남길 최대 행 수
+
+    Returns:
+        dict: deduplicated, consumed, trimmed (삭제 행 수), rows (남은 행 수), floor
+    """
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+    try:
+        deduplicated = conn.execute('''
+            DELETE FROM change_log
+            WHERE seq NOT IN (
+                SELECT MAX(seq) FROM change_log GROUP BY table_name, row_key
+            )
+        ''').rowcount
+
+        floor = get_change_log_floor(conn)
+
+        # 소비자가 없으면 처리된 구간도 없음 (행 수 제한만 적용)
+        consumed = 0
+        min_cursor = conn.execute("SELECT MIN(last_seq) FROM change_consumers").fetchone()[0]
+        if min_cursor is not None and min_cursor > floor:
+            consumed = conn.execute("DELETE FROM change_log WHERE seq <= ?", (min_cursor,)).rowcount
+            floor = min_cursor
+
+        trimmed = 0
+        cutoff = conn.execute(
+            "SELECT seq FROM change_log ORDER BY seq DESC LIMIT 1 OFFSET ?", (max_rows,)
+        ).fetchone()
+        if cutoff is not None:
+            trimmed = conn.execute("DELETE FROM change_log WHERE seq <= ?", (cutoff[0],)).rowcount
+            floor = max(floor, cutoff[0])
+
+        if deduplicated or consumed or trimmed:
+            conn.execute('''
+                INSERT INTO change_log_compactions (compacted_through, deduplicated, trimmed)
+                VALUES (?, ?, ?)
+            ''', (floor, deduplicated, consumed + trimmed))
+
+        rows = conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+
+        if owns_transaction:
+            conn.execute("COMMIT")
+    except Exception:
+        if owns_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    return {
+        'deduplicated': deduplicated,
+        'consumed': consumed,
+        'trimmed': trimmed,
+        'rows': rows,
+        'floor': floor,
+    }
+
+
+def get_change_log_stats(conn):
+    """
+    변경 로그 현황
+
+    화면을 다시 그릴 때마다 호출되므로 행을 세지 않고 순번 경계로 계산합니다.
+    압축으로 중간 변경이 지워졌을 수 있어 건수는 상한값입니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        dict: span (floor 이후 순번 수), head, floor,
+            consumers ({소비자: 커서 이후 순번 수})
+    """
+    head = get_change_log_head(conn)
+    floor = get_change_log_floor(conn)
+    consumers = {
+        consumer: max(head - last_seq, 0)
+        for consumer, last_seq in conn.execute(
+            "SELECT consumer, last_seq FROM change_consumers ORDER BY consumer"
+        ).fetchall()
+    }
+    return {
+        'span': head - floor,
+        'head': head,
+        'floor': floor,
+        'consumers': consumers,
+    }
+
+
+def _compaction_loop(connect, interval_seconds):
+    """백그라운드 압축 루프"""
+    conn = connect()
+    try:
+        while True:
+            try:
+                compact_change_log(conn)
+            except Exception:
+                # 잠금 충돌 등은 다음 주기에 재시도
+                pass
+            time.sleep(interval_seconds)
+    finally:
+        conn.close()
+
+
+def start_compaction_scheduler(connect, interval_seconds=DEFAULT_COMPACTION_INTERVAL):
+    """
+    변경 로그 압축 백그라운드 스케줄러 시작 (프로세스당 한 번)
+
+    Args:
+        connect (callable): 새 쓰기 가능 데이터베이스 연결을 반환하는 함수
+        interval_seconds (int): 압축 주기 (초)
+
+    Returns:
+        threading.Thread: 실행 중인 스케줄러 스레드
+    """
+    global _compaction_thread
+
+    with _compaction_lock:
+        if _compaction_thread is None or not _compaction_thread.is_alive():
+            _compaction_thread = threading.Thread(
+                target=_compaction_loop,
+                args=(connect, interval_seconds),
+                name="crm-change-log-compaction",
+                daemon=True
+            )
+            _compaction_thread.start()
+
+    return _compaction_thread
@@ -0,0 +1,147 @@
+"""
+database/codes.py
+
+업체코드 할당
+- code_sequences 테이블 기반 순차 번호 (충돌 없음)
+- 배치 단위로 번호 구간을 한 번에 예약 (배치당 쓰기 1회)
+- 짧고 단조 증가하는 고정 길이 코드 (예: C0000042)
+- 기존 AUTO 코드는 그대로 유효 (접두어가 달라 겹치지 않음)
+"""
+
+import re
+
+
+COMPANY_SEQUENCE = 'company'
+
+COMPANY_CODE_PREFIX = 'C'
+
+# 숫자 자릿수 (고정 길이라 문자열 정렬 = 번호 순서)
+COMPANY_CODE_DIGITS = 7
+
+# 순번으로 만든 업체코드 형식 (직접 지정한 코드도 이 형식이면 순번에 반영)
+_COMPANY_CODE_PATTERN = re.compile(rf'{COMPANY_CODE_PREFIX}(\d{{{COMPANY_CODE_DIGITS}}})')
+
+
+def format_company_code(value):
+    """
+    순번을 업체코드로 변환
+
+    Args:
+        value (int): 순번
+
+    Returns:
+        str: 업체코드 (예: 42 → C0000042)
+    """
+    return f"{COMPANY_CODE_PREFIX}{value:0{COMPANY_CODE_DIGITS}d}"
+
+
+def create_code_sequence_schema(conn):
+    """
+    코드 순번 테이블 생성 및 업체코드 순번 초기화
+
+    이미 같은 형식의 업체코드가 있으면 그 다음 번호부터 할당합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS code_sequences (
+            name TEXT PRIMARY KEY,
+            next_value INTEGER NOT NULL
+        )
+    ''')
+
+    pattern = COMPANY_CODE_PREFIX + '[0-9]' * COMPANY_CODE_DIGITS
+    conn.execute('''
+        INSERT OR IGNORE INTO code_sequences (name, next_value)
+        SELECT ?, COALESCE(MAX(CAST(substr(company_code, ?) AS INTEGER)), 0) + 1
+        FROM companies
+        WHERE company_code GLOB ?
+    ''', (COMPANY_SEQUENCE, len(COMPANY_CODE_PREFIX) + 1, pattern))
+
+
+def reserve_sequence(conn, count, name=COMPANY_SEQUENCE):
+    """
+    순번 구간 예약
+
+    호출자의 트랜잭션 안이면 그 트랜잭션에 포함되고 (배치가 롤백되면
+    예약도 취소), 아니면 자체 트랜잭션으로 바로 커밋합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (쓰기 가능)
+        count (int): 예약할 번호 수
+        name (str): 순번 이름
+
+    Returns:
+        range: 예약된 번호 구간
+    """
+    if count <= 0:
+        return range(0)
+
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute('''
+            INSERT INTO code_sequences (name, next_value) VALUES (?, ? + 1)
+            ON CONFLICT (name) DO UPDATE SET next_value = next_value + excluded.next_value - 1
+        ''', (name, count))
+        end = conn.execute(
+            "SELECT next_value FROM code_sequences WHERE name = ?", (name,)
+        ).fetchone()[0]
+
+        if owns_transaction:
+            conn.execute("COMMIT")
+    except Exception:
+        if owns_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    return range(end - count, end)
+
+
+def advance_sequence(conn, value, name=COMPANY_SEQUENCE):
+    """
+    순번을 value 다음 번호 이상으로 전진 (이미 사용된 번호를 다시 할당하지 않도록)
+
+    호출자의 트랜잭션에 포함됩니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (쓰기 가능)
+        value (int): 이미 사용된 번호
+        name (str): 순번 이름
+    """
+    conn.execute('''
+        INSERT INTO code_sequences (name, next_value) VALUES (?, ? + 1)
+        ON CONFLICT (name) DO UPDATE SET next_value = MAX(next_value, excluded.next_value)
+    ''', (name, value))
+
+
+def reserve_company_code(conn, company_code):
+    """
+    직접 지정한 업체코드를 순번에 반영
+
+    순번 형식(예: C0000042)이면 이후 자동 할당이 그 번호를 건너뛰도록
+    순번을 전진합니다. 다른 형식(기존 AUTO 코드 등)은 순번과 겹치지 않으므로 그대로 둡니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (쓰기 가능)
+        company_code (str): 직접 지정한 업체코드
+    """
+    match = _COMPANY_CODE_PATTERN.fullmatch(str(company_code))
+    if match:
+        advance_sequence(conn, int(match.group(1)))
+
+
+def allocate_company_codes(conn, count):
+    """
+    새 업체코드 일괄 할당
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (쓰기 가능)
+        count (int): 필요한 코드 수
+
+    Returns:
+        list: 업체코드 목록 (오름차순)
+    """
+    return [format_company_code(value) for value in reserve_sequence(conn, count)]
@@ -0,0 +1,452 @@
+"""
+database/companies.py
+
+기업명 정규화 및 중복 기업 병합
+- name_key: 법인 형태/공백/기호를 제거한 비교용 기업명 (인덱스, 트리거로 유지)
+- 기업명 → 업체코드 조회는 name_key 기준 (배치는 임시 테이블로 한 번에 조회)
+- 기업명 → 업체코드 프로세스 공유 LRU 캐시 (write-through 무효화, 적중률 지표)
+- 중복 기업 후보 보고서, 병합 (한 트랜잭션)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .codes import allocate_company_codes
+
+
+# 비교 시 제거할 법인 형태 표기 (긴 표기부터 제거)
+LEGAL_FORM_TOKENS = [
+    '주식회사', '유한회사', '유한책임회사', '합자회사', '합명회사',
+    '재단법인', '사단법인', '협동조합',
+    '(주)', '㈜', '(유)', '(재)', '(사)', '(합)',
+    'co.,ltd.', 'co.,ltd', 'co., ltd.', 'co., ltd', 'co.ltd', 'ltd.', 'inc.', 'corp.',
+]
+
+# 법인 형태 제거 후 지울 공백/기호
+SEPARATOR_TOKENS = [' ', '.', ',', '-', '_', '(', ')', '·', '&', "'", '"']
+
+# UPDATE 문 하나에 중첩할 replace() 수 (SQLite 파서 스택 한도)
+_REPLACES_PER_STATEMENT = 10
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# 병합 시 남길 기업에 비어 있으면 중복에서 채울 컬럼
+MERGE_FILL_COLUMNS = [
+    'revenue_2024', 'industry', 'employee_count', 'address', 'products', 'customer_category'
+]
+
+# 기업명 캐시 최대 항목 수 (CRM_NAME_CACHE_SIZE로 변경)
+NAME_CACHE_SIZE = int(os.environ.get('CRM_NAME_CACHE_SIZE', 10000))
+
+# 기업명 → (업체코드, 비교키), 최근 사용 순
+_name_cache = OrderedDict()
+_name_cache_lock = threading.Lock()
+_name_cache_metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+# 중복 후보 보고서 컬럼
+DUPLICATE_COMPANY_COLUMNS = [
+    '비교키', '업체코드', '기업명', '연락처수', '상담건수', '등록일', '유지'
+]
+
+
+def normalize_company_name(company_name):
+    """
+    기업명을 비교용 형식으로 변환
+
+    예) "(주)한빛", "한빛 주식회사", "㈜ 한빛" → "한빛"
+
+    Args:
+        company_name (str): 기업명
+
+    Returns:
+        str or None: 정규화된 기업명 (비어 있으면 None)
+    """
+    if company_name is None or (isinstance(company_name, float) and company_name != company_name):
+        return None
+
+    # SQLite lower()/trim()과 같은 규칙 (ASCII만 소문자, 양끝 공백만 제거)
+    name = str(company_name).strip(' ').translate(_ASCII_LOWER)
+    key = name
+    for token in LEGAL_FORM_TOKENS + SEPARATOR_TOKENS:
+        key = key.replace(token, '')
+
+    # 법인 표기만으로 된 기업명("주식회사")은 원래 이름으로 비교
+    return key or name or None
+
+
+def _name_key_update_statements(where):
+    """
+    name_key를 계산하는 UPDATE 문 목록 (normalize_company_name과 같은 규칙)
+
+    replace()를 한 식에 모두 중첩하면 SQLite 파서 한도를 넘으므로
+    여러 UPDATE 문으로 나누어 차례로 적용합니다.
+    """
+    statements = [f"UPDATE companies SET name_key = lower(trim(company_name)) WHERE {where}"]
+
+    tokens = LEGAL_FORM_TOKENS + SEPARATOR_TOKENS
+    for start in range(0, len(tokens), _REPLACES_PER_STATEMENT):
+        sql = 'name_key'
+        for token in tokens[start:start + _REPLACES_PER_STATEMENT]:
+            escaped = token.replace("'", "''")
+            sql = f"replace({sql}, '{escaped}', '')"
+        statements.append(f"UPDATE companies SET name_key = {sql} WHERE {where}")
+
+    statements.append(
+        "UPDATE companies SET name_key = NULLIF(COALESCE(NULLIF(name_key, ''), lower(trim(company_name))), '') "
+        f"WHERE {where}"
+    )
+    return statements
+
+
+def create_company_keys_schema(conn):
+    """
+    companies에 name_key 컬럼, 인덱스, 유지 트리거 추가
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(companies)")}
+    if 'name_key' not in columns:
+        conn.execute("ALTER TABLE companies ADD COLUMN name_key TEXT")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_name_key ON companies(name_key)")
+
+    # 기업을 추가/수정하는 모든 경로 (일괄 입력, 그리드 편집 등)에서 유지
+    body = ';\n'.join(_name_key_update_statements('rowid = NEW.rowid'))
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_companies_name_key_insert
+        AFTER INSERT ON companies
+        BEGIN
+            {body};
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_companies_name_key_update
+        AFTER UPDATE OF company_name ON companies
+        BEGIN
+            {body};
+        END
+    ''')
+
+
+def rebuild_company_keys(conn):
+    """
+    모든 기업의 name_key를 다시 계산
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    for statement in _name_key_update_statements('1'):
+        conn.execute(statement)
+
+
+def find_company_code_by_name(conn, company_name):
+    """
+    기업명으로 기존 업체코드 조회 (정규화된 기업명 기준)
+
+    같은 비교키의 기업이 여러 개면 기업명이 정확히 같은 기업,
+    그다음 먼저 등록된 기업을 반환합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        company_name (str): 기업명
+
+    Returns:
+        str or None: 업체코드 (없으면 None)
+    """
+    name_key = normalize_company_name(company_name)
+    if name_key is None:
+        return None
+
+    row = conn.execute('''
+        SELECT company_code FROM companies
+        WHERE name_key = ?
+        ORDER BY company_name = ? DESC, rowid
+        LIMIT 1
+    ''', (name_key, company_name)).fetchone()
+    return row[0] if row else None
+
+
+def _cache_store(company_name, company_code, name_key):
+    """캐시에 저장 (용량 초과 시 가장 오래 사용하지 않은 항목 제거, 잠금 보유 상태에서 호출)"""
+    _name_cache[company_name] = (company_code, name_key)
+    _name_cache.move_to_end(company_name)
+    while len(_name_cache) > NAME_CACHE_SIZE:
+        _name_cache.popitem(last=False)
+        _name_cache_metrics['evictions'] += 1
+
+
+def lookup_company_code(conn, company_name):
+    """
+    기업명으로 기존 업체코드 조회 (프로세스 공유 캐시 사용)
+
+    캐시에 없으면 find_company_code_by_name()으로 조회한 뒤 저장합니다.
+    없는 기업명은 캐시하지 않습니다 (곧 생성될 수 있으므로).
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        company_name (str): 기업명
+
+    Returns:
+        str or None: 업체코드 (없으면 None)
+    """
+    with _name_cache_lock:
+        entry = _name_cache.get(company_name)
+        if entry is not None:
+            _name_cache.move_to_end(company_name)
+            _name_cache_metrics['hits'] += 1
+            return entry[0]
+        _name_cache_metrics['misses'] += 1
+
+    company_code = find_company_code_by_name(conn, company_name)
+    if company_code is not None:
+        remember_company_codes({company_name: company_code})
+    return company_code
+
+
+def remember_company_codes(name_codes):
+    """
+    커밋된 기업명 → 업체코드 결과를 캐시에 기록 (write-through)
+
+    Args:
+        name_codes (dict): {기업명: 업체코드}
+    """
+    with _name_cache_lock:
+        for company_name, company_code in name_codes.items():
+            name_key = normalize_company_name(company_name)
+            if name_key is not None and company_code is not None:
+                _cache_store(company_name, company_code, name_key)
+
+
+def forget_company_codes(company_codes=(), company_names=()):
+    """
+    기업 변경 시 관련 캐시 항목 무효화
+
+    업체코드가 같은 항목과, 주어진 기업명과 비교키가 같은 항목을 모두
+    제거합니다 (이름 변경으로 같은 비교키의 조회 결과가 달라질 수 있음).
+
+    Args:
+        company_codes (iterable): 변경/삭제된 업체코드
+        company_names (iterable): 새로 쓰인 기업명 (이름 변경 후 값)
+    """
+    codes = set(company_codes)
+    keys = {normalize_company_name(name) for name in company_names} - {None}
+
+    with _name_cache_lock:
+        stale = [
+            company_name for company_name, (company_code, name_key) in _name_cache.items()
+            if company_code in codes or name_key in keys
+        ]
+        for company_name in stale:
+            del _name_cache[company_name]
+        _name_cache_metrics['invalidations'] += len(stale)
+
+
+def clear_name_cache():
+    """기업명 캐시 전체 비우기 (일괄 삭제/초기화 후)"""
+    with _name_cache_lock:
+        _name_cache_metrics['invalidations'] += len(_name_cache)
+        _name_cache.clear()
+
+
+def get_name_cache_stats():
+    """
+    기업명 캐시 사용 현황
+
+    Returns:
+        dict: size, capacity, hits, misses, hit_rate, evictions, invalidations
+    """
+    with _name_cache_lock:
+        lookups = _name_cache_metrics['hits'] + _name_cache_metrics['misses']
+        return {
+            'size': len(_name_cache),
+            'capacity': NAME_CACHE_SIZE,
+            **_name_cache_metrics,
+            'hit_rate': _name_cache_metrics['hits'] / lookups if lookups else 0.0,
+        }
+
+
+def resolve_company_codes(conn, company_names):
+    """
+    기업명 목록을 업체코드로 일괄 변환 (없는 기업은 생성)
+
+    고유 기업명을 임시 테이블에 한 번에 넣고 한 번의 조회로 기존
+    업체코드를 찾은 뒤, 없는 기업은 코드 구간을 한 번에 예약하고
+    한 번의 executemany로 생성합니다.
+    같은 배치 안에서 비교키가 같은 새 기업명("(주)한빛", "한빛")은 하나의
+    기업으로 생성됩니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (쓰기 가능)
+        company_names (iterable): 기업명 목록 (중복 허용)
+
+    Returns:
+        dict: {기업명: 업체코드} (비교키가 비어 있는 기업명은 제외)
+    """
+    keys = {}
+    for name in company_names:
+        if name not in keys:
+            name_key = normalize_company_name(name)
+            if name_key is not None:
+                keys[name] = name_key
+    if not keys:
+        return {}
+
+    conn.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS resolve_company_names (
+            company_name TEXT PRIMARY KEY,
+            name_key TEXT NOT NULL
+        )
+    ''')
+    conn.execute("DELETE FROM temp.resolve_company_names")
+    conn.executemany(
+        "INSERT INTO temp.resolve_company_names (company_name, name_key) VALUES (?, ?)",
+        keys.items()
+    )
+
+    # 비교키별로 기업명이 정확히 같은 기업, 그다음 먼저 등록된 기업 선택
+    resolved = dict(conn.execute('''
+        SELECT company_name, company_code
+        FROM (
+            SELECT
+                r.company_name,
+                c.company_code,
+                ROW_NUMBER() OVER (
+                    PARTITION BY r.company_name
+                    ORDER BY c.company_name = r.company_name DESC, c.rowid
+                ) AS rank
+            FROM temp.resolve_company_names r
+            LEFT JOIN companies c ON c.name_key = r.name_key
+        )
+        WHERE rank = 1
+    ''').fetchall())
+    conn.execute("DELETE FROM temp.resolve_company_names")
+
+    # 비교키별로 입력에서 처음 나온 기업명으로 새 기업 생성 (조회 결과 순서와 무관)
+    new_names = {}
+    for name, name_key in keys.items():
+        if resolved.get(name) is None:
+            new_names.setdefault(name_key, name)
+
+    new_codes = dict(zip(new_names, allocate_company_codes(conn, len(new_names))))
+    for name, code in resolved.items():
+        if code is None:
+            resolved[name] = new_codes[keys[name]]
+
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [(new_codes[name_key], name) for name_key, name in new_names.items()]
+    )
+    return resolved
+
+
+def find_duplicate_companies(conn):
+    """
+    중복 기업 후보 보고서
+
+    name_key가 같은 기업끼리 묶어 비교하며, 그룹마다 상담 건수와
+    연락처 수가 가장 많은 기업을 남길 기업으로 제안합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        pd.DataFrame: 비교키별 중복 기업 목록 (유지=True가 제안된 남길 기업)
+    """
+    df = pd.read_sql_query('''
+        SELECT
+            c.name_key AS 비교키,
+            c.company_code AS 업체코드,
+            c.company_name AS 기업명,
+            COALESCE(cs.contact_count, 0) AS 연락처수,
+            COALESCE(cs.consultation_count, 0) AS 상담건수,
+            c.created_at AS 등록일
+        FROM companies c
+        JOIN (
+            SELECT name_key FROM companies
+            WHERE name_key IS NOT NULL
+            GROUP BY name_key
+            HAVING COUNT(*) > 1
+        ) dup ON dup.name_key = c.name_key
+        LEFT JOIN company_stats cs ON cs.company_code = c.company_code
+        ORDER BY c.name_key, 상담건수 DESC, 연락처수 DESC, c.rowid
+    ''', conn)
+
+    df['유지'] = ~df['비교키'].duplicated()
+    return df[DUPLICATE_COMPANY_COLUMNS]
+
+
+def merge_companies(conn, keep_code, duplicate_codes):
+    """
+    중복 기업을 하나로 병합
+
+    남길 기업의 빈 필드를 중복 기업 값으로 채우고, 중복 기업의 연락처와
+    상담 이력을 남길 업체코드로 옮긴 뒤 중복 기업을 삭제합니다.
+    모든 변경은 한 트랜잭션에서 처리됩니다.
+
+    Args:
+        conn (sqlite3.Connection): autocommit 모드의 데이터베이스 연결
+        keep_code (str): 남길 업체코드
+        duplicate_codes (list): 병합 후 삭제할 업체코드 목록
+
+    Returns:
+        dict: kept, merged, contacts_moved, consultations_moved
+    """
+    duplicate_codes = [code for code in duplicate_codes if code != keep_code]
+    if not duplicate_codes:
+        return {'kept': keep_code, 'merged': 0, 'contacts_moved': 0, 'consultations_moved': 0}
+
+    placeholders = ', '.join('?' for _ in duplicate_codes)
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM companies WHERE company_code = ?", (keep_code,)).fetchone() is None:
+            raise ValueError(f"기업을 찾을 수 없습니다: {keep_code}")
+
+        # 빈 필드 채우기 (가장 최근 등록된 중복의 값 우선)
+        fill = ', '.join(
+            f'''{column} = COALESCE({column}, (
+                SELECT {column} FROM companies
+                WHERE company_code IN ({placeholders}) AND {column} IS NOT NULL
+                ORDER BY rowid DESC LIMIT 1
+            ))'''
+            for column in MERGE_FILL_COLUMNS
+        )
+        conn.execute(
+            f"UPDATE companies SET {fill}, updated_at = CURRENT_TIMESTAMP WHERE company_code = ?",
+            duplicate_codes * len(MERGE_FILL_COLUMNS) + [keep_code]
+        )
+
+        contacts_moved = conn.execute(f'''
+            UPDATE customer_contacts SET company_code = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE company_code IN ({placeholders})
+        ''', [keep_code] + duplicate_codes).rowcount
+
+        consultations_moved = conn.execute(f'''
+            UPDATE consultations SET company_code = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE company_code IN ({placeholders})
+        ''', [keep_code] + duplicate_codes).rowcount
+
+        merged = conn.execute(
+            f"DELETE FROM companies WHERE company_code IN ({placeholders})", duplicate_codes
+        ).rowcount
+
+        if owns_transaction:
+            conn.execute("COMMIT")
+    except Exception:
+        if owns_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    forget_company_codes(duplicate_codes)
+
+    return {
+        'kept': keep_code,
+        'merged': merged,
+        'contacts_moved': contacts_moved,
+        'consultations_moved': consultations_moved,
+    }
@@ -5,110 +5,70 @@ database/connection.py
 - 데이터베이스 초기화 및 테이블 생성
 - 업체코드 자동 생성
 - 데이터 파싱 유틸리티
+- streamlit은 화면 알림이 필요할 때만 import (CLI에서 그대로 사용 가능)
 """
 
-import streamlit as st
 import sqlite3
-import uuid
 import pandas as pd
 import os
+import threading
+import time
 
+from .migrations import initialize_schema
+from .settings import get_db_settings, get_db_file_path, create_connection
+from .stats import get_table_counts
+from .health import quick_health_check
+from .codes import allocate_company_codes
+from .streamlit_cache import cache_resource
 
-@st.cache_resource
+
+# 쓰기 불가 결과를 다시 확인하기까지의 시간 (초)
+WRITE_CAPABILITY_RETRY_SECONDS = 30
+
+_write_capability_lock = threading.Lock()
+_write_capability = None
+
+
+@cache_resource
 def init_database():
     """
     SQLite 데이터베이스 연결 생성 및 테이블 초기화
     
+    DB 위치와 PRAGMA 프로필은 database.settings 설정을 따릅니다.
+    
     Returns:
         sqlite3.Connection: 데이터베이스 연결 객체
     """
-    # 데이터베이스 파일 경로 확인 및 생성
-    db_path = 'crm_database.db'
+    settings = get_db_settings()
+    db_path = get_db_file_path(settings)
     
-    # 파일이 존재하지 않으면 빈 파일 생성
-    if not os.path.exists(db_path):
-        open(db_path, 'a').close()
-    
-    # 파일 권한 확인 및 설정
-    try:
-        if os.path.exists(db_path):
+    if db_path and not settings['readonly']:
+        # 파일이 존재하지 않으면 빈 파일 생성
+        if not os.path.exists(db_path):
+            open(db_path, 'a').close()
+        
+        # 파일 권한 확인 및 설정
+        try:
             os.chmod(db_path, 0o666)  # 읽기/쓰기 권한 설정
-    except:
-        pass  # 권한 설정이 실패해도 계속 진행
-    
-    # 연결 옵션 개선
-    conn = sqlite3.connect(
-        db_path, 
-        check_same_thread=False,
-        timeout=30.0,  # 30초 타임아웃
-        isolation_level=None  # autocommit 모드
-    )
-    
-    # WAL 모드 설정 (동시 접근 개선)
-    try:
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL") 
-        conn.execute("PRAGMA cache_size=1000")
-        conn.execute("PRAGMA temp_store=memory")
-    except:
-        pass  # PRAGMA 설정이 실패해도 계속 진행
-    
-    # 기업 테이블 생성
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS companies (
-            company_code TEXT PRIMARY KEY,
-            company_name TEXT NOT NULL,
-            revenue_2024 REAL,
-            industry TEXT,
-            employee_count INTEGER,
-            address TEXT,
-            products TEXT,
-            customer_category TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 고객 연락처 테이블 생성
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS customer_contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company_code TEXT,
-            customer_name TEXT NOT NULL,
-            position TEXT,
-            phone TEXT,
-            email TEXT,
-            acquisition_path TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (company_code) REFERENCES companies(company_code)
-        )
-    ''')
-    
-    # 상담 이력 테이블 생성
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS consultations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company_code TEXT,
-            customer_name TEXT,
-            consultation_date TEXT,
-            consultation_content TEXT NOT NULL,
-            project_name TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (company_code) REFERENCES companies(company_code)
-        )
-    ''')
+        except:
+            pass  # 권한 설정이 실패해도 계속 진행
+    
+    # 설정된 위치/PRAGMA 프로필로 연결
+    conn = create_connection(settings=settings)
+    
+    # 테이블 생성 및 스키마 마이그레이션 적용 (읽기 전용이면 생략)
+    if not settings['readonly']:
+        initialize_schema(conn)
     
     # 즉시 커밋
     try:
         conn.commit()
     except Exception as e:
+        import streamlit as st
         st.error(f"데이터베이스 초기화 실패: {e}")
         # 연결 재시도
         conn.close()
-        conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
-        conn.commit()
+        conn = create_connection(settings=settings)
     
     return conn
 
@@ -121,41 +81,39 @@ def get_writable_connection():
     Returns:
         sqlite3.Connection: 쓰기 가능한 데이터베이스 연결
     """
-    db_path = 'crm_database.db'
+    db_path = get_db_file_path()
     
     # 파일 권한 확인
-    if os.path.exists(db_path):
+    if db_path and os.path.exists(db_path):
         try:
             os.chmod(db_path, 0o666)
         except:
             pass
     
     # 새로운 연결 생성 (캐시되지 않음)
-    conn = sqlite3.connect(
-        db_path,
-        check_same_thread=False,
-        timeout=30.0,
-        isolation_level=None  # autocommit 모드
-    )
-    
-    # WAL 모드 설정
-    try:
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-    except:
-        pass
-    
-    return conn
+    return create_connection()
 
 
-def generate_company_code():
+def generate_company_code(conn=None):
     """
-    자동 업체코드 생성
+    자동 업체코드 생성 (code_sequences 순번 기반, 충돌 없음)
+    
+    여러 개가 필요하면 allocate_company_codes()로 한 번에 예약하세요.
+    
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 연결 (기본값: 새 연결)
     
     Returns:
-        str: AUTO + 8자리 랜덤 문자열 (예: AUTO12AB34CD)
+        str: C + 7자리 순번 (예: C0000042)
     """
-    return f"AUTO{str(uuid.uuid4())[:8].upper()}"
+    if conn is not None:
+        return allocate_company_codes(conn, 1)[0]
+    
+    write_conn = create_connection()
+    try:
+        return allocate_company_codes(write_conn, 1)[0]
+    finally:
+        write_conn.close()
 
 
 def parse_revenue(revenue_str):
@@ -192,11 +150,12 @@ def get_table_info(conn):
     tables = ['companies', 'customer_contacts', 'consultations']
     table_info = {}
     
+    # 레코드 수는 요약 테이블에서 조회
+    table_counts = get_table_counts(conn)
+    
     for table in tables:
         try:
-            # 레코드 수 조회
-            count_result = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
-            record_count = count_result[0] if count_result else 0
+            record_count = table_counts.get(table, 0)
             
             # 컬럼 정보 조회
             columns_result = conn.execute(f"PRAGMA table_info({table})").fetchall()
@@ -223,75 +182,117 @@ def check_database_health(conn):
     """
     데이터베이스 상태 확인
     
+    시작 시 매번 호출되므로 빠른 점검만 수행합니다. 전체 무결성/외래키
+    점검은 database.health의 백그라운드 스케줄러가 담당합니다.
+    
     Args:
         conn (sqlite3.Connection): 데이터베이스 연결
         
     Returns:
         dict: 데이터베이스 상태 정보
     """
+    return quick_health_check(conn)
+
+
+def _probe_write_capability():
+    """
+    DDL 없이 쓰기 가능 여부 확인
+    
+    파일/디렉토리 접근 권한을 확인한 뒤 BEGIN IMMEDIATE로 쓰기 잠금을
+    얻었다가 바로 ROLLBACK 합니다. 스키마를 변경하지 않으므로 다른
+    연결의 prepared statement가 무효화되지 않습니다.
+    
+    Returns:
+        dict: {'writable': bool, 'reason': str}
+    """
+    settings = get_db_settings()
+    if settings['readonly']:
+        return {'writable': False, 'reason': "읽기 전용 모드로 설정되어 있습니다."}
+    
+    db_path = get_db_file_path(settings)
+    if db_path is None:
+        # 인메모리 DB는 파일 권한 확인 불필요
+        return {'writable': True, 'reason': ""}
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    
+    if os.path.exists(db_path) and not os.access(db_path, os.W_OK):
+        return {'writable': False, 'reason': f"DB 파일에 쓰기 권한이 없습니다: {db_path}"}
+    
+    # WAL 모드는 같은 디렉토리에 -wal, -shm 파일을 만들어야 함
+    if not os.access(db_dir, os.W_OK):
+        return {'writable': False, 'reason': f"DB 디렉토리에 쓰기 권한이 없습니다: {db_dir}"}
+    
+    conn = None
     try:
-        # 기본 연결 테스트
-        conn.execute("SELECT 1").fetchone()
-        
-        # 테이블 존재 확인
-        tables = ['companies', 'customer_contacts', 'consultations']
-        missing_tables = []
-        
-        for table in tables:
-            result = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?", 
-                (table,)
-            ).fetchone()
-            if not result:
-                missing_tables.append(table)
-        
-        # 외래키 제약 조건 확인
-        foreign_key_check = conn.execute("PRAGMA foreign_key_check").fetchall()
-        
-        # 상태 판단
-        if missing_tables:
-            status = 'missing_tables'
-        elif foreign_key_check:
-            status = 'foreign_key_errors'
-        else:
-            status = 'healthy'
-        
-        return {
-            'status': status,
-            'missing_tables': missing_tables,
-            'foreign_key_errors': len(foreign_key_check),
-            'connection_ok': True
-        }
-        
+        conn = get_writable_connection()
+        conn.execute("PRAGMA busy_timeout = 1000")
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("ROLLBACK")
+        return {'writable': True, 'reason': ""}
+    except sqlite3.OperationalError as e:
+        if 'locked' in str(e) or 'busy' in str(e):
+            # 다른 연결이 쓰는 중일 뿐 권한 문제는 아님
+            return {'writable': True, 'reason': str(e)}
+        return {'writable': False, 'reason': str(e)}
     except Exception as e:
-        return {
-            'status': 'error',
-            'error': str(e),
-            'connection_ok': False
-        }
+        return {'writable': False, 'reason': str(e)}
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def get_write_capability(force=False):
+    """
+    쓰기 가능 여부 조회 (프로세스 전체에서 캐시)
+    
+    쓰기 가능 결과는 쓰기 실패가 보고될 때까지 유지되고, 쓰기 불가 결과는
+    WRITE_CAPABILITY_RETRY_SECONDS 이후 다시 확인합니다.
+    
+    Args:
+        force (bool): 캐시를 무시하고 다시 확인
+        
+    Returns:
+        dict: {'writable': bool, 'reason': str, 'checked_at': float}
+    """
+    global _write_capability
+    
+    with _write_capability_lock:
+        capability = _write_capability
+        expired = (
+            capability is not None
+            and not capability['writable']
+            and time.time() - capability['checked_at'] > WRITE_CAPABILITY_RETRY_SECONDS
+        )
+        if force or capability is None or expired:
+            capability = _probe_write_capability()
+            capability['checked_at'] = time.time()
+            _write_capability = capability
+    
+    return capability
+
+
+def invalidate_write_capability():
+    """
+    쓰기 실패 시 호출 - 다음 확인 때 쓰기 가능 여부를 다시 검사
+    """
+    global _write_capability
+    
+    with _write_capability_lock:
+        _write_capability = None
 
 
 def test_write_permission():
     """
-    데이터베이스 쓰기 권한 테스트
+    데이터베이스 쓰기 권한 테스트 (캐시된 결과 사용)
     
     Returns:
         bool: 쓰기 가능 여부
     """
-    try:
-        conn = get_writable_connection()
-        
-        # 테스트 테이블 생성/삭제
-        conn.execute("CREATE TABLE IF NOT EXISTS test_write (id INTEGER)")
-        conn.execute("INSERT INTO test_write (id) VALUES (1)")
-        conn.execute("DELETE FROM test_write")
-        conn.execute("DROP TABLE test_write")
-        
-        conn.close()
-        return True
-    except Exception as e:
-        st.error(f"쓰기 권한 테스트 실패: {e}")
-        return False
+    capability = get_write_capability()
+    if not capability['writable']:
+        import streamlit as st
+        st.error(f"쓰기 권한 테스트 실패: {capability['reason']}")
+    return capability['writable']
 
 
 def test_connection():
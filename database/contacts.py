@@ -0,0 +1,332 @@
+"""
+database/contacts.py
+
+연락처 전화번호/이메일 정규화 및 조회
+- phone_key, email_key: 비교용 정규화 컬럼 (인덱스)
+- 가져오기/마이그레이션 시 일괄 계산
+- 수신 전화번호로 연락처와 기업을 한 번에 조회
+- 상담 이력 ↔ 연락처 연결 (consultations.contact_id)
+"""
+
+import math
+import re
+
+
+# 엑셀에서 숫자로 읽혀 앞자리 0이 사라진 휴대전화 번호 접두어 (10, 11, 16~19)
+_MOBILE_PREFIXES = ('10', '11', '16', '17', '18', '19')
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(phone):
+    """
+    전화번호를 비교용 국내 형식 숫자열로 변환
+
+    예) "010-1234-5678", "01012345678", "+82 10-1234-5678",
+        "(010) 1234 5678", 엑셀 숫자 1012345678 → "01012345678"
+
+    Args:
+        phone: 전화번호 (문자열 또는 숫자)
+
+    Returns:
+        str or None: 숫자만 남긴 전화번호 (번호로 볼 수 없으면 None)
+    """
+    if phone is None:
+        return None
+    if isinstance(phone, float):
+        if math.isnan(phone):
+            return None
+        phone = int(phone)
+    if isinstance(phone, int):
+        phone = str(phone)
+
+    text = str(phone).strip()
+    digits = _NON_DIGITS.sub('', text)
+
+    # 국가번호 (+82 / 0082) 제거
+    if text.startswith('+82') or digits.startswith('0082'):
+        digits = digits[4:] if digits.startswith('0082') else digits[2:]
+        if not digits.startswith('0'):
+            digits = '0' + digits
+
+    # 숫자로 저장되어 앞자리 0이 빠진 번호
+    if len(digits) in (9, 10) and digits.startswith(_MOBILE_PREFIXES):
+        digits = '0' + digits
+
+    if len(digits) < 7:
+        return None
+    return digits
+
+
+def normalize_email(email):
+    """
+    이메일을 비교용 형식으로 변환 (앞뒤 공백 제거, 소문자)
+
+    Args:
+        email (str): 이메일 주소
+
+    Returns:
+        str or None: 정규화된 이메일 (비어 있거나 @가 없으면 None)
+    """
+    if email is None or (isinstance(email, float) and math.isnan(email)):
+        return None
+
+    email = str(email).strip().lower()
+    if '@' not in email:
+        return None
+    return email
+
+
+def normalize_person_name(name):
+    """
+    고객명을 비교용 형식으로 변환 (공백 제거, 소문자)
+
+    Args:
+        name (str): 고객명
+
+    Returns:
+        str or None: 정규화된 고객명 (비어 있으면 None)
+    """
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return None
+
+    name = ''.join(str(name).split()).lower()
+    return name or None
+
+
+def create_contact_keys_schema(conn):
+    """
+    customer_contacts에 정규화 컬럼과 인덱스 추가
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(customer_contacts)")}
+    for column in ('phone_key', 'email_key'):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE customer_contacts ADD COLUMN {column} TEXT")
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_phone_key ON customer_contacts(phone_key)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_email_key ON customer_contacts(email_key)"
+    )
+
+
+def rebuild_contact_keys(conn):
+    """
+    모든 연락처의 정규화 컬럼을 다시 계산
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        int: 값이 바뀐 연락처 수
+    """
+    updates = []
+    for contact_id, phone, email, phone_key, email_key in conn.execute(
+        "SELECT id, phone, email, phone_key, email_key FROM customer_contacts"
+    ):
+        new_phone_key = normalize_phone(phone)
+        new_email_key = normalize_email(email)
+        if (new_phone_key, new_email_key) != (phone_key, email_key):
+            updates.append((new_phone_key, new_email_key, contact_id))
+
+    conn.executemany(
+        "UPDATE customer_contacts SET phone_key = ?, email_key = ? WHERE id = ?",
+        updates
+    )
+    return len(updates)
+
+
+def _lookup_contacts(conn, column, key):
+    """정규화 컬럼으로 연락처 + 기업 + 상담 요약 조회"""
+    if key is None:
+        return []
+
+    rows = conn.execute(f'''
+        SELECT
+            cc.id,
+            cc.customer_name,
+            cc.position,
+            cc.phone,
+            cc.email,
+            c.company_code,
+            c.company_name,
+            c.industry,
+            c.customer_category,
+            COALESCE(cs.consultation_count, 0),
+            cs.last_consultation_date
+        FROM customer_contacts cc
+        LEFT JOIN companies c ON c.company_code = cc.company_code
+        LEFT JOIN company_stats cs ON cs.company_code = cc.company_code
+        WHERE cc.{column} = ?
+        ORDER BY cc.id DESC
+    ''', (key,)).fetchall()
+
+    return [
+        {
+            'contact_id': row[0],
+            'customer_name': row[1],
+            'position': row[2],
+            'phone': row[3],
+            'email': row[4],
+            'company_code': row[5],
+            'company_name': row[6],
+            'industry': row[7],
+            'customer_category': row[8],
+            'consultation_count': row[9],
+            'last_consultation_date': row[10],
+        }
+        for row in rows
+    ]
+
+
+def lookup_contact_by_phone(conn, phone):
+    """
+    수신 전화번호로 연락처와 소속 기업 조회
+
+    입력 형식과 관계없이 phone_key 인덱스로 한 번에 조회합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        phone (str): 전화번호 (임의 형식)
+
+    Returns:
+        list: 일치하는 연락처 dict 목록 (최근 등록 순)
+    """
+    return _lookup_contacts(conn, 'phone_key', normalize_phone(phone))
+
+
+def lookup_contact_by_email(conn, email):
+    """
+    이메일로 연락처와 소속 기업 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        email (str): 이메일 주소 (대소문자 무관)
+
+    Returns:
+        list: 일치하는 연락처 dict 목록 (최근 등록 순)
+    """
+    return _lookup_contacts(conn, 'email_key', normalize_email(email))
+
+
+def create_consultation_contact_schema(conn):
+    """
+    consultations에 연락처 참조(contact_id) 컬럼, 인덱스, 삭제 트리거 추가
+
+    연락처가 삭제되면 해당 상담 이력의 contact_id는 NULL이 됩니다
+    (상담 이력은 고객명과 함께 그대로 남음).
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(consultations)")}
+    if 'contact_id' not in columns:
+        conn.execute(
+            "ALTER TABLE consultations ADD COLUMN contact_id INTEGER REFERENCES customer_contacts(id)"
+        )
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_consultations_contact_id ON consultations(contact_id)"
+    )
+    # (업체코드, 고객명) → 연락처 변환용
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_company_name ON customer_contacts(company_code, customer_name)"
+    )
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_contacts_delete_unlink
+        AFTER DELETE ON customer_contacts
+        BEGIN
+            UPDATE consultations SET contact_id = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE contact_id = OLD.id;
+        END
+    ''')
+
+
+def link_consultation_contacts(conn, since_consultation_id=None, since_contact_id=None):
+    """
+    contact_id가 비어 있는 상담 이력을 (업체코드, 고객명)으로 연락처와 연결
+
+    한 번의 UPDATE로 처리합니다. 같은 기업에 같은 이름의 연락처가 여럿이면
+    가장 먼저 등록된 연락처와 연결합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        since_consultation_id (int): 이 ID보다 큰 상담 이력만 대상 (상담 가져오기 후)
+        since_contact_id (int): 이 ID보다 큰 연락처만 대상 (연락처 가져오기 후)
+
+    Returns:
+        int: 연결된 상담 이력 수
+    """
+    contact_filters = []
+    consultation_filter = ''
+    params = []
+    if since_contact_id is not None:
+        contact_filters.append('id > ?')
+        params.append(since_contact_id)
+    if since_consultation_id is not None:
+        # 새 상담 이력의 (업체코드, 고객명)만 idx_contacts_company_name으로 조회
+        # (연락처 전체를 GROUP BY하지 않도록)
+        contact_filters.append('''(company_code, customer_name) IN (
+                SELECT company_code, customer_name FROM consultations
+                WHERE id > ? AND contact_id IS NULL
+            )''')
+        params.append(since_consultation_id)
+        consultation_filter = 'AND consultations.id > ?'
+        params.append(since_consultation_id)
+    contact_filter = ('WHERE ' + ' AND '.join(contact_filters)) if contact_filters else ''
+
+    return conn.execute(f'''
+        UPDATE consultations
+        SET contact_id = m.contact_id, updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT company_code, customer_name, MIN(id) AS contact_id
+            FROM customer_contacts
+            {contact_filter}
+            GROUP BY company_code, customer_name
+        ) AS m
+        WHERE consultations.contact_id IS NULL
+        AND m.company_code = consultations.company_code
+        AND m.customer_name = consultations.customer_name
+        {consultation_filter}
+    ''', params).rowcount
+
+
+def find_contact_id(conn, company_code, customer_name):
+    """
+    (업체코드, 고객명)으로 연락처 ID 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        company_code (str): 업체코드
+        customer_name (str): 고객명
+
+    Returns:
+        int or None: 연락처 ID (가장 먼저 등록된 연락처, 없으면 None)
+    """
+    if not customer_name:
+        return None
+
+    row = conn.execute('''
+        SELECT MIN(id) FROM customer_contacts
+        WHERE company_code = ? AND customer_name = ?
+    ''', (company_code, customer_name)).fetchone()
+    return row[0]
+
+
+def get_max_id(conn, table):
+    """
+    테이블의 현재 최대 ID (가져오기 전후 새 행 구분용)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        table (str): 'consultations' 또는 'customer_contacts'
+
+    Returns:
+        int: 최대 ID (비어 있으면 0)
+    """
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
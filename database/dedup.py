@@ -0,0 +1,434 @@
+"""
+database/dedup.py
+
+중복 연락처 탐지 및 병합
+- 블로킹 키 (기업코드+고객명, 전화번호, 이메일)로 후보 쌍 생성
+- 후보 쌍 유사도를 벡터 연산으로 일괄 계산
+- 병합: 참조(상담 이력)를 남길 연락처로 옮긴 뒤 중복 삭제 (한 트랜잭션)
+- 백그라운드 작업으로 실행하고 처리량 보고
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .contacts import normalize_person_name
+from .settings import create_connection
+
+
+# 중복으로 판단할 기본 유사도
+DEFAULT_THRESHOLD = 0.8
+
+# 블록 크기 상한 (대표번호처럼 수백 명이 공유하는 값은 후보 생성에서 제외)
+MAX_BLOCK_SIZE = 50
+
+# 필드별 가중치 (두 연락처 모두 값이 있는 필드만 점수에 반영)
+FIELD_WEIGHTS = {
+    'name': 0.4,
+    'phone': 0.3,
+    'email': 0.3,
+    'company': 0.1,
+}
+
+# 고객명 유사도 계산 시 비교할 최대 글자 수
+NAME_SIMILARITY_LENGTH = 16
+
+# 병합 시 남길 연락처에 비어 있으면 중복에서 채울 컬럼
+MERGE_FILL_COLUMNS = ['position', 'acquisition_path']
+
+# 값과 정규화 키는 같은 중복 행에서 함께 채움 (값 컬럼, 키 컬럼)
+MERGE_FILL_PAIRS = [('phone', 'phone_key'), ('email', 'email_key')]
+
+# 결과 컬럼
+DUPLICATE_COLUMNS = [
+    '연락처ID', '중복ID', '기업명', '고객명', '중복고객명',
+    '전화', '중복전화', '이메일', '중복이메일', '블로킹키', '점수'
+]
+
+_job_lock = threading.Lock()
+_job_thread = None
+_job_state = {'status': 'idle'}
+
+
+def load_contacts_for_dedup(conn):
+    """
+    중복 탐지용 연락처 데이터 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        pd.DataFrame: id, company_code, company_name, customer_name, phone, email,
+            name_key, phone_key, email_key
+    """
+    df = pd.read_sql_query('''
+        SELECT
+            cc.id, cc.company_code, c.company_name, cc.customer_name,
+            cc.phone, cc.email, cc.phone_key, cc.email_key
+        FROM customer_contacts cc
+        LEFT JOIN companies c ON c.company_code = cc.company_code
+    ''', conn)
+    df['name_key'] = df['customer_name'].map(normalize_person_name)
+    return df
+
+
+def _block_pairs(df, key_columns, max_block_size):
+    """같은 블로킹 키를 가진 연락처끼리 후보 쌍 생성 (id_a < id_b)"""
+    keyed = df.dropna(subset=key_columns)[key_columns + ['id']]
+    if keyed.empty:
+        return pd.DataFrame(columns=['id_a', 'id_b'])
+
+    sizes = keyed.groupby(key_columns)['id'].transform('size')
+    keyed = keyed[(sizes > 1) & (sizes <= max_block_size)]
+
+    pairs = keyed.merge(keyed, on=key_columns, suffixes=('_a', '_b'))
+    pairs = pairs[pairs['id_a'] < pairs['id_b']]
+    return pairs[['id_a', 'id_b']]
+
+
+def generate_candidate_pairs(df, max_block_size=MAX_BLOCK_SIZE):
+    """
+    블로킹 키로 후보 쌍 생성
+
+    전체 쌍을 비교하지 않고 기업코드+고객명, 전화번호, 이메일 중 하나가
+    같은 연락처끼리만 비교합니다.
+
+    Args:
+        df (pd.DataFrame): load_contacts_for_dedup() 결과
+        max_block_size (int): 블록 크기 상한
+
+    Returns:
+        pd.DataFrame: id_a, id_b, 블로킹키
+    """
+    blocks = {
+        '이름': ['company_code', 'name_key'],
+        '전화': ['phone_key'],
+        '이메일': ['email_key'],
+    }
+
+    labels = list(blocks)
+    frames = []
+    for bit, label in enumerate(labels):
+        pairs = _block_pairs(df, blocks[label], max_block_size)
+        pairs['mask'] = 1 << bit
+        frames.append(pairs)
+
+    pairs = pd.concat(frames, ignore_index=True)
+    if pairs.empty:
+        return pd.DataFrame(columns=['id_a', 'id_b', '블로킹키'])
+
+    # 여러 키로 찾은 같은 쌍은 하나로 합침 (키별 비트를 더한 뒤 이름으로 변환)
+    pairs = pairs.groupby(['id_a', 'id_b'], sort=False)['mask'].sum().reset_index()
+    mask_labels = {
+        mask: ','.join(label for bit, label in enumerate(labels) if mask & (1 << bit))
+        for mask in range(1, 1 << len(labels))
+    }
+    pairs['블로킹키'] = pairs.pop('mask').map(mask_labels)
+    return pairs
+
+
+def _name_similarity(name_a, name_b, max_length=NAME_SIMILARITY_LENGTH, chunk_size=100000):
+    """
+    고객명 문자 겹침 유사도 (배열 연산)
+
+    각 이름의 글자가 상대 이름에 포함되는 비율로 계산합니다.
+    예) "홍길동" / "홍길순" → (2 + 2) / (3 + 3) = 0.67
+
+    Args:
+        name_a, name_b (np.ndarray): 정규화된 고객명 배열 (None 없음)
+        max_length (int): 비교할 최대 글자 수
+        chunk_size (int): 한 번에 비교할 쌍 수 (메모리 제한)
+
+    Returns:
+        np.ndarray: 쌍별 유사도 (0~1)
+    """
+    scores = np.zeros(len(name_a))
+
+    for start in range(0, len(name_a), chunk_size):
+        end = start + chunk_size
+        # 고정 길이 유니코드 배열을 코드포인트 행렬로 변환 (빈 칸은 0)
+        chars_a = np.array(name_a[start:end], dtype=f'U{max_length}').view(np.uint32).reshape(-1, max_length)
+        chars_b = np.array(name_b[start:end], dtype=f'U{max_length}').view(np.uint32).reshape(-1, max_length)
+
+        same = chars_a[:, :, None] == chars_b[:, None, :]
+        matched_a = ((same.any(axis=2)) & (chars_a > 0)).sum(axis=1)
+        matched_b = ((same.any(axis=1)) & (chars_b > 0)).sum(axis=1)
+        lengths = (chars_a > 0).sum(axis=1) + (chars_b > 0).sum(axis=1)
+
+        scores[start:end] = np.divide(
+            matched_a + matched_b, lengths, out=np.zeros(len(lengths)), where=lengths > 0
+        )
+
+    return scores
+
+
+def _field_match(a, b):
+    """두 배열의 일치 여부와 양쪽 모두 값이 있는지 여부"""
+    present = pd.notna(a) & pd.notna(b)
+    return (present & (a == b)).astype(float), present
+
+
+def score_pairs(df, pairs):
+    """
+    후보 쌍 유사도 일괄 계산
+
+    전화번호/이메일/기업 일치와 고객명 유사도를 모두 배열 연산으로
+    계산합니다 (쌍별 파이썬 반복 없음).
+
+    Args:
+        df (pd.DataFrame): load_contacts_for_dedup() 결과
+        pairs (pd.DataFrame): generate_candidate_pairs() 결과
+
+    Returns:
+        np.ndarray: 쌍별 유사도 (0~1)
+    """
+    if pairs.empty:
+        return np.zeros(0)
+
+    indexed = df.set_index('id')
+    a = indexed.loc[pairs['id_a'].to_numpy()]
+    b = indexed.loc[pairs['id_b'].to_numpy()]
+
+    name_a = a['name_key'].to_numpy(dtype=object)
+    name_b = b['name_key'].to_numpy(dtype=object)
+    name_present = pd.notna(name_a) & pd.notna(name_b)
+    name_score = (name_present & (name_a == name_b)).astype(float)
+    partial = np.flatnonzero(name_present & (name_a != name_b))
+    name_score[partial] = _name_similarity(name_a[partial], name_b[partial])
+
+    phone_score, phone_present = _field_match(
+        a['phone_key'].to_numpy(dtype=object), b['phone_key'].to_numpy(dtype=object)
+    )
+    email_score, email_present = _field_match(
+        a['email_key'].to_numpy(dtype=object), b['email_key'].to_numpy(dtype=object)
+    )
+    company_score, company_present = _field_match(
+        a['company_code'].to_numpy(dtype=object), b['company_code'].to_numpy(dtype=object)
+    )
+
+    weighted = (
+        FIELD_WEIGHTS['name'] * name_score
+        + FIELD_WEIGHTS['phone'] * phone_score
+        + FIELD_WEIGHTS['email'] * email_score
+        + FIELD_WEIGHTS['company'] * company_score
+    )
+    total = (
+        FIELD_WEIGHTS['name'] * name_present
+        + FIELD_WEIGHTS['phone'] * phone_present
+        + FIELD_WEIGHTS['email'] * email_present
+        + FIELD_WEIGHTS['company'] * company_present
+    )
+    return np.divide(weighted, total, out=np.zeros(len(pairs)), where=total > 0)
+
+
+def find_duplicate_contacts(conn, threshold=DEFAULT_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    """
+    중복 연락처 후보 탐지
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        threshold (float): 중복으로 판단할 최소 유사도
+        max_block_size (int): 블록 크기 상한
+
+    Returns:
+        tuple: (pd.DataFrame, dict) - 유사도 순 중복 후보와 처리량 통계
+    """
+    start = time.perf_counter()
+
+    df = load_contacts_for_dedup(conn)
+    pairs = generate_candidate_pairs(df, max_block_size)
+    scores = score_pairs(df, pairs)
+
+    duplicates = pairs[scores >= threshold].copy()
+    duplicates['점수'] = scores[scores >= threshold].round(3)
+
+    indexed = df.set_index('id')
+    a = indexed.loc[duplicates['id_a'].to_numpy()]
+    b = indexed.loc[duplicates['id_b'].to_numpy()]
+    result = pd.DataFrame({
+        '연락처ID': duplicates['id_a'].to_numpy(),
+        '중복ID': duplicates['id_b'].to_numpy(),
+        '기업명': a['company_name'].to_numpy(),
+        '고객명': a['customer_name'].to_numpy(),
+        '중복고객명': b['customer_name'].to_numpy(),
+        '전화': a['phone'].to_numpy(),
+        '중복전화': b['phone'].to_numpy(),
+        '이메일': a['email'].to_numpy(),
+        '중복이메일': b['email'].to_numpy(),
+        '블로킹키': duplicates['블로킹키'].to_numpy(),
+        '점수': duplicates['점수'].to_numpy(),
+    }, columns=DUPLICATE_COLUMNS).sort_values('점수', ascending=False, kind='stable')
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'contacts': len(df),
+        'candidate_pairs': len(pairs),
+        'duplicates': len(result),
+        'elapsed_seconds': elapsed,
+        'contacts_per_second': len(df) / elapsed if elapsed > 0 else 0,
+        'pairs_per_second': len(pairs) / elapsed if elapsed > 0 else 0,
+    }
+    return result.reset_index(drop=True), stats
+
+
+def merge_contacts(conn, keep_id, duplicate_ids):
+    """
+    중복 연락처를 하나로 병합
+
+    남길 연락처의 빈 필드를 중복 연락처 값으로 채우고, 중복 연락처를
+    가리키던 상담 이력의 contact_id를 남길 연락처로 옮긴 뒤 중복을 삭제합니다.
+    상담 이력의 업체코드는 바꾸지 않으며, 고객명은 남길 연락처와 같은
+    기업의 상담 이력만 변경합니다.
+    모든 변경은 한 트랜잭션에서 처리됩니다.
+
+    Args:
+        conn (sqlite3.Connection): autocommit 모드의 데이터베이스 연결
+        keep_id (int): 남길 연락처 ID
+        duplicate_ids (list): 병합 후 삭제할 연락처 ID 목록
+
+    Returns:
+        dict: kept, merged, consultations_moved
+    """
+    duplicate_ids = [int(contact_id) for contact_id in duplicate_ids if int(contact_id) != int(keep_id)]
+    if not duplicate_ids:
+        return {'kept': keep_id, 'merged': 0, 'consultations_moved': 0}
+
+    placeholders = ', '.join('?' for _ in duplicate_ids)
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        keeper = conn.execute(
+            "SELECT company_code, customer_name FROM customer_contacts WHERE id = ?", (keep_id,)
+        ).fetchone()
+        if keeper is None:
+            raise ValueError(f"연락처를 찾을 수 없습니다: {keep_id}")
+
+        # 빈 필드 채우기 (가장 최근 중복의 값 우선)
+        fill = [
+            f'''{column} = COALESCE({column}, (
+                SELECT {column} FROM customer_contacts
+                WHERE id IN ({placeholders}) AND {column} IS NOT NULL
+                ORDER BY id DESC LIMIT 1
+            ))'''
+            for column in MERGE_FILL_COLUMNS
+        ]
+        # 전화/이메일은 값이 비어 있을 때만 값과 키를 같은 중복 행에서 가져옴
+        # (UPDATE의 오른쪽 식은 변경 전 값을 보므로 두 컬럼 모두 같은 조건)
+        for value_column, key_column in MERGE_FILL_PAIRS:
+            for column in (value_column, key_column):
+                fill.append(f'''{column} = CASE WHEN {value_column} IS NULL THEN (
+                    SELECT {column} FROM customer_contacts
+                    WHERE id IN ({placeholders}) AND {value_column} IS NOT NULL
+                    ORDER BY id DESC LIMIT 1
+                ) ELSE {column} END''')
+        conn.execute(
+            f"UPDATE customer_contacts SET {', '.join(fill)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            duplicate_ids * len(fill) + [keep_id]
+        )
+
+        # 중복 연락처(기업코드+고객명)를 가리키던 상담 이력 이동
+        # 상담의 기업은 그대로 두고 (전화/이메일 블록의 중복은 다른 기업일 수 있음)
+        # 같은 기업의 상담만 남길 연락처의 고객명으로 변경
+        moved = conn.execute(f'''
+            UPDATE consultations
+            SET customer_name = CASE WHEN company_code IS ? THEN ? ELSE customer_name END,
+                contact_id = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE (company_code, customer_name) IN (
+                SELECT company_code, customer_name FROM customer_contacts WHERE id IN ({placeholders})
+            )
+            AND NOT (company_code IS ? AND customer_name IS ?)
+        ''', [keeper[0], keeper[1], keep_id] + duplicate_ids + [keeper[0], keeper[1]]).rowcount
+
+        # 고객명이 이미 같던 상담 이력도 연결 변경 (삭제 트리거가 NULL로 만들기 전에)
+        conn.execute(
+            f"UPDATE consultations SET contact_id = ?, updated_at = CURRENT_TIMESTAMP "
+            f"WHERE contact_id IN ({placeholders})",
+            [keep_id] + duplicate_ids
+        )
+
+        merged = conn.execute(
+            f"DELETE FROM customer_contacts WHERE id IN ({placeholders})", duplicate_ids
+        ).rowcount
+
+        if owns_transaction:
+            conn.execute("COMMIT")
+    except Exception:
+        if owns_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    return {'kept': keep_id, 'merged': merged, 'consultations_moved': moved}
+
+
+def _run_dedup_job(connect, threshold, max_block_size):
+    """백그라운드 중복 탐지 작업"""
+    conn = connect()
+    try:
+        result, stats = find_duplicate_contacts(conn, threshold, max_block_size)
+        with _job_lock:
+            _job_state.update(status='done', result=result, stats=stats, finished_at=time.time())
+    except Exception as e:
+        with _job_lock:
+            _job_state.update(status='error', error=str(e), finished_at=time.time())
+    finally:
+        conn.close()
+
+
+def start_dedup_job(connect=None, threshold=DEFAULT_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    """
+    중복 탐지 백그라운드 작업 시작 (이미 실행 중이면 그대로 둠)
+
+    Args:
+        connect (callable): 새 연결을 반환하는 함수 (기본값: 읽기 전용 연결)
+        threshold (float): 중복으로 판단할 최소 유사도
+        max_block_size (int): 블록 크기 상한
+
+    Returns:
+        dict: 현재 작업 상태 (get_dedup_job()과 동일)
+    """
+    global _job_thread
+
+    connect = connect or (lambda: create_connection(readonly=True))
+
+    with _job_lock:
+        if _job_thread is None or not _job_thread.is_alive():
+            _job_state.clear()
+            _job_state.update(status='running', threshold=threshold, started_at=time.time())
+            _job_thread = threading.Thread(
+                target=_run_dedup_job,
+                args=(connect, threshold, max_block_size),
+                name="crm-contact-dedup",
+                daemon=True
+            )
+            _job_thread.start()
+
+    return get_dedup_job()
+
+
+def get_dedup_job():
+    """
+    중복 탐지 작업 상태 조회
+
+    Returns:
+        dict: status ('idle', 'running', 'done', 'error'), 결과(result),
+            처리량 통계(stats), 오류(error)
+    """
+    with _job_lock:
+        return dict(_job_state)
+
+
+def discard_duplicate(contact_ids):
+    """
+    병합한 연락처가 포함된 후보를 작업 결과에서 제거
+
+    Args:
+        contact_ids (list): 병합/삭제된 연락처 ID 목록
+    """
+    with _job_lock:
+        result = _job_state.get('result')
+        if result is not None:
+            mask = result['연락처ID'].isin(contact_ids) | result['중복ID'].isin(contact_ids)
+            _job_state['result'] = result[~mask].reset_index(drop=True)
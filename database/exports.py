@@ -0,0 +1,232 @@
+"""
+database/exports.py
+
+변경분(델타) 내보내기
+- 소비자별 워터마크(변경 로그 커서) 이후 추가/수정된 행과 삭제 표시(tombstone)만 기록
+- NDJSON 또는 CSV로 한 줄씩 스트리밍 (전체를 메모리에 올리지 않음)
+- 하나의 읽기 트랜잭션에서 기록한 뒤 커서를 전진 (중간에 실패하면 다음에 다시 내보냄)
+- 처음 내보내는 소비자는 전체, 커서가 압축으로 만료되었으면 updated_at 인덱스로 대체
+
+사용법:
+    python -m database.exports --consumer nightly [--format ndjson|csv] [--output changes.ndjson]
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from .changelog import (
+    get_change_log_head,
+    get_change_log_floor,
+    get_consumer_cursor,
+    read_changes,
+    register_consumer,
+    commit_consumer_cursor
+)
+from .snapshots import SNAPSHOT_TABLES
+
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# CSV 공통 컬럼 (뒤에 테이블 컬럼 합집합)
+EXPORT_META_COLUMNS = ['table', 'op', 'key', 'seq']
+
+# 한 번에 읽을 변경 수 / 키로 조회할 행 수
+_CHANGE_BATCH = 1000
+_KEY_BATCH = 500
+
+
+def _export_columns():
+    """CSV 헤더 (메타 컬럼 + 모든 테이블 컬럼, 처음 나온 순서)"""
+    columns = list(EXPORT_META_COLUMNS)
+    for key, table_columns, _ in SNAPSHOT_TABLES.values():
+        columns += [column for column in table_columns if column not in columns]
+    return columns
+
+
+def _record_writer(out, fmt):
+    """
+    레코드 기록 함수
+
+    - ndjson: 한 줄에 하나의 JSON 레코드
+    - csv: 메타 컬럼 + 테이블 컬럼 합집합 (해당 없는 컬럼은 빈 값)
+    """
+    if fmt == 'ndjson':
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False, default=str))
+            out.write('\n')
+        return write
+
+    writer = csv.DictWriter(out, fieldnames=_export_columns())
+    writer.writeheader()
+
+    def write(record):
+        writer.writerow({
+            'table': record['table'],
+            'op': record['op'],
+            'key': record['key'],
+            'seq': record['seq'],
+            **(record.get('row') or {}),
+        })
+    return write
+
+
+def _iter_rows(conn, table, where='1', params=()):
+    """테이블 행을 키 순서로 한 줄씩 조회"""
+    key, columns, _ = SNAPSHOT_TABLES[table]
+    cursor = conn.execute(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE {where} ORDER BY {key}", list(params)
+    )
+    while True:
+        rows = cursor.fetchmany(_KEY_BATCH)
+        if not rows:
+            break
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def _rows_by_key(conn, table, keys):
+    """키 목록의 현재 행 조회 (없는 키는 결과에 없음)"""
+    key = SNAPSHOT_TABLES[table][0]
+    rows = {}
+    for start in range(0, len(keys), _KEY_BATCH):
+        batch = keys[start:start + _KEY_BATCH]
+        placeholders = ', '.join('?' for _ in batch)
+        for row in _iter_rows(conn, table, f"{key} IN ({placeholders})", batch):
+            rows[str(row[key])] = row
+    return rows
+
+
+def _write_changes(conn, write, after_seq, tables, counts):
+    """변경 로그 기준: 키별 마지막 변경만 현재 행 또는 삭제 표시로 기록"""
+    seen = set()
+    while True:
+        changes = read_changes(conn, after_seq, _CHANGE_BATCH, tables)
+        if not changes:
+            break
+        after_seq = changes[-1]['seq']
+
+        # 배치 안에서 키별 마지막 변경 (이전 배치에서 기록한 키는 건너뜀)
+        latest = {}
+        for change in changes:
+            latest[(change['table'], change['key'])] = change
+        pending = {}
+        for (table, key), change in latest.items():
+            if (table, key) not in seen:
+                pending.setdefault(table, []).append(change)
+
+        for table, table_changes in pending.items():
+            rows = _rows_by_key(conn, table, [change['key'] for change in table_changes])
+            for change in table_changes:
+                seen.add((table, change['key']))
+                row = rows.get(change['key'])
+                # 수정 후 삭제되었거나 (로그 순서상 아직 D 이전) 행이 없으면 삭제 표시
+                if row is None:
+                    write({'table': table, 'op': 'delete', 'key': change['key'], 'seq': change['seq']})
+                    counts['deletes'] += 1
+                else:
+                    write({
+                        'table': table, 'op': 'upsert', 'key': change['key'],
+                        'seq': change['seq'], 'row': row
+                    })
+                    counts['upserts'] += 1
+
+
+def _write_rows(conn, write, tables, head, counts, where='1', params=()):
+    """테이블 행 기준 (전체 또는 updated_at 이후): 모두 upsert로 기록"""
+    for table in tables:
+        key = SNAPSHOT_TABLES[table][0]
+        for row in _iter_rows(conn, table, where, params):
+            write({'table': table, 'op': 'upsert', 'key': str(row[key]), 'seq': head, 'row': row})
+            counts['upserts'] += 1
+
+
+def export_changes(conn, consumer, out, fmt='ndjson', tables=None, commit=True):
+    """
+    소비자 워터마크 이후 변경분을 스트리밍 기록
+
+    - 변경 로그 커서 이후: 키별 현재 행(upsert)과 삭제 표시(delete)
+    - 처음 내보내는 소비자: 전체 행 (mode='full')
+    - 커서가 압축으로 만료: 마지막 내보내기 트랜잭션 시각 이후 updated_at 행만, 삭제 표시 없음
+      (mode='updated_at' - 받는 쪽은 삭제 확인을 위해 한 번 전체를 받아야 함)
+
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 autocommit 연결 (커서 저장)
+        consumer (str): 소비자 이름 (변경 로그 소비자 커서로 저장)
+        out: 텍스트 파일 객체 (CSV는 newline='' 로 열기)
+        fmt (str): 'ndjson' 또는 'csv'
+        tables (iterable): 내보낼 테이블 (None이면 전체)
+        commit (bool): 기록 후 소비자 커서 전진 여부 (False면 미리보기)
+
+    Returns:
+        dict: mode, upserts, deletes, cursor (이전 워터마크), next_cursor (새 워터마크)
+
+    Raises:
+        ValueError: 지원하지 않는 형식 또는 테이블
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    tables = list(tables) if tables is not None else list(SNAPSHOT_TABLES)
+    unknown = [table for table in tables if table not in SNAPSHOT_TABLES]
+    if unknown:
+        raise ValueError(f"내보낼 수 없는 테이블입니다: {', '.join(unknown)}")
+
+    write = _record_writer(out, fmt)
+    counts = {'upserts': 0, 'deletes': 0}
+
+    # 하나의 읽기 트랜잭션 (변경 로그와 행이 같은 시점)
+    conn.execute("BEGIN")
+    try:
+        # 이 읽기 트랜잭션의 시각 (다음 updated_at 대체 내보내기의 기준)
+        snapshot_at = conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+        head = get_change_log_head(conn)
+        cursor = get_consumer_cursor(conn, consumer)
+        if cursor is None:
+            mode = 'full'
+            _write_rows(conn, write, tables, head, counts)
+        elif cursor < get_change_log_floor(conn):
+            mode = 'updated_at'
+            # 마지막 내보내기 트랜잭션 시각 이후 (이전 버전 커서는 커서 저장 시각)
+            exported_at = conn.execute(
+                "SELECT COALESCE(snapshot_at, updated_at) FROM change_consumers WHERE consumer = ?",
+                (consumer,)
+            ).fetchone()[0]
+            _write_rows(conn, write, tables, head, counts, "updated_at >= ?", (exported_at,))
+        else:
+            mode = 'changes'
+            _write_changes(conn, write, cursor, tables, counts)
+    finally:
+        conn.execute("COMMIT")
+
+    if commit:
+        register_consumer(conn, consumer, start_seq=head)
+        commit_consumer_cursor(conn, consumer, head, snapshot_at=snapshot_at)
+
+    return {'mode': mode, **counts, 'cursor': cursor, 'next_cursor': head}
+
+
+if __name__ == "__main__":
+    from .settings import create_connection
+
+    parser = argparse.ArgumentParser(description="변경분(델타) 내보내기")
+    parser.add_argument('--consumer', required=True, help="소비자 이름 (워터마크 저장 키)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson', help="출력 형식")
+    parser.add_argument('--output', default='-', help="출력 파일 (기본값: 표준 출력)")
+    parser.add_argument('--tables', default=None, help="쉼표로 구분한 테이블 목록")
+    parser.add_argument('--dry-run', action='store_true', help="워터마크를 전진하지 않음")
+    args = parser.parse_args()
+
+    conn = create_connection()
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        summary = export_changes(
+            conn, args.consumer, out, fmt=args.format,
+            tables=args.tables.split(',') if args.tables else None,
+            commit=not args.dry_run
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        conn.close()
+    print(json.dumps(summary), file=sys.stderr)
@@ -0,0 +1,82 @@
+"""
+database/frames.py
+
+조회 결과 DataFrame 메모리 절감
+- 반복 값이 많은 문자열 컬럼은 category
+- 정수는 가장 작은 정수형, 실수는 값 손실이 없을 때만 float32
+- 등록일/수정일 문자열은 datetime
+- 조회 함수에서 한 번만 변환 (세션마다 같은 변환을 반복하지 않음)
+"""
+
+import pandas as pd
+
+
+# category로 바꿀 후보 컬럼 (반복 값이 충분히 많을 때만 변환)
+CATEGORY_COLUMNS = ('기업명', '업체코드', '업종', '고객구분', '직위', '획득경로', '프로젝트명')
+
+# 고유 값 비율이 이 값 이하일 때만 category (기업 목록의 기업명처럼 모두 다르면 이득 없음)
+CATEGORY_MAX_RATIO = 0.5
+
+# 저장 시각 컬럼 (SQLite CURRENT_TIMESTAMP 형식)
+DATETIME_COLUMNS = ('등록일', '수정일', '등록일시')
+
+
+def compact_numeric(series):
+    """정수/실수 컬럼을 값 손실 없이 작은 형식으로 변환"""
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+
+    values = series.dropna()
+    # NULL이 섞인 정수 컬럼 (예: 종업원수)은 nullable 정수형
+    if len(values) and (values == values.round()).all() and values.abs().max() < 2 ** 31:
+        return series.astype('Int32')
+
+    downcast = series.astype('float32')
+    if (downcast.astype('float64') == series)[series.notna()].all():
+        return downcast
+    return series
+
+
+def compact_frame(df):
+    """
+    조회 결과를 작은 dtype으로 변환
+
+    Args:
+        df (pd.DataFrame): get_*_data 조회 결과
+
+    Returns:
+        pd.DataFrame: 변환된 DataFrame (df.attrs 유지)
+    """
+    rows = len(df)
+    attrs = dict(df.attrs)
+    columns = {}
+
+    for column in df.columns:
+        series = df[column]
+        if column in DATETIME_COLUMNS:
+            columns[column] = pd.to_datetime(series, format='ISO8601', errors='coerce')
+        elif column in CATEGORY_COLUMNS and rows:
+            if series.nunique(dropna=True) <= rows * CATEGORY_MAX_RATIO:
+                columns[column] = series.astype('category')
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            columns[column] = compact_numeric(series)
+
+    if columns:
+        df = df.assign(**columns)
+    df.attrs = attrs
+    return df
+
+
+def frame_bytes_per_row(df):
+    """
+    DataFrame 행당 메모리 (문자열 내용 포함)
+
+    Args:
+        df (pd.DataFrame): 측정할 DataFrame
+
+    Returns:
+        float: 행당 바이트 (빈 DataFrame이면 0)
+    """
+    if df.empty:
+        return 0.0
+    return df.memory_usage(deep=True, index=True).sum() / len(df)
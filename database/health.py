@@ -0,0 +1,256 @@
+"""
+database/health.py
+
+데이터베이스 상태 점검 (단계별)
+- 빠른 점검: 시작 시 상수 시간으로 실행
+- 전체 점검: integrity_check + foreign_key_check, 백그라운드 주기 실행
+- 점검 결과는 health_audits 테이블에 저장
+- 전체 점검에서 FTS5 검색 인덱스가 원본과 어긋났으면 다시 생성
+"""
+
+import threading
+import time
+
+from .search import repair_search_indexes
+
+
+REQUIRED_TABLES = ['companies', 'customer_contacts', 'consultations']
+
+# 전체 점검 주기 (초)
+DEFAULT_AUDIT_INTERVAL = 24 * 60 * 60
+
+# 저장할 integrity_check 메시지 최대 개수
+MAX_INTEGRITY_MESSAGES = 20
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+def create_health_schema(conn):
+    """
+    전체 점검 결과 테이블 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS health_audits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms INTEGER,
+            status TEXT NOT NULL,
+            integrity_ok INTEGER NOT NULL,
+            integrity_messages TEXT,
+            foreign_key_errors INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+
+def get_last_audit(conn):
+    """
+    마지막 전체 점검 결과 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        dict or None: 점검 결과 (경과 시간 포함), 점검 이력이 없으면 None
+    """
+    try:
+        row = conn.execute('''
+            SELECT
+                finished_at, duration_ms, status, integrity_ok,
+                integrity_messages, foreign_key_errors,
+                (julianday('now') - julianday(finished_at)) * 86400
+            FROM health_audits
+            ORDER BY id DESC
+            LIMIT 1
+        ''').fetchone()
+    except Exception:
+        # 점검 테이블이 없는 경우 (마이그레이션 이전, 읽기 전용)
+        return None
+
+    if not row:
+        return None
+
+    return {
+        'finished_at': row[0],
+        'duration_ms': row[1],
+        'status': row[2],
+        'integrity_ok': bool(row[3]),
+        'integrity_messages': row[4].split('\n') if row[4] else [],
+        'foreign_key_errors': row[5],
+        'age_seconds': row[6]
+    }
+
+
+def quick_health_check(conn):
+    """
+    빠른 상태 점검 (시작 시 사용)
+
+    연결 확인과 필수 테이블 존재 확인을 한 번의 sqlite_master 조회로
+    처리하고, 외래키 오류는 마지막 전체 점검 결과를 사용합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        dict: 데이터베이스 상태 정보
+    """
+    try:
+        placeholders = ', '.join('?' for _ in REQUIRED_TABLES)
+        existing = {
+            row[0] for row in conn.execute(
+                f"SELECT name FROM sqlite_master WHERE type='table' AND name IN ({placeholders})",
+                REQUIRED_TABLES
+            )
+        }
+        missing_tables = [table for table in REQUIRED_TABLES if table not in existing]
+
+        last_audit = get_last_audit(conn)
+        foreign_key_errors = last_audit['foreign_key_errors'] if last_audit else 0
+
+        if missing_tables:
+            status = 'missing_tables'
+        elif last_audit and not last_audit['integrity_ok']:
+            status = 'integrity_errors'
+        elif foreign_key_errors:
+            status = 'foreign_key_errors'
+        else:
+            status = 'healthy'
+
+        return {
+            'status': status,
+            'missing_tables': missing_tables,
+            'foreign_key_errors': foreign_key_errors,
+            'last_audit': last_audit,
+            'connection_ok': True
+        }
+
+    except Exception as e:
+        return {
+            'status': 'error',
+            'error': str(e),
+            'connection_ok': False
+        }
+
+
+def run_full_audit(conn):
+    """
+    전체 무결성/외래키 점검 실행 후 결과 저장
+
+    데이터 크기에 비례하는 시간이 걸리므로 백그라운드에서 실행합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결 (autocommit 모드)
+
+    Returns:
+        dict: 저장된 점검 결과
+    """
+    started_at = conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+    start = time.perf_counter()
+
+    integrity_messages = [
+        row[0] for row in conn.execute(f"PRAGMA integrity_check({MAX_INTEGRITY_MESSAGES})")
+    ]
+    integrity_ok = integrity_messages == ['ok']
+
+    foreign_key_errors = len(conn.execute("PRAGMA foreign_key_check").fetchall())
+
+    # 검색 인덱스 점검 (어긋난 인덱스는 다시 생성하고 메시지로 기록)
+    rebuilt_indexes = repair_search_indexes(conn)
+
+    if not integrity_ok:
+        status = 'integrity_errors'
+    elif foreign_key_errors:
+        status = 'foreign_key_errors'
+    else:
+        status = 'healthy'
+
+    duration_ms = int((time.perf_counter() - start) * 1000)
+
+    conn.execute('''
+        INSERT INTO health_audits
+        (started_at, duration_ms, status, integrity_ok, integrity_messages, foreign_key_errors)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        started_at,
+        duration_ms,
+        status,
+        int(integrity_ok),
+        '\n'.join(
+            ([] if integrity_ok else integrity_messages)
+            + [f"검색 인덱스 다시 생성: {fts_table}" for fts_table in rebuilt_indexes]
+        ) or None,
+        foreign_key_errors
+    ))
+
+    return get_last_audit(conn)
+
+
+def _audit_loop(connect, interval_seconds):
+    """백그라운드 점검 루프 (마지막 점검이 주기보다 오래되면 실행)"""
+    conn = connect()
+    try:
+        while True:
+            try:
+                last_audit = get_last_audit(conn)
+                if last_audit is None or last_audit['age_seconds'] >= interval_seconds:
+                    last_audit = run_full_audit(conn)
+                wait_seconds = interval_seconds - last_audit['age_seconds']
+            except Exception:
+                # 점검 실패 시 다음 주기에 재시도
+                wait_seconds = interval_seconds
+
+            time.sleep(max(wait_seconds, 60))
+    finally:
+        conn.close()
+
+
+def start_audit_scheduler(connect, interval_seconds=DEFAULT_AUDIT_INTERVAL):
+    """
+    전체 점검 백그라운드 스케줄러 시작 (프로세스당 한 번)
+
+    여러 프로세스가 같은 DB를 사용해도 마지막 점검 시각을 DB에서
+    확인하므로 주기당 한 번 정도만 점검이 실행됩니다.
+
+    Args:
+        connect (callable): 새 데이터베이스 연결을 반환하는 함수
+        interval_seconds (int): 점검 주기 (초)
+
+    Returns:
+        threading.Thread: 실행 중인 스케줄러 스레드
+    """
+    global _scheduler_thread
+
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(
+                target=_audit_loop,
+                args=(connect, interval_seconds),
+                name="crm-health-audit",
+                daemon=True
+            )
+            _scheduler_thread.start()
+
+    return _scheduler_thread
+
+
+def format_audit_age(age_seconds):
+    """
+    점검 경과 시간을 읽기 쉬운 문자열로 변환
+
+    Args:
+        age_seconds (float): 경과 시간 (초)
+
+    Returns:
+        str: 예) "3분 전", "5시간 전", "2일 전"
+    """
+    if age_seconds < 60:
+        return "방금 전"
+    if age_seconds < 3600:
+        return f"{int(age_seconds // 60)}분 전"
+    if age_seconds < 86400:
+        return f"{int(age_seconds // 3600)}시간 전"
+    return f"{int(age_seconds // 86400)}일 전"
@@ -0,0 +1,256 @@
+"""
+database/migrations.py
+
+스키마 마이그레이션 관리
+- PRAGMA user_version 기반 순차 적용
+- 각 마이그레이션은 하나의 트랜잭션에서 실행
+"""
+
+from .stats import create_stats_schema, rebuild_stats, create_table_version_schema
+from .health import create_health_schema
+from .contacts import (
+    create_contact_keys_schema,
+    rebuild_contact_keys,
+    create_consultation_contact_schema,
+    link_consultation_contacts
+)
+from .companies import create_company_keys_schema, rebuild_company_keys
+from .codes import create_code_sequence_schema
+from .timeline import create_timeline_schema
+from .paging import create_paging_schema
+from .snapshots import create_snapshot_schema
+from .changelog import create_change_log_schema
+from .search import (
+    create_consultation_search_schema,
+    rebuild_consultation_search,
+    recreate_consultation_search,
+    recreate_company_search,
+    create_entity_search_schema,
+    rebuild_entity_search
+)
+
+
+def create_base_tables(conn):
+    """
+    기본 테이블 생성 (기업, 고객 연락처, 상담 이력)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    # 기업 테이블 생성
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS companies (
+            company_code TEXT PRIMARY KEY,
+            company_name TEXT NOT NULL,
+            revenue_2024 REAL,
+            industry TEXT,
+            employee_count INTEGER,
+            address TEXT,
+            products TEXT,
+            customer_category TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 고객 연락처 테이블 생성
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS customer_contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_code TEXT,
+            customer_name TEXT NOT NULL,
+            position TEXT,
+            phone TEXT,
+            email TEXT,
+            acquisition_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (company_code) REFERENCES companies(company_code)
+        )
+    ''')
+
+    # 상담 이력 테이블 생성
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS consultations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_code TEXT,
+            customer_name TEXT,
+            consultation_date TEXT,
+            consultation_content TEXT NOT NULL,
+            project_name TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (company_code) REFERENCES companies(company_code)
+        )
+    ''')
+
+
+def migrate_001_stats(conn):
+    """요약 통계 테이블 및 트리거 생성, 기존 데이터로 초기화"""
+    create_stats_schema(conn)
+    rebuild_stats(conn)
+
+
+def migrate_002_health_audits(conn):
+    """전체 상태 점검 결과 테이블 생성"""
+    create_health_schema(conn)
+
+
+def migrate_003_consultation_search(conn):
+    """상담 이력 FTS5 인덱스 생성 및 기존 데이터 색인"""
+    create_consultation_search_schema(conn)
+    rebuild_consultation_search(conn)
+
+
+def migrate_004_entity_search(conn):
+    """기업/연락처 FTS5 인덱스 생성 및 기존 데이터 색인 (통합 검색)"""
+    create_entity_search_schema(conn)
+    rebuild_entity_search(conn)
+
+
+def migrate_005_contact_keys(conn):
+    """연락처 전화번호/이메일 정규화 컬럼 추가 및 기존 데이터 계산"""
+    create_contact_keys_schema(conn)
+    rebuild_contact_keys(conn)
+
+
+def migrate_006_company_keys(conn):
+    """기업명 정규화 컬럼/트리거 추가 및 기존 데이터 계산"""
+    create_company_keys_schema(conn)
+    rebuild_company_keys(conn)
+
+
+def migrate_007_code_sequences(conn):
+    """업체코드 순번 테이블 생성 (기존 AUTO 코드는 그대로 유지)"""
+    create_code_sequence_schema(conn)
+
+
+def migrate_008_consultation_contacts(conn):
+    """상담 이력 contact_id 컬럼/인덱스/트리거 추가 및 기존 데이터 연결"""
+    create_consultation_contact_schema(conn)
+    link_consultation_contacts(conn)
+
+
+def migrate_009_company_timeline(conn):
+    """기업 타임라인용 연락처 (업체코드, 등록일) 인덱스 생성"""
+    create_timeline_schema(conn)
+
+
+def migrate_010_keyset_paging(conn):
+    """목록 조회 키셋 페이지용 정렬 인덱스 생성"""
+    create_paging_schema(conn)
+
+
+def migrate_011_updated_at_indexes(conn):
+    """변경 행 조회(스냅샷 증분 갱신)용 updated_at 인덱스 생성"""
+    create_snapshot_schema(conn)
+
+
+def migrate_012_table_versions(conn):
+    """테이블별 변경 버전 컬럼/트리거 추가 (디스크 결과 캐시 키)"""
+    create_table_version_schema(conn)
+
+
+def migrate_013_change_log(conn):
+    """변경 데이터 캡처 로그, 소비자 커서 테이블과 기록 트리거 생성"""
+    create_change_log_schema(conn)
+
+
+def migrate_014_consultation_search_prefix(conn):
+    """상담 이력 FTS5 인덱스에 4글자 접두어 인덱스 추가 (다시 생성)"""
+    recreate_consultation_search(conn)
+
+
+def migrate_015_consumer_snapshot_at(conn):
+    """소비자 커서에 내보내기 트랜잭션 시각(snapshot_at) 컬럼 추가"""
+    create_change_log_schema(conn)
+
+
+def migrate_016_company_search_id(conn):
+    """기업 FTS5 인덱스를 VACUUM에도 바뀌지 않는 search_id 기준으로 다시 생성"""
+    recreate_company_search(conn)
+
+
+def migrate_017_contact_unlink_updated_at(conn):
+    """연락처 삭제 시 상담 이력 연결 해제 트리거가 updated_at도 갱신하도록 다시 생성"""
+    conn.execute("DROP TRIGGER IF EXISTS trg_contacts_delete_unlink")
+    create_consultation_contact_schema(conn)
+
+
+# (버전, 마이그레이션 함수) - 순서대로 추가
+MIGRATIONS = [
+    (1, migrate_001_stats),
+    (2, migrate_002_health_audits),
+    (3, migrate_003_consultation_search),
+    (4, migrate_004_entity_search),
+    (5, migrate_005_contact_keys),
+    (6, migrate_006_company_keys),
+    (7, migrate_007_code_sequences),
+    (8, migrate_008_consultation_contacts),
+    (9, migrate_009_company_timeline),
+    (10, migrate_010_keyset_paging),
+    (11, migrate_011_updated_at_indexes),
+    (12, migrate_012_table_versions),
+    (13, migrate_013_change_log),
+    (14, migrate_014_consultation_search_prefix),
+    (15, migrate_015_consumer_snapshot_at),
+    (16, migrate_016_company_search_id),
+    (17, migrate_017_contact_unlink_updated_at),
+]
+
+
+def get_schema_version(conn):
+    """
+    현재 스키마 버전 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        int: PRAGMA user_version 값
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """
+    적용되지 않은 마이그레이션을 순서대로 실행
+
+    여러 프로세스가 동시에 시작해도 BEGIN IMMEDIATE 안에서
+    버전을 다시 확인하므로 한 번만 적용됩니다.
+
+    Args:
+        conn (sqlite3.Connection): autocommit 모드의 데이터베이스 연결
+
+    Returns:
+        int: 적용 후 스키마 버전
+    """
+    for version, migrate in MIGRATIONS:
+        if version <= get_schema_version(conn):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version > get_schema_version(conn):
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    return get_schema_version(conn)
+
+
+def initialize_schema(conn):
+    """
+    기본 테이블 생성 후 마이그레이션 적용
+
+    Args:
+        conn (sqlite3.Connection): autocommit 모드의 데이터베이스 연결
+
+    Returns:
+        int: 적용 후 스키마 버전
+    """
+    create_base_tables(conn)
+    return apply_migrations(conn)
@@ -0,0 +1,221 @@
+"""
+database/notifier.py
+
+테이블 변경 알림 (프로세스 내 캐시 무효화)
+- 백그라운드 스레드가 전용 연결에서 PRAGMA data_version을 주기적으로 확인
+- 바뀌었으면 변경 로그(change_log)에서 마지막 확인 이후 변경된 테이블/키를 읽어 구독자에 전달
+- 같은 DB 파일을 쓰는 다른 프로세스(복제 서버)의 커밋도 감지
+- 테이블별 세대 번호: 세션 상태에 보관한 데이터가 최신인지 비교하는 용도
+
+구독자는 callback(changes)를 받습니다. changes는 {테이블명: 변경 키 set}이며,
+변경이 너무 많거나 압축으로 알 수 없으면 키 대신 None (테이블 전체 무효화)입니다.
+
+환경 변수:
+    CRM_CHANGE_POLL_SECONDS   확인 주기 초 (기본값: 2)
+"""
+
+import os
+import threading
+import time
+
+from .changelog import get_change_log_head, get_change_log_floor, read_changes, CHANGE_LOG_TABLES
+
+
+# 확인 주기 (초)
+CHANGE_POLL_SECONDS = float(os.environ.get('CRM_CHANGE_POLL_SECONDS', 2))
+
+# 한 번에 키로 전달할 최대 변경 수 (넘으면 테이블 전체 무효화)
+MAX_EVENT_KEYS = 5000
+
+_notifier_lock = threading.Lock()
+_notifier_thread = None
+
+# (callback, 관심 테이블 frozenset 또는 None)
+_subscribers = []
+_subscribers_lock = threading.Lock()
+
+# 마지막으로 확인한 data_version / 변경 로그 순번
+_poll_state = {'data_version': None, 'seq': None}
+
+_generations = {table: 0 for table in CHANGE_LOG_TABLES}
+_notifier_metrics = {'polls': 0, 'events': 0, 'callback_errors': 0, 'last_event_at': None}
+
+
+def subscribe(callback, tables=None):
+    """
+    테이블 변경 알림 구독
+
+    callback은 알림 스레드에서 호출되므로 빠르게 끝나야 하고,
+    잠금이 필요한 캐시는 스스로 보호해야 합니다.
+
+    Args:
+        callback (callable): callback(changes) - {테이블명: 키 set 또는 None}
+        tables (iterable): 관심 테이블 (None이면 전체)
+
+    Returns:
+        callable: 구독 해제 함수
+    """
+    entry = (callback, frozenset(tables) if tables is not None else None)
+    with _subscribers_lock:
+        _subscribers.append(entry)
+
+    def unsubscribe():
+        with _subscribers_lock:
+            if entry in _subscribers:
+                _subscribers.remove(entry)
+    return unsubscribe
+
+
+def publish_changes(changes):
+    """
+    변경 알림 전달 (세대 번호 증가 후 관심 테이블이 겹치는 구독자 호출)
+
+    Args:
+        changes (dict): {테이블명: 키 set 또는 None}
+    """
+    if not changes:
+        return
+
+    with _subscribers_lock:
+        for table in changes:
+            _generations[table] = _generations.get(table, 0) + 1
+        _notifier_metrics['events'] += 1
+        _notifier_metrics['last_event_at'] = time.time()
+        subscribers = list(_subscribers)
+
+    for callback, tables in subscribers:
+        relevant = changes if tables is None else {
+            table: keys for table, keys in changes.items() if table in tables
+        }
+        if not relevant:
+            continue
+        try:
+            callback(relevant)
+        except Exception:
+            # 한 구독자의 오류가 다른 캐시 무효화를 막지 않도록
+            with _subscribers_lock:
+                _notifier_metrics['callback_errors'] += 1
+
+
+def poll_changes(conn):
+    """
+    마지막 확인 이후 변경된 테이블/키 조회 (data_version이 그대로면 즉시 반환)
+
+    첫 호출은 기준점만 기록하고 빈 결과를 반환합니다.
+
+    Args:
+        conn (sqlite3.Connection): 알림 전용 연결 (이 연결로는 쓰지 않음)
+
+    Returns:
+        dict: {테이블명: 키 set 또는 None}
+    """
+    _notifier_metrics['polls'] += 1
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if data_version == _poll_state['data_version']:
+        return {}
+    _poll_state['data_version'] = data_version
+
+    conn.execute("BEGIN")
+    try:
+        head = get_change_log_head(conn)
+        last_seq = _poll_state['seq']
+        if last_seq is None or head == last_seq:
+            _poll_state['seq'] = head
+            return {}
+
+        # 압축으로 변경 일부가 사라졌으면 테이블 전체 무효화
+        if last_seq < get_change_log_floor(conn):
+            _poll_state['seq'] = head
+            return {table: None for table in CHANGE_LOG_TABLES}
+
+        changes = {}
+        after_seq = last_seq
+        while after_seq < head:
+            batch = read_changes(conn, after_seq, MAX_EVENT_KEYS)
+            if not batch:
+                break
+            for change in batch:
+                keys = changes.setdefault(change['table'], set())
+                if keys is not None:
+                    keys.add(change['key'])
+                    if len(keys) > MAX_EVENT_KEYS:
+                        changes[change['table']] = None
+            after_seq = batch[-1]['seq']
+
+        _poll_state['seq'] = head
+        return changes
+    finally:
+        conn.execute("COMMIT")
+
+
+def _notifier_loop(connect, interval_seconds):
+    """백그라운드 변경 확인 루프"""
+    conn = connect()
+    try:
+        while True:
+            try:
+                publish_changes(poll_changes(conn))
+            except Exception:
+                # 잠금 충돌 등은 다음 주기에 재시도
+                pass
+            time.sleep(interval_seconds)
+    finally:
+        conn.close()
+
+
+def start_change_notifier(connect, interval_seconds=CHANGE_POLL_SECONDS):
+    """
+    변경 알림 백그라운드 스레드 시작 (프로세스당 한 번)
+
+    Args:
+        connect (callable): 새 (읽기 전용) 데이터베이스 연결을 반환하는 함수
+        interval_seconds (float): 확인 주기 (초)
+
+    Returns:
+        threading.Thread: 실행 중인 알림 스레드
+    """
+    global _notifier_thread
+
+    with _notifier_lock:
+        if _notifier_thread is None or not _notifier_thread.is_alive():
+            _notifier_thread = threading.Thread(
+                target=_notifier_loop,
+                args=(connect, interval_seconds),
+                name="crm-change-notifier",
+                daemon=True
+            )
+            _notifier_thread.start()
+
+    return _notifier_thread
+
+
+def get_table_generation(table):
+    """
+    테이블 세대 번호 (변경 알림마다 증가)
+
+    세션 상태에 데이터를 보관할 때 함께 저장해 두고, 값이 달라졌으면
+    다시 조회하면 됩니다.
+
+    Args:
+        table (str): 테이블명
+
+    Returns:
+        int: 세대 번호
+    """
+    with _subscribers_lock:
+        return _generations.get(table, 0)
+
+
+def get_notifier_stats():
+    """
+    변경 알림 현황
+
+    Returns:
+        dict: polls, events, callback_errors, last_event_at, subscribers, running
+    """
+    with _subscribers_lock:
+        return {
+            **_notifier_metrics,
+            'subscribers': len(_subscribers),
+            'running': _notifier_thread is not None and _notifier_thread.is_alive(),
+        }
@@ -4,76 +4,122 @@ database/operations.py
 데이터베이스 CRUD 작업 및 비즈니스 로직
 """
 
-import streamlit as st
 import sqlite3
 import pandas as pd
-from .connection import generate_company_code, parse_revenue, get_writable_connection
-
-
-# 자동완성용 데이터 가져오기 함수들
-@st.cache_data(ttl=300)  # 5분간 캐시
+from .connection import (
+    parse_revenue,
+    get_writable_connection,
+    invalidate_write_capability
+)
+from .codes import reserve_company_code, allocate_company_codes
+from .stats import CONSULTATION_SORT_DATE
+from .paging import read_keyset_page, keyset_condition, COMPANY_PAGE_KEYS
+from .frames import compact_frame
+from .result_cache import cached_result, register_warmer
+from .streamlit_cache import cache_data
+from .notifier import subscribe
+from .contacts import (
+    normalize_phone,
+    normalize_email,
+    find_contact_id,
+    link_consultation_contacts,
+    get_max_id
+)
+from .companies import (
+    normalize_company_name,
+    lookup_company_code,
+    resolve_company_codes,
+    remember_company_codes,
+    forget_company_codes,
+    clear_name_cache
+)
+
+
+# 자동완성 목록: 이름 → (의존 테이블, 조회 SQL)
+AUTOCOMPLETE_QUERIES = {
+    'company_names': (
+        ('companies',),
+        "SELECT DISTINCT company_name FROM companies WHERE company_name IS NOT NULL ORDER BY company_name"
+    ),
+    'customer_names': (
+        ('customer_contacts',),
+        "SELECT DISTINCT customer_name FROM customer_contacts WHERE customer_name IS NOT NULL ORDER BY customer_name"
+    ),
+    'industries': (
+        ('companies',),
+        "SELECT DISTINCT industry FROM companies WHERE industry IS NOT NULL ORDER BY industry"
+    ),
+    'positions': (
+        ('customer_contacts',),
+        "SELECT DISTINCT position FROM customer_contacts WHERE position IS NOT NULL ORDER BY position"
+    ),
+}
+
+
+def _autocomplete_builder(name):
+    """자동완성 목록 조회 함수 (cached_result의 compute)"""
+    sql = AUTOCOMPLETE_QUERIES[name][1]
+    return lambda conn: [row[0] for row in conn.execute(sql)]
+
+
+def get_autocomplete_list(name):
+    """자동완성 목록 조회 (디스크 결과 캐시, 테이블이 바뀌었을 때만 다시 조회)"""
+    tables = AUTOCOMPLETE_QUERIES[name][0]
+    return cached_result(name, tables, _autocomplete_builder(name))
+
+
+# 시작 시 미리 생성 (start_cache_prewarm)
+for _name, (_tables, _) in AUTOCOMPLETE_QUERIES.items():
+    register_warmer(_name, _tables, _autocomplete_builder(_name))
+
+
+# 자동완성용 데이터 가져오기 함수들 (세션 공유 메모리 캐시 → 디스크 캐시 → DB)
+# 다른 세션/프로세스의 변경은 변경 알림으로 무효화되므로 TTL은 길게 유지
+@cache_data(ttl=3600)  # 1시간 캐시 (변경 알림으로 무효화)
 def get_company_names():
     """기업명 목록 가져오기"""
     try:
-        conn = sqlite3.connect('crm_database.db', check_same_thread=False)
-        cursor = conn.execute("SELECT DISTINCT company_name FROM companies WHERE company_name IS NOT NULL ORDER BY company_name")
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return get_autocomplete_list('company_names')
     except:
         return []
 
 
-@st.cache_data(ttl=300)  # 5분간 캐시
+@cache_data(ttl=3600)  # 1시간 캐시 (변경 알림으로 무효화)
 def get_customer_names():
     """고객명 목록 가져오기"""
     try:
-        conn = sqlite3.connect('crm_database.db', check_same_thread=False)
-        cursor = conn.execute("SELECT DISTINCT customer_name FROM customer_contacts WHERE customer_name IS NOT NULL ORDER BY customer_name")
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return get_autocomplete_list('customer_names')
     except:
         return []
 
 
-@st.cache_data(ttl=300)  # 5분간 캐시
+@cache_data(ttl=3600)  # 1시간 캐시 (변경 알림으로 무효화)
 def get_industries():
     """업종 목록 가져오기"""
     try:
-        conn = sqlite3.connect('crm_database.db', check_same_thread=False)
-        cursor = conn.execute("SELECT DISTINCT industry FROM companies WHERE industry IS NOT NULL ORDER BY industry")
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return get_autocomplete_list('industries')
     except:
         return []
 
 
-@st.cache_data(ttl=300)  # 5분간 캐시
+@cache_data(ttl=3600)  # 1시간 캐시 (변경 알림으로 무효화)
 def get_positions():
     """직위 목록 가져오기"""
     try:
-        conn = sqlite3.connect('crm_database.db', check_same_thread=False)
-        cursor = conn.execute("SELECT DISTINCT position FROM customer_contacts WHERE position IS NOT NULL ORDER BY position")
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return get_autocomplete_list('positions')
     except:
         return []
 
 
 # 기업 관련 작업
 def find_company_code(conn, company_name):
-    """기업명으로 업체코드를 찾고, 없으면 새로 생성"""
-    cursor = conn.execute("SELECT company_code FROM companies WHERE company_name = ?", (company_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
+    """기업명으로 업체코드를 찾고, 없으면 기업을 생성 (법인 표기/띄어쓰기 무시, 캐시 사용)"""
+    company_code = lookup_company_code(conn, company_name)
+    if company_code:
+        return company_code
     else:
-        # 새로운 업체코드 생성
-        new_code = generate_company_code()
-        return new_code
+        # 새 기업 생성 (코드 할당과 삽입을 resolve_company_codes와 같은 방식으로)
+        return resolve_company_codes(conn, [company_name]).get(company_name)
 
 
 def update_company_data(conn, company_code, updated_data):
@@ -95,32 +141,52 @@ def update_company_data(conn, company_code, updated_data):
             updated_data.get('고객구분'),
             company_code
         ))
+        forget_company_codes([company_code], [updated_data.get('기업명')])
         return True, "기업 정보가 업데이트되었습니다."
     except Exception as e:
+        invalidate_write_capability()
         return False, f"업데이트 실패: {str(e)}"
 
 
 def insert_company_batch(conn, companies_data):
-    """기업 데이터 일괄 삽입"""
+    """기업 데이터 일괄 삽입 (새 업체코드는 배치당 한 번에 예약)"""
     try:
         success_count = 0
         update_count = 0
         
+        # 업체코드 결정 (지정한 코드, 기존 기업 코드, 없으면 비교키별 새 코드)
+        planned = []
+        new_keys = {}
         for company_data in companies_data:
             company_name = company_data.get('company_name')
             if not company_name:
                 continue
             
-            # 업체코드 결정
             company_code = company_data.get('company_code')
-            if not company_code:
-                company_code = find_company_code(conn, company_name)
-                if company_code.startswith("AUTO"):
-                    company_code = generate_company_code()
-            
-            # 기존 데이터 확인
-            existing = conn.execute("SELECT company_code FROM companies WHERE company_code = ?", (company_code,)).fetchone()
-            
+            if company_code:
+                # 지정한 코드가 순번 형식이면 이후 자동 할당과 겹치지 않도록 순번 전진
+                reserve_company_code(conn, company_code)
+                existing = conn.execute("SELECT company_code FROM companies WHERE company_code = ?", (company_code,)).fetchone()
+                planned.append((company_data, company_code, existing is not None, None))
+                continue
+
+            company_code = lookup_company_code(conn, company_name)
+            if company_code is not None:
+                planned.append((company_data, company_code, True, None))
+            else:
+                # 같은 배치에서 비교키가 같은 새 기업명은 하나의 기업으로 (두 번째부터는 업데이트)
+                name_key = normalize_company_name(company_name) or company_name
+                planned.append((company_data, None, name_key in new_keys, name_key))
+                new_keys.setdefault(name_key, None)
+
+        # 지정한 코드를 반영한 뒤 새 코드 구간을 한 번에 예약
+        new_codes = dict(zip(new_keys, allocate_company_codes(conn, len(new_keys))))
+
+        for company_data, company_code, existing, name_key in planned:
+            company_name = company_data.get('company_name')
+            if name_key is not None:
+                company_code = new_codes[name_key]
+
             if existing:
                 # 업데이트
                 conn.execute('''
@@ -139,6 +205,7 @@ def insert_company_batch(conn, companies_data):
                     company_data.get('customer_category'),
                     company_code
                 ))
+                forget_company_codes([company_code], [company_name])
                 update_count += 1
             else:
                 # 신규 삽입
@@ -156,54 +223,72 @@ def insert_company_batch(conn, companies_data):
                     company_data.get('products'),
                     company_data.get('customer_category')
                 ))
+                if not conn.in_transaction:
+                    remember_company_codes({company_name: company_code})
                 success_count += 1
         
         return True, f"신규 저장: {success_count}개, 업데이트: {update_count}개"
     except Exception as e:
+        invalidate_write_capability()
         return False, f"일괄 처리 실패: {str(e)}"
 
 
+def _has_value(value):
+    """비어 있지 않은 값인지 확인 (엑셀에서 읽은 빈 셀 NaN/None, 공백 문자열 제외)"""
+    return value is not None and not (isinstance(value, float) and pd.isna(value)) and str(value).strip() != ''
+
+
 # 연락처 관련 작업
 def insert_contact_batch(conn, contacts_data):
-    """연락처 데이터 일괄 삽입"""
+    """연락처 데이터 일괄 삽입 (기업명 일괄 변환 후 한 트랜잭션에서 저장)"""
+    rows = [
+        contact_data for contact_data in contacts_data
+        if _has_value(contact_data.get('company_name')) and _has_value(contact_data.get('customer_name'))
+    ]
+    if not rows:
+        return True, "0개의 연락처를 저장했습니다!"
+    
+    owns_transaction = not conn.in_transaction
     try:
-        success_count = 0
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
         
-        for contact_data in contacts_data:
-            company_name = contact_data.get('company_name')
-            customer_name = contact_data.get('customer_name')
-            
-            if not company_name or not customer_name:
-                continue
-            
-            # 기업 코드 찾기
-            company_code = find_company_code(conn, company_name)
-            
-            # 기업이 없으면 기본 정보로 생성
-            existing_company = conn.execute("SELECT company_code FROM companies WHERE company_code = ?", (company_code,)).fetchone()
-            if not existing_company:
-                conn.execute('''
-                    INSERT INTO companies (company_code, company_name)
-                    VALUES (?, ?)
-                ''', (company_code, company_name))
-            
-            # 연락처 저장
-            conn.execute('''
-                INSERT INTO customer_contacts 
-                (company_code, customer_name, position, phone, email, acquisition_path)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                company_code,
-                customer_name,
-                contact_data.get('position'),
-                contact_data.get('phone'),
-                contact_data.get('email'),
-                contact_data.get('acquisition_path')
-            ))
-            success_count += 1
+        # 기업명 → 업체코드 일괄 변환 (없는 기업은 기본 정보로 생성)
+        company_codes = resolve_company_codes(
+            conn, (row['company_name'] for row in rows)
+        )
+        
+        # 연락처 저장 (전화번호/이메일 정규화 컬럼 함께 저장)
+        last_contact_id = get_max_id(conn, 'customer_contacts')
+        conn.executemany('''
+            INSERT INTO customer_contacts 
+            (company_code, customer_name, position, phone, email, acquisition_path, phone_key, email_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                company_codes.get(row['company_name']),
+                row['customer_name'],
+                row.get('position'),
+                row.get('phone'),
+                row.get('email'),
+                row.get('acquisition_path'),
+                normalize_phone(row.get('phone')),
+                normalize_email(row.get('email'))
+            )
+            for row in rows
+        ])
+        
+        # 먼저 들어온 상담 이력 중 새 연락처와 이름이 같은 건 연결
+        link_consultation_contacts(conn, since_contact_id=last_contact_id)
         
-        return True, f"{success_count}개의 연락처를 저장했습니다!"
+        if owns_transaction:
+            conn.execute("COMMIT")
+            remember_company_codes(company_codes)
+        return True, f"{len(rows)}개의 연락처를 저장했습니다!"
     except Exception as e:
+        if owns_transaction and conn.in_transaction:
+            conn.execute("ROLLBACK")
+        invalidate_write_capability()
         return False, f"연락처 저장 실패: {str(e)}"
 
 
@@ -214,79 +299,86 @@ def insert_new_consultation(conn, consultation_data):
         # 기업명으로 기업코드 찾기 또는 생성
         company_name = consultation_data.get('기업명')
         company_code = find_company_code(conn, company_name)
+        if company_code is None:
+            return False, "기업명을 입력해주세요."
         
-        # 기업이 없으면 기본 정보로 생성
-        existing_company = conn.execute("SELECT company_code FROM companies WHERE company_code = ?", (company_code,)).fetchone()
-        if not existing_company:
-            conn.execute('''
-                INSERT INTO companies (company_code, company_name)
-                VALUES (?, ?)
-            ''', (company_code, company_name))
-        
-        # 상담 이력 추가
+        # 상담 이력 추가 (같은 기업의 같은 이름 연락처와 연결)
         conn.execute('''
             INSERT INTO consultations 
-            (company_code, customer_name, consultation_date, consultation_content, project_name)
-            VALUES (?, ?, ?, ?, ?)
+            (company_code, customer_name, consultation_date, consultation_content, project_name, contact_id)
+            VALUES (?, ?, ?, ?, ?, ?)
         ''', (
             company_code,
             consultation_data.get('고객명'),
             consultation_data.get('상담날짜'),
             consultation_data.get('상담내역'),
-            consultation_data.get('프로젝트명')
+            consultation_data.get('프로젝트명'),
+            find_contact_id(conn, company_code, consultation_data.get('고객명'))
         ))
+        # 커밋된 결과만 캐시에 기록 (호출자 트랜잭션이 롤백될 수 있음)
+        if not conn.in_transaction:
+            remember_company_codes({company_name: company_code})
         return True, "새로운 상담 이력이 추가되었습니다."
     except Exception as e:
+        invalidate_write_capability()
         return False, f"추가 실패: {str(e)}"
 
 
 def insert_consultation_batch(conn, consultations_data):
-    """상담 이력 데이터 일괄 삽입"""
+    """상담 이력 데이터 일괄 삽입 (기업명 일괄 변환 후 한 트랜잭션에서 저장)"""
+    rows = [
+        consultation_data for consultation_data in consultations_data
+        if _has_value(consultation_data.get('company_name')) and _has_value(consultation_data.get('consultation_content'))
+    ]
+    if not rows:
+        return True, "0개의 상담 이력을 저장했습니다!"
+    
+    owns_transaction = not conn.in_transaction
     try:
-        success_count = 0
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
         
-        for consultation_data in consultations_data:
-            company_name = consultation_data.get('company_name')
-            consultation_content = consultation_data.get('consultation_content')
-            
-            if not company_name or not consultation_content:
-                continue
-            
-            # 기업 코드 찾기
-            company_code = find_company_code(conn, company_name)
-            
-            # 기업이 없으면 기본 정보로 생성
-            existing_company = conn.execute("SELECT company_code FROM companies WHERE company_code = ?", (company_code,)).fetchone()
-            if not existing_company:
-                conn.execute('''
-                    INSERT INTO companies (company_code, company_name)
-                    VALUES (?, ?)
-                ''', (company_code, company_name))
-            
-            # 상담 이력 저장
-            conn.execute('''
-                INSERT INTO consultations 
-                (company_code, customer_name, consultation_date, consultation_content, project_name)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                company_code,
-                consultation_data.get('customer_name'),
-                consultation_data.get('consultation_date'),
-                consultation_content,
-                consultation_data.get('project_name')
-            ))
-            success_count += 1
+        # 기업명 → 업체코드 일괄 변환 (없는 기업은 기본 정보로 생성)
+        company_codes = resolve_company_codes(
+            conn, (row['company_name'] for row in rows)
+        )
+        
+        # 상담 이력 저장
+        last_consultation_id = get_max_id(conn, 'consultations')
+        conn.executemany('''
+            INSERT INTO consultations 
+            (company_code, customer_name, consultation_date, consultation_content, project_name)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (
+                company_codes.get(row['company_name']),
+                row.get('customer_name'),
+                row.get('consultation_date'),
+                row['consultation_content'],
+                row.get('project_name')
+            )
+            for row in rows
+        ])
         
-        return True, f"{success_count}개의 상담 이력을 저장했습니다!"
+        # 새 상담 이력을 (업체코드, 고객명)으로 연락처와 일괄 연결
+        link_consultation_contacts(conn, since_consultation_id=last_consultation_id)
+        
+        if owns_transaction:
+            conn.execute("COMMIT")
+            remember_company_codes(company_codes)
+        return True, f"{len(rows)}개의 상담 이력을 저장했습니다!"
     except Exception as e:
+        if owns_transaction and conn.in_transaction:
+            conn.execute("ROLLBACK")
+        invalidate_write_capability()
         return False, f"상담 이력 저장 실패: {str(e)}"
 
 
-# 조회 관련 작업
-def get_companies_data(conn):
-    """기업 데이터 조회"""
-    return pd.read_sql_query('''
-        SELECT 
+# 조회 관련 작업 (cursor/page_size를 주면 키셋 페이지 조회, 없으면 전체)
+# compact=True면 category/작은 숫자형/datetime으로 변환 (편집 그리드는 False)
+def get_companies_data(conn, cursor=None, page_size=None, compact=True):
+    """기업 데이터 조회 (기업명 순, df.attrs['next_cursor']에 다음 페이지 커서)"""
+    df = read_keyset_page(conn, '''
             company_code as 업체코드,
             company_name as 기업명,
             revenue_2024 as 매출액_2024,
@@ -297,15 +389,18 @@ def get_companies_data(conn):
             customer_category as 고객구분,
             created_at as 등록일,
             updated_at as 수정일
-        FROM companies 
-        ORDER BY company_name
-    ''', conn)
+    ''', "FROM companies", COMPANY_PAGE_KEYS, cursor, page_size)
+    return compact_frame(df) if compact else df
 
 
-def get_contacts_data(conn):
-    """연락처 데이터 조회"""
-    return pd.read_sql_query('''
-        SELECT 
+def get_contacts_data(conn, cursor=None, page_size=None, compact=True):
+    """
+    연락처 데이터 조회 (기업명, 고객명 순, df.attrs['next_cursor']에 다음 페이지 커서)
+
+    CROSS JOIN으로 기업을 바깥 루프에 고정해 (기업명, 업체코드) 인덱스 순서로
+    읽습니다 (통계가 없으면 연락처 전체를 읽고 정렬하는 계획이 선택될 수 있음).
+    """
+    df = read_keyset_page(conn, '''
             c.company_name as 기업명,
             c.company_code as 업체코드,
             cc.customer_name as 고객명,
@@ -315,16 +410,16 @@ def get_contacts_data(conn):
             cc.acquisition_path as 획득경로,
             cc.created_at as 등록일,
             cc.updated_at as 수정일
-        FROM customer_contacts cc
-        JOIN companies c ON cc.company_code = c.company_code
-        ORDER BY c.company_name, cc.customer_name
-    ''', conn)
+    ''', '''
+        FROM companies c
+        CROSS JOIN customer_contacts cc ON cc.company_code = c.company_code
+    ''', ['c.company_name', 'c.company_code', 'cc.customer_name', 'cc.id'], cursor, page_size)
+    return compact_frame(df) if compact else df
 
 
-def get_consultations_data(conn):
-    """상담 이력 데이터 조회"""
-    return pd.read_sql_query('''
-        SELECT 
+def get_consultations_data(conn, cursor=None, page_size=None, compact=True):
+    """상담 이력 데이터 조회 (상담날짜 최신순, df.attrs['next_cursor']에 다음 페이지 커서)"""
+    df = read_keyset_page(conn, '''
             c.company_name as 기업명,
             c.company_code as 업체코드,
             con.customer_name as 고객명,
@@ -333,15 +428,41 @@ def get_consultations_data(conn):
             con.project_name as 프로젝트명,
             con.created_at as 등록일,
             con.updated_at as 수정일
+    ''', '''
         FROM consultations con
         JOIN companies c ON con.company_code = c.company_code
-        ORDER BY con.consultation_date DESC, c.company_name
-    ''', conn)
-
-
-def get_integrated_data(conn):
-    """통합 데이터 조회"""
-    return pd.read_sql_query('''
+    ''', ["COALESCE(con.consultation_date, '')", 'con.id'], cursor, page_size, descending=True)
+    return compact_frame(df) if compact else df
+
+
+def get_integrated_data(conn, cursor=None, page_size=None, compact=True):
+    """
+    통합 데이터 조회 (기업명 순, 기업 안에서는 상담날짜 최신순)
+
+    페이지는 기업 단위입니다. page_size개 기업의 연락처 × 상담 이력 행을
+    모두 반환하고, df.attrs['next_cursor']에 마지막 기업의 커서를 담습니다.
+    """
+    where, params = '1', []
+    next_cursor = None
+    if page_size is not None:
+        # 이번 페이지 기업 범위를 (기업명, 업체코드) 인덱스로 먼저 결정
+        condition, condition_params = keyset_condition(COMPANY_PAGE_KEYS, cursor)
+        company_keys = conn.execute(f'''
+            SELECT company_name, company_code FROM companies
+            WHERE {condition}
+            ORDER BY company_name, company_code
+            LIMIT ?
+        ''', condition_params + [page_size + 1]).fetchall()
+        if len(company_keys) > page_size:
+            company_keys = company_keys[:page_size]
+            next_cursor = tuple(company_keys[-1])
+        if not company_keys:
+            where = '0'
+        else:
+            where = '(c.company_name, c.company_code) BETWEEN (?, ?) AND (?, ?)'
+            params = list(company_keys[0]) + list(company_keys[-1])
+
+    df = pd.read_sql_query(f'''
         SELECT 
             c.company_name as 기업명,
             c.revenue_2024 as 매출액_2024,
@@ -361,8 +482,85 @@ def get_integrated_data(conn):
         FROM companies c
         LEFT JOIN customer_contacts cc ON c.company_code = cc.company_code
         LEFT JOIN consultations con ON c.company_code = con.company_code
-        ORDER BY c.company_name, con.consultation_date DESC
-    ''', conn)
+        WHERE {where}
+        ORDER BY c.company_name, c.company_code, con.consultation_date DESC
+    ''', conn, params=params)
+    df.attrs['next_cursor'] = next_cursor
+    return compact_frame(df) if compact else df
+
+
+# 통계 관련 작업
+def get_data_stats(conn, dataset, company_names=None, project_name=None, date_from=None):
+    """
+    목록 화면 지표 집계 (전체 데이터를 불러오지 않고 SQL에서 계산)
+
+    레코드 수와 기업 수는 트리거로 유지되는 company_stats를 기업 단위로
+    합산하고, 상담 이력에 프로젝트/기간 필터가 있을 때만 상담 이력을
+    COUNT로 집계합니다. 매출액은 기업 단위 AVG/SUM입니다 (조인으로 늘어난
+    행 기준이 아님).
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        dataset (str): 'companies', 'contacts', 'consultations', 'integrated'
+        company_names (list): 기업명 필터 (None이면 전체)
+        project_name (str): 프로젝트명 필터 (상담 이력)
+        date_from (str): 이 날짜(YYYY-MM-DD) 이후 상담만 (상담 이력)
+
+    Returns:
+        dict: record_count, company_count, avg_revenue, total_revenue
+            (매출액이 없는 목록은 avg_revenue, total_revenue가 None)
+    """
+    where, params = '1', []
+    if company_names is not None:
+        company_names = list(company_names)
+        where = f"c.company_name IN ({', '.join('?' for _ in company_names)})"
+        params = company_names
+
+    avg_revenue = total_revenue = None
+    if dataset in ('companies', 'integrated'):
+        company_count, avg_revenue, total_revenue, joined_rows = conn.execute(f'''
+            SELECT
+                COUNT(*),
+                AVG(c.revenue_2024),
+                SUM(c.revenue_2024),
+                SUM(MAX(COALESCE(cs.contact_count, 0), 1) * MAX(COALESCE(cs.consultation_count, 0), 1))
+            FROM companies c
+            LEFT JOIN company_stats cs ON cs.company_code = c.company_code
+            WHERE {where}
+        ''', params).fetchone()
+        record_count = company_count if dataset == 'companies' else (joined_rows or 0)
+    elif dataset == 'contacts' or (dataset == 'consultations' and not project_name and not date_from):
+        count_column = 'contact_count' if dataset == 'contacts' else 'consultation_count'
+        record_count, company_count = conn.execute(f'''
+            SELECT
+                COALESCE(SUM(cs.{count_column}), 0),
+                COUNT(CASE WHEN cs.{count_column} > 0 THEN 1 END)
+            FROM companies c
+            JOIN company_stats cs ON cs.company_code = c.company_code
+            WHERE {where}
+        ''', params).fetchone()
+    elif dataset == 'consultations':
+        if project_name:
+            where += " AND con.project_name = ?"
+            params = params + [project_name]
+        if date_from:
+            where += f" AND {CONSULTATION_SORT_DATE} >= ?"
+            params = params + [date_from]
+        record_count, company_count = conn.execute(f'''
+            SELECT COUNT(*), COUNT(DISTINCT con.company_code)
+            FROM consultations con
+            JOIN companies c ON c.company_code = con.company_code
+            WHERE {where}
+        ''', params).fetchone()
+    else:
+        raise ValueError(f"알 수 없는 목록입니다: {dataset}")
+
+    return {
+        'record_count': record_count,
+        'company_count': company_count,
+        'avg_revenue': avg_revenue,
+        'total_revenue': total_revenue,
+    }
 
 
 # 편집 관련 작업
@@ -402,50 +600,79 @@ def save_edited_companies(conn, edited_df, original_df):
                         edited_row.고객구분 if edited_row.고객구분 else None,
                         company_code
                     ))
+                    forget_company_codes([company_code], [edited_row.기업명])
                     changes_count += 1
                 except Exception as e:
+                    invalidate_write_capability()
                     errors.append(f"행 {idx+1}: 업데이트 실패 - {str(e)}")
         
-        # 새로 추가된 행 처리
+        # 새로 추가된 행 처리 (업체코드는 한 번에 예약)
         if len(edited_df) > len(original_df):
-            for idx in range(len(original_df), len(edited_df)):
+            new_indexes = [
+                idx for idx in range(len(original_df), len(edited_df))
+                if edited_df.iloc[idx]['기업명'] and edited_df.iloc[idx]['기업명'].strip()
+            ]
+            new_codes = allocate_company_codes(write_conn, len(new_indexes))
+            for idx, new_company_code in zip(new_indexes, new_codes):
                 new_row = edited_df.iloc[idx]
                 
-                if new_row['기업명'] and new_row['기업명'].strip():
-                    try:
-                        # 새 업체코드 생성
-                        new_company_code = generate_company_code()
-                        
-                        # 새 기업 추가
-                        write_conn.execute('''
-                            INSERT INTO companies 
-                            (company_code, company_name, revenue_2024, industry, employee_count, address, products, customer_category)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            new_company_code,
-                            new_row['기업명'],
-                            parse_revenue(new_row['매출액_2024']),
-                            new_row['업종'] if new_row['업종'] else None,
-                            int(new_row['종업원수']) if new_row['종업원수'] else None,
-                            new_row['주소'] if new_row['주소'] else None,
-                            new_row['상품'] if new_row['상품'] else None,
-                            new_row['고객구분'] if new_row['고객구분'] else None
-                        ))
-                        changes_count += 1
-                    except Exception as e:
-                        errors.append(f"새 행 {idx+1}: 추가 실패 - {str(e)}")
+                try:
+                    # 새 기업 추가
+                    write_conn.execute('''
+                        INSERT INTO companies 
+                        (company_code, company_name, revenue_2024, industry, employee_count, address, products, customer_category)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        new_company_code,
+                        new_row['기업명'],
+                        parse_revenue(new_row['매출액_2024']),
+                        new_row['업종'] if new_row['업종'] else None,
+                        int(new_row['종업원수']) if new_row['종업원수'] else None,
+                        new_row['주소'] if new_row['주소'] else None,
+                        new_row['상품'] if new_row['상품'] else None,
+                        new_row['고객구분'] if new_row['고객구분'] else None
+                    ))
+                    forget_company_codes(company_names=[new_row['기업명']])
+                    changes_count += 1
+                except Exception as e:
+                    invalidate_write_capability()
+                    errors.append(f"새 행 {idx+1}: 추가 실패 - {str(e)}")
         
         write_conn.close()
         
         return True, changes_count, errors
         
     except Exception as e:
+        invalidate_write_capability()
         return False, 0, [f"전체 저장 실패: {str(e)}"]
 
 
 # 캐시 클리어 함수들
+def _invalidate_changed_tables(changes):
+    """변경 알림 구독: 바뀐 테이블의 자동완성 목록과 기업명 캐시 무효화"""
+    if 'companies' in changes:
+        get_company_names.clear()
+        get_industries.clear()
+        if changes['companies'] is None:
+            clear_name_cache()
+        else:
+            forget_company_codes(changes['companies'])
+    if 'customer_contacts' in changes:
+        get_customer_names.clear()
+        get_positions.clear()
+
+
+subscribe(_invalidate_changed_tables, tables=('companies', 'customer_contacts'))
+
+
 def clear_all_caches():
-    """모든 캐시 클리어"""
+    """
+    자동완성 캐시 클리어 (저장 후)
+
+    기업명 → 업체코드 캐시는 저장 경로의 write-through와 변경 알림으로
+    유지되므로 비우지 않습니다. 일괄 삭제/초기화 후에는 clear_name_cache()를
+    따로 호출하세요.
+    """
     get_company_names.clear()
     get_customer_names.clear()
     get_industries.clear()
@@ -0,0 +1,136 @@
+"""
+database/paging.py
+
+목록 조회 키셋 페이지 이동
+- ORDER BY 컬럼 + 고유 키로 된 커서 (OFFSET 없음)
+- 정렬 순서와 같은 인덱스를 따라 읽으므로 페이지 위치와 무관한 비용
+- 커서: 이전 페이지 마지막 행의 정렬 키 값 (tuple)
+"""
+
+import pandas as pd
+
+
+DEFAULT_PAGE_SIZE = 1000
+
+# 기업 목록 정렬 키 (기업명, 고유 키)
+COMPANY_PAGE_KEYS = ['company_name', 'company_code']
+
+# 정렬 키 컬럼 별칭 접두어 (결과에서 제거)
+_KEY_PREFIX = '_page_key_'
+
+
+def create_paging_schema(conn):
+    """
+    목록 조회 정렬 순서와 같은 인덱스 생성
+
+    - 기업: (기업명, 업체코드)
+    - 연락처: 기업 순서대로 읽고 기업 안에서는 idx_contacts_company_name 사용
+    - 상담 이력: 상담날짜 내림차순 (날짜 없음은 맨 뒤)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_companies_name_code ON companies (company_name, company_code)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_consultations_page_date ON consultations (COALESCE(consultation_date, ''))"
+    )
+
+
+def keyset_condition(keys, cursor, descending=False):
+    """
+    커서 이후 행을 고르는 조건식
+
+    행 값 비교에 첫 정렬 키의 범위 조건을 더해, 여러 테이블에 걸친
+    정렬에서도 첫 키의 인덱스 범위 조회가 가능하게 합니다.
+
+    Args:
+        keys (list): 정렬 키 SQL 식 (마지막은 고유 키)
+        cursor (tuple): 이전 페이지의 next_cursor (None이면 조건 없음)
+        descending (bool): 모든 키를 내림차순으로 정렬하는지 여부
+
+    Returns:
+        tuple: (조건 SQL, 파라미터 목록) - 조건이 없으면 ('1', [])
+    """
+    if cursor is None:
+        return '1', []
+
+    cursor = list(cursor)
+    if len(cursor) != len(keys):
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+    compare, bound = ('<', '<=') if descending else ('>', '>=')
+    placeholders = ', '.join('?' for _ in keys)
+    sql = f"{keys[0]} {bound} ? AND ({', '.join(keys)}) {compare} ({placeholders})"
+    return sql, [cursor[0]] + cursor
+
+
+def read_keyset_page(conn, columns, from_clause, keys, cursor=None, page_size=None,
+                     descending=False, where='1', params=()):
+    """
+    키셋 방식으로 한 페이지 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        columns (str): SELECT 컬럼 목록 (별칭 포함)
+        from_clause (str): FROM/JOIN 절
+        keys (list): 정렬 키 SQL 식 (마지막은 고유 키)
+        cursor (tuple): 이전 페이지의 next_cursor (None이면 처음부터)
+        page_size (int): 페이지 크기 (None이면 전체)
+        descending (bool): 내림차순 정렬 여부
+        where (str): 추가 조건
+        params (tuple): 추가 조건 파라미터
+
+    Returns:
+        pd.DataFrame: 조회 결과 (df.attrs['next_cursor']: 다음 페이지 커서, 없으면 None)
+    """
+    condition, condition_params = keyset_condition(keys, cursor, descending)
+    direction = 'DESC' if descending else 'ASC'
+    key_columns = ', '.join(f"{key} AS {_KEY_PREFIX}{i}" for i, key in enumerate(keys))
+    order_by = ', '.join(f"{key} {direction}" for key in keys)
+    limit = 'LIMIT ?' if page_size is not None else ''
+    limit_params = [page_size + 1] if page_size is not None else []
+
+    df = pd.read_sql_query(f'''
+        SELECT {key_columns}, {columns}
+        {from_clause}
+        WHERE ({where}) AND {condition}
+        ORDER BY {order_by}
+        {limit}
+    ''', conn, params=list(params) + condition_params + limit_params)
+
+    key_names = [f"{_KEY_PREFIX}{i}" for i in range(len(keys))]
+    next_cursor = None
+    if page_size is not None and len(df) > page_size:
+        df = df.iloc[:page_size]
+        # numpy 값은 SQLite에 BLOB으로 바인딩되므로 파이썬 기본형으로 변환
+        next_cursor = tuple(
+            value.item() if hasattr(value, 'item') else value
+            for value in df[key_names].iloc[-1]
+        )
+
+    df = df.drop(columns=key_names).reset_index(drop=True)
+    df.attrs['next_cursor'] = next_cursor
+    return df
+
+
+def iter_pages(loader, conn, page_size=DEFAULT_PAGE_SIZE):
+    """
+    목록 조회 함수를 페이지 단위로 끝까지 순회
+
+    Args:
+        loader (callable): loader(conn, cursor=..., page_size=...) 형태의 조회 함수
+        conn (sqlite3.Connection): 데이터베이스 연결
+        page_size (int): 페이지 크기
+
+    Yields:
+        pd.DataFrame: 페이지별 조회 결과
+    """
+    cursor = None
+    while True:
+        page = loader(conn, cursor=cursor, page_size=page_size)
+        yield page
+        cursor = page.attrs.get('next_cursor')
+        if cursor is None:
+            break
@@ -0,0 +1,326 @@
+"""
+database/result_cache.py
+
+재시작 후에도 유지되는 디스크 결과 캐시
+- 쿼리 결과/내보내기 파일을 pickle로 저장 (DataFrame, 목록, 엑셀 bytes)
+- 키: (이름, 파라미터, DB 파일) 해시 + 관련 테이블 변경 버전 (stats.version)
+- 테이블이 바뀌면 키가 달라지므로 별도 무효화 없이 항상 최신 결과
+- 디스크 예산 초과 시 가장 오래 사용하지 않은 파일부터 삭제 (LRU)
+- 시작 시 백그라운드 스레드에서 등록된 결과를 미리 생성
+
+환경 변수:
+    CRM_RESULT_CACHE_DIR   캐시 디렉토리 (기본값: DB 파일 옆 .crm_cache)
+    CRM_RESULT_CACHE_MB    디스크 예산 MB (기본값: 256, 0이면 사용 안 함)
+
+인메모리 DB는 재시작하면 버전이 처음부터 다시 시작되므로 디스크 캐시를
+사용하지 않습니다. 백업 파일로 DB를 교체한 경우 clear_result_cache()를
+호출하세요.
+"""
+
+import hashlib
+import importlib
+import os
+import pickle
+import threading
+import time
+
+from .settings import get_db_settings, get_db_file_path, create_connection
+from .stats import get_table_versions
+
+
+DEFAULT_CACHE_DIR_NAME = '.crm_cache'
+
+# 디스크 예산 MB (CRM_RESULT_CACHE_MB로 변경)
+RESULT_CACHE_MB = float(os.environ.get('CRM_RESULT_CACHE_MB', 256))
+
+_CACHE_SUFFIX = '.pkl'
+
+_cache_lock = threading.Lock()
+_cache_metrics = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+
+# 이름 → (테이블 tuple, compute(conn)) - 시작 시 미리 생성할 결과
+_warmers = {}
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+
+def get_cache_dir(settings=None):
+    """
+    캐시 디렉토리 경로
+
+    Args:
+        settings (dict): get_db_settings() 결과 (기본값: 현재 설정)
+
+    Returns:
+        str or None: 디렉토리 경로 (인메모리 DB이거나 예산이 0이면 None)
+    """
+    settings = settings or get_db_settings()
+    db_path = get_db_file_path(settings)
+    if db_path is None or RESULT_CACHE_MB <= 0:
+        return None
+
+    directory = os.environ.get('CRM_RESULT_CACHE_DIR')
+    if not directory:
+        directory = os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_CACHE_DIR_NAME)
+    return directory
+
+
+def _entry_paths(directory, name, params, settings, versions):
+    """(같은 쿼리의 파일 접두어, 현재 버전 파일 경로)"""
+    identity = repr((name, params, os.path.abspath(get_db_file_path(settings))))
+    prefix = f"{name}-{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]}-"
+    version_tag = '_'.join(str(version) for version in versions)
+    return prefix, os.path.join(directory, f"{prefix}{version_tag}{_CACHE_SUFFIX}")
+
+
+def _load(path):
+    """캐시 파일 읽기 (없거나 손상되었으면 None), 적중 시 사용 시각 갱신"""
+    try:
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # 손상된 파일 (쓰기 중 종료 등)은 삭제 후 다시 생성
+        _remove(path)
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+def _remove(path):
+    """파일 삭제 (다른 프로세스가 먼저 지웠으면 무시)"""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def _store(directory, prefix, path, value):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않음), 이전 버전 삭제"""
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    finally:
+        _remove(temp_path)
+
+    # 같은 쿼리의 이전 버전 결과는 다시 쓰이지 않음
+    file_name = os.path.basename(path)
+    for entry in os.scandir(directory):
+        if entry.name.startswith(prefix) and entry.name != file_name and entry.name.endswith(_CACHE_SUFFIX):
+            _remove(entry.path)
+
+
+def _evict(directory, budget_bytes):
+    """
+    예산을 넘으면 사용 시각이 오래된 파일부터 삭제
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(_CACHE_SUFFIX):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= budget_bytes:
+            break
+        if _remove(path):
+            evicted += 1
+        total -= size
+    return evicted
+
+
+def cached_result(name, tables, compute, params=(), connect=None):
+    """
+    디스크 캐시를 거쳐 결과 조회
+
+    관련 테이블 버전과 compute 결과를 같은 읽기 트랜잭션에서 얻으므로,
+    저장된 결과가 키의 버전보다 오래된 데이터일 수 없습니다.
+
+    Args:
+        name (str): 결과 이름 (파일명 접두어, 영문/숫자/_)
+        tables (tuple): 결과가 의존하는 테이블 (stats.STATS_TABLES 중)
+        compute (callable): compute(conn) → pickle 가능한 결과
+        params (tuple): 결과를 구분하는 파라미터 (repr로 키에 포함)
+        connect (callable): 읽기 연결 생성 함수 (기본값: 읽기 전용 연결)
+
+    Returns:
+        object: 캐시된 결과 또는 새로 계산한 결과
+    """
+    settings = get_db_settings()
+    directory = get_cache_dir(settings)
+    conn = (connect or (lambda: create_connection(readonly=True, settings=settings)))()
+
+    try:
+        conn.execute("BEGIN")
+        try:
+            versions = get_table_versions(conn, tables)
+            if directory is None or versions is None:
+                return compute(conn)
+
+            prefix, path = _entry_paths(directory, name, params, settings, versions)
+            value = _load(path)
+            if value is not None:
+                with _cache_lock:
+                    _cache_metrics['hits'] += 1
+                return value
+
+            with _cache_lock:
+                _cache_metrics['misses'] += 1
+            value = compute(conn)
+        finally:
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    try:
+        _store(directory, prefix, path, value)
+        evicted = _evict(directory, RESULT_CACHE_MB * 2 ** 20)
+        with _cache_lock:
+            _cache_metrics['stores'] += 1
+            _cache_metrics['evictions'] += evicted
+    except OSError:
+        # 디스크 공간 부족/권한 문제는 캐시 없이 진행
+        with _cache_lock:
+            _cache_metrics['errors'] += 1
+    return value
+
+
+def register_warmer(name, tables, compute):
+    """
+    시작 시 미리 생성할 결과 등록 (cached_result와 같은 인자)
+
+    Args:
+        name (str): 결과 이름
+        tables (tuple): 결과가 의존하는 테이블
+        compute (callable): compute(conn) → 결과
+    """
+    with _warm_lock:
+        _warmers[name] = (tuple(tables), compute)
+
+
+def warm_result_cache(connect=None, modules=()):
+    """
+    등록된 결과를 모두 캐시에 준비 (이미 최신 파일이 있으면 읽기만 함)
+
+    Args:
+        connect (callable): 읽기 연결 생성 함수
+        modules (tuple): 먼저 import할 모듈명 (import 시 register_warmer로 등록하는 모듈)
+
+    Returns:
+        dict: {이름: 소요 시간 ms 또는 오류 문자열}
+    """
+    timings = {}
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            timings[module] = str(e)
+
+    with _warm_lock:
+        warmers = dict(_warmers)
+
+    for name, (tables, compute) in warmers.items():
+        started = time.perf_counter()
+        try:
+            cached_result(name, tables, compute, connect=connect)
+            timings[name] = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            timings[name] = str(e)
+    return timings
+
+
+def start_cache_prewarm(connect=None, modules=()):
+    """
+    백그라운드 스레드에서 결과 캐시 미리 생성 (프로세스당 한 번)
+
+    결과를 등록하는 모듈은 modules로 넘기면 스레드 안에서 import하므로
+    시작 경로의 import 시간에 포함되지 않습니다.
+
+    Args:
+        connect (callable): 읽기 연결 생성 함수
+        modules (tuple): 스레드에서 먼저 import할 모듈명
+
+    Returns:
+        threading.Thread: 미리 생성 스레드
+    """
+    global _warm_thread
+
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(
+                target=warm_result_cache,
+                args=(connect, tuple(modules)),
+                name="crm-result-cache-prewarm",
+                daemon=True
+            )
+            _warm_thread.start()
+
+    return _warm_thread
+
+
+def clear_result_cache(settings=None):
+    """
+    캐시 파일 모두 삭제 (DB 파일을 백업으로 교체한 경우)
+
+    Args:
+        settings (dict): get_db_settings() 결과 (기본값: 현재 설정)
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    directory = get_cache_dir(settings)
+    if directory is None or not os.path.isdir(directory):
+        return 0
+    return sum(
+        _remove(entry.path) for entry in os.scandir(directory)
+        if entry.name.endswith(_CACHE_SUFFIX)
+    )
+
+
+def get_result_cache_stats(settings=None):
+    """
+    결과 캐시 사용 현황
+
+    Returns:
+        dict: files, bytes, budget_bytes, hits, misses, hit_rate, stores, evictions, errors
+    """
+    directory = get_cache_dir(settings)
+    files = 0
+    total = 0
+    if directory is not None and os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.name.endswith(_CACHE_SUFFIX):
+                try:
+                    total += entry.stat().st_size
+                    files += 1
+                except OSError:
+                    pass
+
+    with _cache_lock:
+        lookups = _cache_metrics['hits'] + _cache_metrics['misses']
+        return {
+            'files': files,
+            'bytes': total,
+            'budget_bytes': int(RESULT_CACHE_MB * 2 ** 20),
+            **_cache_metrics,
+            'hit_rate': _cache_metrics['hits'] / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,504 @@
+"""
+database/search.py
+
+전문 검색 (SQLite FTS5)
+- consultations_fts: 상담내역/프로젝트명 외부 콘텐츠 FTS5 인덱스
+- companies_fts, contacts_fts: 통합 검색용 기업/연락처 인덱스 (기업은 고정 search_id 기준)
+- 트리거로 원본 테이블과 동기화
+- bm25 순위 (일치 건수가 많으면 최근 등록 순), 스니펫, 페이지 단위 검색 API
+- 엔티티별 검색을 동시에 실행하는 통합 검색
+"""
+
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .settings import create_connection
+from .contacts import normalize_phone
+
+
+# 스니펫 강조 표시 (마크다운 굵게)
+SNIPPET_OPEN = '**'
+SNIPPET_CLOSE = '**'
+SNIPPET_TOKENS = 16
+
+# 기업 검색 컬럼
+COMPANY_SEARCH_COLUMNS = ['company_name', 'address', 'products']
+
+# 전체 점검에서 확인할 FTS5 인덱스
+SEARCH_INDEXES = ('consultations_fts', 'companies_fts', 'contacts_fts')
+
+# 상담 이력 접두어 인덱스 길이 (4글자 접두어도 흔한 단어면 일치 문서 목록 병합이 느림)
+CONSULTATION_FTS_PREFIX = '2 3 4'
+
+# 통합 검색 엔티티별 기본 결과 수
+DEFAULT_SEARCH_LIMITS = {
+    'companies': 10,
+    'contacts': 10,
+    'consultations': 10,
+}
+
+# 관련도 순으로 정렬할 최대 일치 건수 (넘으면 bm25 계산 없이 최근 등록 순)
+RANKED_MATCH_LIMIT = 20000
+
+# 전화번호 형태의 검색어 (숫자, 공백, -, +, 괄호)
+_PHONE_QUERY = re.compile(r'^[\d\s\-+()]+$')
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def _create_fts_index(conn, fts_table, content_table, columns, rowid_column='rowid', prefix='2 3',
+                      insert_trigger=True):
+    """
+    외부 콘텐츠 FTS5 인덱스와 동기화 트리거 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        fts_table (str): 생성할 FTS5 테이블명
+        content_table (str): 원본 테이블명
+        columns (list): 색인할 컬럼 목록
+        rowid_column (str): 원본 테이블의 rowid 컬럼
+        prefix (str): 접두어 인덱스 길이 목록
+        insert_trigger (bool): 추가 트리거 생성 여부 (rowid 컬럼을 트리거가 채우면 따로 생성)
+    """
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f"NEW.{column}" for column in columns)
+    old_values = ', '.join(f"OLD.{column}" for column in columns)
+
+    # 외부 콘텐츠 테이블: 본문은 원본 테이블에만 저장하고 인덱스만 유지
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {column_list},
+            content='{content_table}',
+            content_rowid='{rowid_column}',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='{prefix}'
+        )
+    ''')
+
+    if insert_trigger:
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_insert
+            AFTER INSERT ON {content_table}
+            BEGIN
+                INSERT INTO {fts_table} (rowid, {column_list})
+                VALUES (NEW.{rowid_column}, {new_values});
+            END
+        ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_delete
+        AFTER DELETE ON {content_table}
+        BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+            VALUES ('delete', OLD.{rowid_column}, {old_values});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_update
+        AFTER UPDATE OF {column_list} ON {content_table}
+        BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+            VALUES ('delete', OLD.{rowid_column}, {old_values});
+            INSERT INTO {fts_table} (rowid, {column_list})
+            VALUES (NEW.{rowid_column}, {new_values});
+        END
+    ''')
+
+
+def create_consultation_search_schema(conn):
+    """
+    상담 이력 FTS5 인덱스와 동기화 트리거 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    _create_fts_index(
+        conn, 'consultations_fts', 'consultations',
+        ['consultation_content', 'project_name'], rowid_column='id',
+        prefix=CONSULTATION_FTS_PREFIX
+    )
+
+    # 프로젝트명 일치에 가중치 부여 (상담내역 1.0, 프로젝트명 2.0)
+    conn.execute(
+        "INSERT INTO consultations_fts (consultations_fts, rank) VALUES ('rank', 'bm25(1.0, 2.0)')"
+    )
+
+
+def _create_company_search_index(conn):
+    """
+    기업 FTS5 인덱스 생성 (search_id 기준)
+
+    companies는 INTEGER PRIMARY KEY가 없어 VACUUM 후 rowid가 바뀔 수 있으므로,
+    추가 시 트리거가 채우는 고정 정수 컬럼 search_id를 FTS rowid로 사용합니다.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(companies)")}
+    if 'search_id' not in columns:
+        conn.execute("ALTER TABLE companies ADD COLUMN search_id INTEGER")
+    conn.execute("UPDATE companies SET search_id = rowid WHERE search_id IS NULL")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_search_id ON companies(search_id)")
+
+    _create_fts_index(
+        conn, 'companies_fts', 'companies', COMPANY_SEARCH_COLUMNS,
+        rowid_column='search_id', insert_trigger=False
+    )
+
+    # 새 기업에 search_id를 매기고 같은 트리거에서 색인 (트리거 실행 순서에 의존하지 않도록)
+    column_list = ', '.join(COMPANY_SEARCH_COLUMNS)
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_companies_fts_insert
+        AFTER INSERT ON companies
+        BEGIN
+            UPDATE companies
+            SET search_id = (SELECT COALESCE(MAX(search_id), 0) + 1 FROM companies)
+            WHERE rowid = NEW.rowid AND search_id IS NULL;
+            INSERT INTO companies_fts (rowid, {column_list})
+            SELECT search_id, {column_list} FROM companies WHERE rowid = NEW.rowid;
+        END
+    ''')
+
+
+def recreate_company_search(conn):
+    """
+    기업 FTS5 인덱스를 search_id 기준으로 다시 만들기 (이전 rowid 기준 인덱스 교체)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    for event in ('insert', 'update', 'delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_companies_fts_{event}")
+    conn.execute("DROP TABLE IF EXISTS companies_fts")
+    _create_company_search_index(conn)
+    conn.execute(
+        "INSERT INTO companies_fts (companies_fts, rank) VALUES ('rank', 'bm25(4.0, 1.0, 1.0)')"
+    )
+    conn.execute("INSERT INTO companies_fts (companies_fts) VALUES ('rebuild')")
+
+
+def repair_search_indexes(conn):
+    """
+    FTS5 인덱스가 원본 테이블과 맞는지 확인하고, 어긋난 인덱스는 다시 생성
+
+    테이블 크기에 비례하는 시간이 걸리므로 백그라운드 전체 점검에서 실행합니다.
+
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 autocommit 연결
+
+    Returns:
+        list: 다시 생성한 FTS 테이블명
+    """
+    rebuilt = []
+    for fts_table in SEARCH_INDEXES:
+        try:
+            # rank = 1: 인덱스 내부뿐 아니라 원본(external content) 테이블과도 비교
+            conn.execute(f"INSERT INTO {fts_table} ({fts_table}, rank) VALUES ('integrity-check', 1)")
+        except sqlite3.DatabaseError:
+            conn.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+            rebuilt.append(fts_table)
+    return rebuilt
+
+
+def create_entity_search_schema(conn):
+    """
+    기업/연락처 FTS5 인덱스와 동기화 트리거 생성 (통합 검색용)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    _create_company_search_index(conn)
+    _create_fts_index(
+        conn, 'contacts_fts', 'customer_contacts',
+        ['customer_name', 'email', 'phone'], rowid_column='id'
+    )
+
+    # 기업명/고객명 일치에 가중치 부여
+    conn.execute(
+        "INSERT INTO companies_fts (companies_fts, rank) VALUES ('rank', 'bm25(4.0, 1.0, 1.0)')"
+    )
+    conn.execute(
+        "INSERT INTO contacts_fts (contacts_fts, rank) VALUES ('rank', 'bm25(4.0, 2.0, 2.0)')"
+    )
+
+
+def rebuild_consultation_search(conn):
+    """
+    상담 이력 FTS5 인덱스를 consultations 테이블에서 다시 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute("INSERT INTO consultations_fts (consultations_fts) VALUES ('rebuild')")
+
+
+def recreate_consultation_search(conn):
+    """
+    상담 이력 FTS5 인덱스를 현재 설정(접두어 인덱스 등)으로 다시 만들기
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute("DROP TABLE IF EXISTS consultations_fts")
+    create_consultation_search_schema(conn)
+    rebuild_consultation_search(conn)
+
+
+def rebuild_entity_search(conn):
+    """
+    기업/연락처 FTS5 인덱스를 원본 테이블에서 다시 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute("INSERT INTO companies_fts (companies_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+
+
+def build_match_query(text):
+    """
+    사용자 검색어를 FTS5 MATCH 구문으로 변환
+
+    공백으로 나눈 각 단어를 접두어 검색("단어"*)으로 바꾸고 모두 AND로
+    연결합니다. 조사가 붙은 한국어 단어("견적서를")도 "견적서"로 찾을 수
+    있습니다.
+
+    Args:
+        text (str): 사용자 검색어
+
+    Returns:
+        str or None: MATCH 구문 (검색어가 비어 있으면 None)
+    """
+    if not text:
+        return None
+
+    terms = []
+    for word in str(text).split():
+        word = word.replace('"', '""')
+        terms.append(f'"{word}"*')
+
+    return ' '.join(terms) if terms else None
+
+
+def _count_matches(conn, fts_table, match_query, cap):
+    """MATCH 결과 수 (cap을 넘으면 cap + 1에서 멈춤)"""
+    return conn.execute(f'''
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM {fts_table} WHERE {fts_table} MATCH ? LIMIT ?
+        )
+    ''', (match_query, cap + 1)).fetchone()[0]
+
+
+def search_consultations(conn, query, limit=20, offset=0):
+    """
+    상담 이력 전문 검색
+
+    일치 건수가 RANKED_MATCH_LIMIT 이하이면 관련도(bm25) 순이고, 넘으면
+    (짧거나 흔한 접두어) 모든 일치 행의 점수를 계산하지 않도록 최근 등록 순으로
+    반환합니다 (점수는 None).
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        query (str): 사용자 검색어
+        limit (int): 페이지 크기
+        offset (int): 건너뛸 결과 수
+
+    Returns:
+        tuple: (pd.DataFrame, has_more) - 검색 결과와 다음 페이지 존재 여부
+    """
+    match_query = build_match_query(query)
+    columns = ['상담ID', '기업명', '고객명', '상담날짜', '프로젝트명', '스니펫', '점수']
+    if match_query is None:
+        return pd.DataFrame(columns=columns), False
+
+    # 넓은 검색어는 bm25 없이 rowid 역순 (최근 등록 순)으로 페이지만 읽음
+    ranked = _count_matches(conn, 'consultations_fts', match_query, RANKED_MATCH_LIMIT) <= RANKED_MATCH_LIMIT
+    order_by = 'rank' if ranked else 'rowid DESC'
+
+    # FTS5는 rowid/점수로 정렬과 LIMIT을 먼저 처리하고 해당 페이지 행에서만 snippet()을 계산
+    # (페이지 행을 바깥에서 다시 MATCH하면 접두어 확장을 행마다 반복해 더 느림)
+    hits_sql = f'''
+        SELECT
+            rowid,
+            snippet(consultations_fts, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet,
+            {'rank' if ranked else 'NULL'} AS score
+        FROM consultations_fts
+        WHERE consultations_fts MATCH ?
+        ORDER BY {order_by}
+        LIMIT ? OFFSET ?
+    '''
+
+    # 해당 페이지만 원본 테이블과 조인
+    rows = conn.execute(f'''
+        SELECT
+            con.id,
+            c.company_name,
+            con.customer_name,
+            con.consultation_date,
+            con.project_name,
+            hits.snippet,
+            hits.score
+        FROM ({hits_sql}) hits
+        JOIN consultations con ON con.id = hits.rowid
+        LEFT JOIN companies c ON c.company_code = con.company_code
+        ORDER BY {'hits.score' if ranked else 'hits.rowid DESC'}
+    ''', (SNIPPET_OPEN, SNIPPET_CLOSE, match_query, limit + 1, offset)).fetchall()
+
+    has_more = len(rows) > limit
+    return pd.DataFrame(rows[:limit], columns=columns), has_more
+
+
+def search_companies(conn, query, limit=10):
+    """
+    기업 검색 (기업명, 주소, 상품)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        query (str): 사용자 검색어
+        limit (int): 최대 결과 수
+
+    Returns:
+        pd.DataFrame: 관련도 순 기업 목록 (연락처 수, 상담 건수 포함)
+    """
+    match_query = build_match_query(query)
+    columns = ['업체코드', '기업명', '업종', '주소', '상품', '연락처수', '상담건수', '점수']
+    if match_query is None:
+        return pd.DataFrame(columns=columns)
+
+    rows = conn.execute('''
+        SELECT
+            c.company_code,
+            c.company_name,
+            c.industry,
+            c.address,
+            c.products,
+            COALESCE(cs.contact_count, 0),
+            COALESCE(cs.consultation_count, 0),
+            hits.score
+        FROM (
+            SELECT rowid, rank AS score
+            FROM companies_fts
+            WHERE companies_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ) hits
+        JOIN companies c ON c.search_id = hits.rowid
+        LEFT JOIN company_stats cs ON cs.company_code = c.company_code
+        ORDER BY hits.score
+    ''', (match_query, limit)).fetchall()
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+def search_contacts(conn, query, limit=10):
+    """
+    연락처 검색 (고객명, 이메일, 전화)
+
+    전화번호 형태의 검색어는 정규화한 번호의 접두어로 검색합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        query (str): 사용자 검색어
+        limit (int): 최대 결과 수
+
+    Returns:
+        pd.DataFrame: 관련도 순 연락처 목록
+    """
+    match_query = build_match_query(query)
+    columns = ['연락처ID', '기업명', '고객명', '직위', '전화', '이메일', '점수']
+    if match_query is None:
+        return pd.DataFrame(columns=columns)
+
+    # 전화번호 형태의 검색어는 입력 형식과 관계없이 phone_key 인덱스로 접두어 검색
+    phone_key = normalize_phone(query) if _PHONE_QUERY.match(query.strip()) else None
+    if phone_key:
+        hits_sql = '''
+            SELECT id AS rowid, 0 AS score
+            FROM customer_contacts
+            WHERE phone_key GLOB ?
+            ORDER BY phone_key
+            LIMIT ?
+        '''
+        params = (phone_key + '*', limit)
+    else:
+        hits_sql = '''
+            SELECT rowid, rank AS score
+            FROM contacts_fts
+            WHERE contacts_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        '''
+        params = (match_query, limit)
+
+    rows = conn.execute(f'''
+        SELECT
+            cc.id,
+            c.company_name,
+            cc.customer_name,
+            cc.position,
+            cc.phone,
+            cc.email,
+            hits.score
+        FROM ({hits_sql}) hits
+        JOIN customer_contacts cc ON cc.id = hits.rowid
+        LEFT JOIN companies c ON c.company_code = cc.company_code
+        ORDER BY hits.score
+    ''', params).fetchall()
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _search_consultations_top(conn, query, limit=10):
+    """통합 검색용 상담 이력 검색 (첫 페이지만)"""
+    return search_consultations(conn, query, limit=limit)[0]
+
+
+# 엔티티별 검색 함수
+ENTITY_SEARCHES = {
+    'companies': search_companies,
+    'contacts': search_contacts,
+    'consultations': _search_consultations_top,
+}
+
+
+def _get_executor():
+    """통합 검색용 스레드 풀 (프로세스당 하나)"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=len(ENTITY_SEARCHES),
+                thread_name_prefix='crm-search'
+            )
+    return _executor
+
+
+def search_all(query, limits=None, connect=None):
+    """
+    기업/연락처/상담 이력 통합 검색
+
+    엔티티별 검색을 각자의 읽기 전용 연결에서 동시에 실행합니다.
+    각 검색은 FTS5 인덱스에서 순위 정렬과 LIMIT을 처리하므로 테이블
+    크기가 커져도 응답 시간이 거의 일정합니다.
+
+    Args:
+        query (str): 사용자 검색어
+        limits (dict): {엔티티: 최대 결과 수} (기본값: DEFAULT_SEARCH_LIMITS)
+        connect (callable): 새 연결을 반환하는 함수 (기본값: 읽기 전용 연결)
+
+    Returns:
+        dict: {'companies': DataFrame, 'contacts': DataFrame, 'consultations': DataFrame}
+    """
+    limits = limits or DEFAULT_SEARCH_LIMITS
+    connect = connect or (lambda: create_connection(readonly=True))
+
+    def run(entity):
+        conn = connect()
+        try:
+            return entity, ENTITY_SEARCHES[entity](conn, query, limit=limits[entity])
+        finally:
+            conn.close()
+
+    return dict(_get_executor().map(run, [entity for entity in limits if limits[entity] > 0]))
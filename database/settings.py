@@ -0,0 +1,285 @@
+"""
+database/settings.py
+
+데이터베이스 설정 및 연결 생성
+- DB 위치 (파일 경로 / SQLite URI / 공유 캐시 인메모리)
+- 읽기 전용 모드
+- PRAGMA 프로필 (cache_size, mmap_size, page_size, busy_timeout 등)
+
+환경 변수:
+    CRM_DB_PATH          DB 파일 경로 또는 file: URI (기본값: crm_database.db)
+    CRM_DB_READONLY      1/true 이면 읽기 전용으로 연결
+    CRM_DB_MEMORY        1/true 이면 공유 캐시 인메모리 DB 사용 (테스트/벤치마크용)
+    CRM_DB_MEMORY_NAME   인메모리 DB 이름 (기본값: crm)
+    CRM_DB_PROFILE       PRAGMA 프로필 이름 (기본값: tuned)
+    CRM_DB_MEMORY_BUDGET_MB
+                         연결당 페이지 캐시 메모리 예산 (기본값: 64)
+    CRM_DB_CACHE_SIZE, CRM_DB_MMAP_SIZE, CRM_DB_PAGE_SIZE, CRM_DB_BUSY_TIMEOUT
+                         프로필 값 개별 재정의
+"""
+
+import os
+import sqlite3
+
+
+DEFAULT_DB_PATH = 'crm_database.db'
+
+DEFAULT_PROFILE = 'tuned'
+
+# 연결당 페이지 캐시 메모리 예산 (MB)
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+# PRAGMA 프로필 (값이 None인 항목은 설정하지 않음)
+# cache_budget_ratio: 메모리 예산 중 페이지 캐시(cache_size)에 쓸 비율
+PRAGMA_PROFILES = {
+    # 기존 동작과 동일한 프로필 (cache_size=1000 페이지, 약 4MB)
+    'default': {
+        'page_size': None,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': 1000,
+        'mmap_size': None,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # 전원 장애에도 커밋 보존 (느린 디스크용)
+    'durable': {
+        'page_size': None,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': 1000,
+        'mmap_size': None,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # 읽기 위주 대시보드용 (기본값): 메모리 매핑 읽기 + 예산 절반의 페이지 캐시
+    # (매핑 영역은 OS 페이지 캐시라 연결/프로세스가 함께 사용)
+    'tuned': {
+        'page_size': None,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_budget_ratio': 0.5,
+        'mmap_size': 256 * 1024 * 1024,  # 256MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # 큰 DB용 메모리 매핑 읽기: 1GB까지 매핑하고
+    # 프로세스 페이지 캐시는 예산의 1/4만 사용
+    'mmap': {
+        'page_size': None,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_budget_ratio': 0.25,
+        'mmap_size': 1024 * 1024 * 1024,  # 1GB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # tmpfs/NVMe 및 벤치마크용 (내구성보다 속도 우선)
+    'fast': {
+        'page_size': 8192,
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -65536,  # 음수는 KiB 단위 (64MB)
+        'mmap_size': None,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+}
+
+# page_size는 journal_mode(WAL) 전에 설정해야 새 DB에 적용됨
+PRAGMA_ORDER = [
+    'page_size', 'journal_mode', 'synchronous', 'cache_size',
+    'mmap_size', 'temp_store', 'busy_timeout'
+]
+
+# 환경 변수 재정의가 가능한 정수형 PRAGMA
+_INT_OVERRIDES = {
+    'cache_size': 'CRM_DB_CACHE_SIZE',
+    'mmap_size': 'CRM_DB_MMAP_SIZE',
+    'page_size': 'CRM_DB_PAGE_SIZE',
+    'busy_timeout': 'CRM_DB_BUSY_TIMEOUT',
+}
+
+# 코드에서 지정한 설정 (환경 변수보다 우선)
+_overrides = {}
+
+
+def _env_flag(name):
+    """환경 변수 불리언 값 해석"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def configure_database(**overrides):
+    """
+    프로세스 전체 DB 설정 재정의 (테스트/벤치마크용)
+
+    Args:
+        **overrides: path, readonly, memory, memory_name, profile,
+            memory_budget_mb, pragmas 중 일부.
+            None을 넘기면 해당 재정의를 해제합니다.
+    """
+    for key, value in overrides.items():
+        if value is None:
+            _overrides.pop(key, None)
+        else:
+            _overrides[key] = value
+
+    # 다른 DB로 바뀌면 이전 DB의 기업명 → 업체코드 캐시는 쓸 수 없음
+    if overrides.keys() & {'path', 'memory', 'memory_name'}:
+        from .companies import clear_name_cache
+        clear_name_cache()
+
+
+def get_db_settings():
+    """
+    현재 DB 설정 조회
+
+    Returns:
+        dict: path, readonly, memory, memory_name, profile, memory_budget_mb, pragmas
+    """
+    profile = _overrides.get('profile', os.environ.get('CRM_DB_PROFILE', DEFAULT_PROFILE))
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"알 수 없는 PRAGMA 프로필: {profile}")
+
+    memory_budget_mb = _overrides.get(
+        'memory_budget_mb',
+        float(os.environ.get('CRM_DB_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB))
+    )
+    pragmas = resolve_profile(profile, memory_budget_mb)
+    for key, env_name in _INT_OVERRIDES.items():
+        if os.environ.get(env_name):
+            pragmas[key] = int(os.environ[env_name])
+    pragmas.update(_overrides.get('pragmas', {}))
+
+    return {
+        'path': _overrides.get('path', os.environ.get('CRM_DB_PATH', DEFAULT_DB_PATH)),
+        'readonly': _overrides.get('readonly', _env_flag('CRM_DB_READONLY')),
+        'memory': _overrides.get('memory', _env_flag('CRM_DB_MEMORY')),
+        'memory_name': _overrides.get('memory_name', os.environ.get('CRM_DB_MEMORY_NAME', 'crm')),
+        'profile': profile,
+        'memory_budget_mb': memory_budget_mb,
+        'pragmas': pragmas,
+    }
+
+
+def resolve_profile(profile, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """
+    PRAGMA 프로필을 실제 PRAGMA 값으로 변환
+
+    cache_budget_ratio가 있는 프로필은 메모리 예산으로 cache_size를 계산합니다.
+
+    Args:
+        profile (str): PRAGMA 프로필 이름
+        memory_budget_mb (float): 연결당 페이지 캐시 메모리 예산 (MB)
+
+    Returns:
+        dict: PRAGMA 이름: 값
+    """
+    pragmas = dict(PRAGMA_PROFILES[profile])
+    ratio = pragmas.pop('cache_budget_ratio', None)
+    if ratio is not None:
+        # 음수 cache_size는 KiB 단위
+        pragmas['cache_size'] = -max(int(memory_budget_mb * 1024 * ratio), 1024)
+    return pragmas
+
+
+def get_db_file_path(settings=None):
+    """
+    DB 파일의 파일시스템 경로 조회
+
+    Args:
+        settings (dict): get_db_settings() 결과 (기본값: 현재 설정)
+
+    Returns:
+        str or None: 파일 경로 (인메모리 DB이면 None)
+    """
+    settings = settings or get_db_settings()
+    path = settings['path']
+
+    if settings['memory'] or path == ':memory:':
+        return None
+    if path.startswith('file:'):
+        path = path[len('file:'):].split('?', 1)[0]
+        if not path or path == ':memory:' or 'mode=memory' in settings['path']:
+            return None
+    return path
+
+
+def get_connect_target(settings=None):
+    """
+    sqlite3.connect에 넘길 database 인자와 uri 여부 계산
+
+    Args:
+        settings (dict): get_db_settings() 결과 (기본값: 현재 설정)
+
+    Returns:
+        tuple: (database, uri)
+    """
+    settings = settings or get_db_settings()
+    path = settings['path']
+
+    if settings['memory']:
+        # 같은 이름의 연결끼리 하나의 인메모리 DB를 공유
+        return f"file:{settings['memory_name']}?mode=memory&cache=shared", True
+
+    if path.startswith('file:'):
+        if settings['readonly'] and 'mode=' not in path:
+            path += ('&' if '?' in path else '?') + 'mode=ro'
+        return path, True
+
+    if settings['readonly'] and path != ':memory:':
+        return f"file:{os.path.abspath(path)}?mode=ro", True
+
+    return path, False
+
+
+def apply_pragmas(conn, pragmas, readonly=False):
+    """
+    연결에 PRAGMA 프로필 적용
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        pragmas (dict): PRAGMA 이름: 값
+        readonly (bool): 읽기 전용 연결 여부 (journal_mode 변경 생략)
+    """
+    for name in PRAGMA_ORDER:
+        value = pragmas.get(name)
+        if value is None or (readonly and name == 'journal_mode'):
+            continue
+        try:
+            conn.execute(f"PRAGMA {name}={value}")
+        except sqlite3.Error:
+            pass  # PRAGMA 설정이 실패해도 계속 진행
+
+
+def create_connection(readonly=False, settings=None):
+    """
+    설정에 따라 새 데이터베이스 연결 생성
+
+    모든 연결은 이 함수를 통해 생성되어 같은 위치와 PRAGMA 프로필을 사용합니다.
+
+    Args:
+        readonly (bool): 이 연결에서 쓰기를 막을지 여부 (PRAGMA query_only)
+        settings (dict): get_db_settings() 결과 (기본값: 현재 설정)
+
+    Returns:
+        sqlite3.Connection: autocommit 모드의 데이터베이스 연결
+    """
+    settings = settings or get_db_settings()
+    database, uri = get_connect_target(settings)
+    busy_timeout = settings['pragmas'].get('busy_timeout') or 30000
+
+    conn = sqlite3.connect(
+        database,
+        uri=uri,
+        check_same_thread=False,
+        timeout=busy_timeout / 1000,
+        isolation_level=None  # autocommit 모드
+    )
+
+    readonly = readonly or settings['readonly']
+    apply_pragmas(conn, settings['pragmas'], readonly=readonly or settings['memory'])
+    if readonly:
+        conn.execute("PRAGMA query_only=1")
+
+    return conn
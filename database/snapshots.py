@@ -0,0 +1,361 @@
+"""
+database/snapshots.py
+
+프로세스 공유 테이블 스냅샷 (세션마다 같은 데이터를 다시 읽지 않음)
+- 테이블별 컬럼형 DataFrame 하나를 모든 세션이 공유 (읽기 전용)
+- PRAGMA data_version이 바뀌었을 때만 updated_at 이후 변경 행을 반영
+- 삭제는 요약 테이블 행 수와 비교해 감지
+- 목록 화면용 표시 데이터도 테이블 버전별로 한 번만 생성
+- 메모리는 데이터 크기에 비례 (사용자 수와 무관)
+
+반환되는 DataFrame은 공유 객체입니다. pandas Copy-on-Write로 세션에서
+수정하면 그 세션용 복사본이 생기므로 다른 세션에는 영향이 없고,
+불리언 인덱싱 등 벡터 연산으로 필터링해 사용합니다.
+"""
+
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .settings import create_connection
+from .stats import get_table_counts
+from .frames import compact_frame, compact_numeric
+
+
+# 테이블: (기본 키, 컬럼 목록, category 컬럼)
+SNAPSHOT_TABLES = {
+    'companies': (
+        'company_code',
+        ['company_code', 'company_name', 'revenue_2024', 'industry', 'employee_count',
+         'address', 'products', 'customer_category', 'created_at', 'updated_at'],
+        ('industry', 'customer_category'),
+    ),
+    'customer_contacts': (
+        'id',
+        ['id', 'company_code', 'customer_name', 'position', 'phone', 'email',
+         'acquisition_path', 'created_at', 'updated_at'],
+        ('position', 'acquisition_path'),
+    ),
+    'consultations': (
+        'id',
+        ['id', 'company_code', 'customer_name', 'consultation_date', 'consultation_content',
+         'project_name', 'contact_id', 'created_at', 'updated_at'],
+        ('project_name',),
+    ),
+}
+
+_SNAPSHOT_DATETIME_COLUMNS = ('created_at', 'updated_at')
+
+_snapshot_lock = threading.Lock()
+_snapshot_conn = None
+_data_version = None
+
+# 테이블명 → {'frame', 'version', 'max_updated_at', 'sealed', 'full_loads', 'incremental_loads'}
+# sealed: 읽을 때 이미 max_updated_at 이후 초였음 (그 시각에 더 기록될 수 없으므로 > 로 조회)
+_tables = {}
+
+# 표시 데이터 이름 → (테이블 버전 tuple, DataFrame)
+_views = {}
+
+
+def create_snapshot_schema(conn):
+    """
+    변경 행 조회용 updated_at 인덱스 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_updated_at ON companies(updated_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_updated_at ON customer_contacts(updated_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_consultations_updated_at ON consultations(updated_at)")
+
+
+def _convert_rows(df, table):
+    """조회한 행을 스냅샷 dtype으로 변환 (category, datetime, 작은 숫자형)"""
+    key, columns, category_columns = SNAPSHOT_TABLES[table]
+    converted = {}
+    for column in df.columns:
+        if column in category_columns:
+            converted[column] = df[column].astype('category')
+        elif column in _SNAPSHOT_DATETIME_COLUMNS:
+            converted[column] = pd.to_datetime(df[column], format='ISO8601', errors='coerce')
+        elif column != key and pd.api.types.is_numeric_dtype(df[column]):
+            converted[column] = compact_numeric(df[column])
+    return df.assign(**converted)
+
+
+def _append_rows(frame, rows):
+    """스냅샷에 변환된 행 추가 (category는 기존 코드를 유지한 채 합침)"""
+    category_columns = [
+        column for column in frame.columns
+        if isinstance(frame[column].dtype, pd.CategoricalDtype)
+    ]
+
+    # 숫자형은 기존 dtype으로 맞춰 합친 뒤 형식이 넓어지지 않게 함
+    aligned = {}
+    for column in frame.columns:
+        if column in category_columns or rows[column].dtype == frame[column].dtype:
+            continue
+        try:
+            aligned[column] = rows[column].astype(frame[column].dtype)
+        except (TypeError, ValueError):
+            pass
+    rows = rows.assign(**aligned)
+
+    combined = pd.concat(
+        [frame.drop(columns=category_columns), rows.drop(columns=category_columns)],
+        ignore_index=True
+    )
+    for column in category_columns:
+        combined[column] = union_categoricals(
+            [frame[column], rows[column].astype('category')], ignore_order=True
+        )
+    return combined[frame.columns]
+
+
+def _read_rows(conn, table, where='1', params=()):
+    """테이블 행 조회"""
+    key, columns, category_columns = SNAPSHOT_TABLES[table]
+    return pd.read_sql_query(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE {where}", conn, params=list(params)
+    )
+
+
+def _updated_at_bound(conn, table):
+    """updated_at 최댓값 (인덱스 조회)과 그 시각이 이미 지났는지 여부"""
+    return conn.execute(
+        f"SELECT MAX(updated_at), MAX(updated_at) < CURRENT_TIMESTAMP FROM {table}"
+    ).fetchone()
+
+
+def _load_table(conn, table):
+    """테이블 전체를 읽어 새 스냅샷 생성"""
+    state = _tables.get(table, {'version': 0, 'full_loads': 0, 'incremental_loads': 0})
+    frame = _convert_rows(_read_rows(conn, table), table)
+    max_updated_at, sealed = _updated_at_bound(conn, table)
+    _tables[table] = {
+        **state,
+        'frame': frame,
+        'version': state['version'] + 1,
+        'max_updated_at': max_updated_at,
+        'sealed': bool(sealed),
+        'full_loads': state['full_loads'] + 1,
+    }
+
+
+def _refresh_table(conn, table, row_count):
+    """
+    updated_at 이후 변경 행만 반영
+
+    마지막으로 읽을 때 아직 그 초가 지나지 않았으면 같은 초에 더 기록된
+    행을 놓치지 않도록 마지막 시각 이상(>=)을 다시 읽고, 이미 지났으면
+    그 이후(>)만 읽습니다. 실제로 값이 바뀐 행이 없으면 스냅샷을 그대로
+    둡니다.
+    """
+    key = SNAPSHOT_TABLES[table][0]
+    state = _tables[table]
+    frame = state['frame']
+    changed = False
+
+    if state['max_updated_at'] is not None:
+        compare = '>' if state['sealed'] else '>='
+        rows = _read_rows(conn, table, f"updated_at {compare} ?", (state['max_updated_at'],))
+    else:
+        rows = _read_rows(conn, table, "updated_at IS NOT NULL")
+
+    if not rows.empty:
+        rows = _convert_rows(rows, table)
+        current = frame[frame[key].isin(rows[key])]
+        same = (
+            len(current) == len(rows)
+            and current.sort_values(key).astype(object).reset_index(drop=True).equals(
+                rows.sort_values(key).astype(object).reset_index(drop=True)
+            )
+        )
+        if not same:
+            frame = _append_rows(frame[~frame[key].isin(rows[key])], rows)
+            changed = True
+
+    # 삭제 (또는 updated_at 없이 들어온 행) 감지
+    if len(frame) != row_count:
+        keys = pd.read_sql_query(f"SELECT {key} FROM {table}", conn)[key]
+        if not keys.isin(frame[key]).all():
+            _load_table(conn, table)
+            return True
+        frame = frame[frame[key].isin(keys)]
+        changed = True
+
+    max_updated_at, sealed = _updated_at_bound(conn, table)
+    state['max_updated_at'] = max_updated_at
+    state['sealed'] = bool(sealed)
+    if changed:
+        state['frame'] = frame.reset_index(drop=True)
+        state['version'] += 1
+        state['incremental_loads'] += 1
+    return changed
+
+
+def _get_connection(connect):
+    """스냅샷 전용 읽기 연결 (다른 연결의 커밋으로 data_version이 바뀜)"""
+    global _snapshot_conn
+    if _snapshot_conn is None:
+        _snapshot_conn = (connect or (lambda: create_connection(readonly=True)))()
+    return _snapshot_conn
+
+
+def _refresh(tables, connect=None):
+    """요청한 테이블을 최신 상태로 (잠금 보유 상태에서 호출)"""
+    global _data_version
+    conn = _get_connection(connect)
+
+    conn.execute("BEGIN")
+    try:
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != _data_version:
+            row_counts = get_table_counts(conn)
+            for table in list(_tables):
+                _refresh_table(conn, table, row_counts[table])
+            _data_version = data_version
+        for table in tables:
+            if table not in _tables:
+                _load_table(conn, table)
+    finally:
+        conn.execute("COMMIT")
+
+
+def get_table_snapshot(table, connect=None):
+    """
+    테이블 스냅샷 조회 (프로세스 공유, 읽기 전용)
+
+    Args:
+        table (str): SNAPSHOT_TABLES의 테이블명
+        connect (callable): 스냅샷 연결을 처음 만들 때 사용할 함수 (기본값: 읽기 전용 연결)
+
+    Returns:
+        pd.DataFrame: 테이블 전체 (원래 컬럼명, 행 순서는 보장하지 않음)
+    """
+    with _snapshot_lock:
+        _refresh([table], connect)
+        return _tables[table]['frame']
+
+
+def _build_companies_view(companies):
+    """get_companies_data와 같은 형식의 기업 목록"""
+    df = companies.sort_values(['company_name', 'company_code'])
+    return df.rename(columns={
+        'company_code': '업체코드',
+        'company_name': '기업명',
+        'revenue_2024': '매출액_2024',
+        'industry': '업종',
+        'employee_count': '종업원수',
+        'address': '주소',
+        'products': '상품',
+        'customer_category': '고객구분',
+        'created_at': '등록일',
+        'updated_at': '수정일',
+    })
+
+
+def _build_contacts_view(companies, contacts):
+    """get_contacts_data와 같은 형식의 연락처 목록"""
+    df = contacts.merge(companies[['company_code', 'company_name']], on='company_code')
+    df = df.sort_values(['company_name', 'company_code', 'customer_name', 'id'])
+    return df.rename(columns={
+        'company_name': '기업명',
+        'company_code': '업체코드',
+        'customer_name': '고객명',
+        'position': '직위',
+        'phone': '전화',
+        'email': '이메일',
+        'acquisition_path': '획득경로',
+        'created_at': '등록일',
+        'updated_at': '수정일',
+    })[['기업명', '업체코드', '고객명', '직위', '전화', '이메일', '획득경로', '등록일', '수정일']]
+
+
+def _build_consultations_view(companies, consultations):
+    """get_consultations_data와 같은 형식의 상담 이력 목록"""
+    df = consultations.merge(companies[['company_code', 'company_name']], on='company_code')
+    df = df.assign(sort_date=df['consultation_date'].fillna(''))
+    df = df.sort_values(['sort_date', 'id'], ascending=False)
+    return df.rename(columns={
+        'company_name': '기업명',
+        'company_code': '업체코드',
+        'customer_name': '고객명',
+        'consultation_date': '상담날짜',
+        'consultation_content': '상담내역',
+        'project_name': '프로젝트명',
+        'created_at': '등록일',
+        'updated_at': '수정일',
+    })[['기업명', '업체코드', '고객명', '상담날짜', '상담내역', '프로젝트명', '등록일', '수정일']]
+
+
+# 표시 데이터: (필요한 테이블, 생성 함수)
+SNAPSHOT_VIEWS = {
+    'companies': (('companies',), _build_companies_view),
+    'contacts': (('companies', 'customer_contacts'), _build_contacts_view),
+    'consultations': (('companies', 'consultations'), _build_consultations_view),
+}
+
+
+def get_shared_data(dataset, connect=None):
+    """
+    목록 화면용 표시 데이터 조회 (스냅샷 기반, 프로세스 공유)
+
+    get_*_data(conn)와 같은 컬럼/정렬/dtype을 반환하며, 관련 테이블
+    버전이 바뀌었을 때만 다시 생성합니다.
+
+    Args:
+        dataset (str): 'companies', 'contacts', 'consultations'
+        connect (callable): 스냅샷 연결을 처음 만들 때 사용할 함수
+
+    Returns:
+        pd.DataFrame: 공유 DataFrame (수정하지 말고 필터링해서 사용)
+    """
+    tables, build = SNAPSHOT_VIEWS[dataset]
+
+    with _snapshot_lock:
+        _refresh(tables, connect)
+        versions = tuple(_tables[table]['version'] for table in tables)
+        cached = _views.get(dataset)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        df = build(*(_tables[table]['frame'] for table in tables))
+        df = compact_frame(df.reset_index(drop=True))
+        df.attrs['next_cursor'] = None
+        _views[dataset] = (versions, df)
+        return df
+
+
+def clear_snapshots():
+    """스냅샷과 전용 연결 해제 (DB 위치 변경, 일괄 초기화 후)"""
+    global _snapshot_conn, _data_version
+    with _snapshot_lock:
+        _tables.clear()
+        _views.clear()
+        _data_version = None
+        if _snapshot_conn is not None:
+            _snapshot_conn.close()
+            _snapshot_conn = None
+
+
+def get_snapshot_stats():
+    """
+    스냅샷 현황
+
+    Returns:
+        dict: {테이블명: {'rows', 'bytes', 'version', 'full_loads', 'incremental_loads'}}
+    """
+    with _snapshot_lock:
+        return {
+            table: {
+                'rows': len(state['frame']),
+                'bytes': int(state['frame'].memory_usage(deep=True).sum()),
+                'version': state['version'],
+                'full_loads': state['full_loads'],
+                'incremental_loads': state['incremental_loads'],
+            }
+            for table, state in _tables.items()
+        }
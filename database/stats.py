@@ -0,0 +1,326 @@
+"""
+database/stats.py
+
+트리거로 유지되는 요약 통계 테이블
+- stats: 테이블별 레코드 수
+- company_stats: 기업별 연락처 수, 상담 건수, 최근 상담일
+- 통계 재계산 (드리프트 보정)
+- 테이블별 변경 버전 (재시작 후에도 유지되는 캐시 키)
+"""
+
+import sqlite3
+
+
+STATS_TABLES = ['companies', 'customer_contacts', 'consultations']
+
+# 상담날짜 정렬 키 ('2024.05.01'과 '2024-05-01 00:00:00' 형식을 함께 비교)
+CONSULTATION_SORT_DATE = "replace(consultation_date, '.', '-')"
+
+
+def create_stats_schema(conn):
+    """
+    요약 통계 테이블, 인덱스, 트리거 생성
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stats (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS company_stats (
+            company_code TEXT PRIMARY KEY,
+            contact_count INTEGER NOT NULL DEFAULT 0,
+            consultation_count INTEGER NOT NULL DEFAULT 0,
+            last_consultation_date TEXT
+        )
+    ''')
+
+    # 상담 삭제 시 최근 상담일 재계산용 인덱스
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_consultations_company_date
+        ON consultations (company_code, {CONSULTATION_SORT_DATE})
+    ''')
+
+    # 기업 트리거
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_companies_insert
+        AFTER INSERT ON companies
+        BEGIN
+            UPDATE stats SET row_count = row_count + 1 WHERE table_name = 'companies';
+            INSERT OR IGNORE INTO company_stats (company_code) VALUES (NEW.company_code);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_companies_delete
+        AFTER DELETE ON companies
+        BEGIN
+            UPDATE stats SET row_count = row_count - 1 WHERE table_name = 'companies';
+            DELETE FROM company_stats WHERE company_code = OLD.company_code;
+        END
+    ''')
+
+    # 연락처 트리거
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_contacts_insert
+        AFTER INSERT ON customer_contacts
+        BEGIN
+            UPDATE stats SET row_count = row_count + 1 WHERE table_name = 'customer_contacts';
+            INSERT INTO company_stats (company_code, contact_count)
+            SELECT NEW.company_code, 1 WHERE NEW.company_code IS NOT NULL
+            ON CONFLICT (company_code) DO UPDATE SET contact_count = contact_count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_contacts_delete
+        AFTER DELETE ON customer_contacts
+        BEGIN
+            UPDATE stats SET row_count = row_count - 1 WHERE table_name = 'customer_contacts';
+            UPDATE company_stats SET contact_count = contact_count - 1
+            WHERE company_code = OLD.company_code;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_contacts_move
+        AFTER UPDATE OF company_code ON customer_contacts
+        WHEN OLD.company_code IS NOT NEW.company_code
+        BEGIN
+            UPDATE company_stats SET contact_count = contact_count - 1
+            WHERE company_code = OLD.company_code;
+            INSERT INTO company_stats (company_code, contact_count)
+            SELECT NEW.company_code, 1 WHERE NEW.company_code IS NOT NULL
+            ON CONFLICT (company_code) DO UPDATE SET contact_count = contact_count + 1;
+        END
+    ''')
+
+    # 상담 이력 트리거
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_consultations_insert
+        AFTER INSERT ON consultations
+        BEGIN
+            UPDATE stats SET row_count = row_count + 1 WHERE table_name = 'consultations';
+            INSERT INTO company_stats (company_code, consultation_count, last_consultation_date)
+            SELECT NEW.company_code, 1, NEW.consultation_date WHERE NEW.company_code IS NOT NULL
+            ON CONFLICT (company_code) DO UPDATE SET
+                consultation_count = consultation_count + 1,
+                last_consultation_date = CASE
+                    WHEN last_consultation_date IS NULL
+                      OR replace(excluded.last_consultation_date, '.', '-')
+                         > replace(last_consultation_date, '.', '-')
+                    THEN excluded.last_consultation_date
+                    ELSE last_consultation_date
+                END;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_consultations_delete
+        AFTER DELETE ON consultations
+        BEGIN
+            UPDATE stats SET row_count = row_count - 1 WHERE table_name = 'consultations';
+            UPDATE company_stats SET
+                consultation_count = consultation_count - 1,
+                last_consultation_date = (
+                    SELECT consultation_date FROM consultations
+                    WHERE company_code = OLD.company_code
+                    ORDER BY {CONSULTATION_SORT_DATE} DESC
+                    LIMIT 1
+                )
+            WHERE company_code = OLD.company_code;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_consultations_move
+        AFTER UPDATE OF company_code, consultation_date ON consultations
+        BEGIN
+            UPDATE company_stats SET
+                consultation_count = consultation_count - 1,
+                last_consultation_date = (
+                    SELECT consultation_date FROM consultations
+                    WHERE company_code = OLD.company_code
+                    ORDER BY {CONSULTATION_SORT_DATE} DESC
+                    LIMIT 1
+                )
+            WHERE company_code = OLD.company_code;
+            INSERT INTO company_stats (company_code, consultation_count, last_consultation_date)
+            SELECT NEW.company_code, 1, NEW.consultation_date WHERE NEW.company_code IS NOT NULL
+            ON CONFLICT (company_code) DO UPDATE SET
+                consultation_count = consultation_count + 1,
+                last_consultation_date = (
+                    SELECT consultation_date FROM consultations
+                    WHERE company_code = NEW.company_code
+                    ORDER BY {CONSULTATION_SORT_DATE} DESC
+                    LIMIT 1
+                );
+        END
+    ''')
+
+
+def rebuild_stats(conn):
+    """
+    요약 통계를 원본 테이블에서 다시 계산 (드리프트 보정용)
+
+    트랜잭션 안에서 호출되면 해당 트랜잭션을 그대로 사용하고,
+    그렇지 않으면 자체 트랜잭션으로 실행합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        dict: 테이블별 재계산된 레코드 수
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+    try:
+        # 변경 버전은 유지 (되돌아가면 이전 버전 키의 캐시가 다시 사용됨)
+        for table in STATS_TABLES:
+            conn.execute(f'''
+                INSERT INTO stats (table_name, row_count) SELECT ?, COUNT(*) FROM {table} WHERE 1
+                ON CONFLICT (table_name) DO UPDATE SET row_count = excluded.row_count
+            ''', (table,))
+
+        conn.execute("DELETE FROM company_stats")
+        conn.execute(f'''
+            INSERT INTO company_stats
+            (company_code, contact_count, consultation_count, last_consultation_date)
+            SELECT
+                codes.company_code,
+                COALESCE(cc.contact_count, 0),
+                COALESCE(con.consultation_count, 0),
+                con.last_consultation_date
+            FROM (
+                SELECT company_code FROM companies
+                UNION
+                SELECT company_code FROM customer_contacts WHERE company_code IS NOT NULL
+                UNION
+                SELECT company_code FROM consultations WHERE company_code IS NOT NULL
+            ) codes
+            LEFT JOIN (
+                SELECT company_code, COUNT(*) AS contact_count
+                FROM customer_contacts
+                GROUP BY company_code
+            ) cc ON cc.company_code = codes.company_code
+            LEFT JOIN (
+                SELECT
+                    company_code,
+                    COUNT(*) AS consultation_count,
+                    consultation_date AS last_consultation_date,
+                    MAX({CONSULTATION_SORT_DATE})
+                FROM consultations
+                GROUP BY company_code
+            ) con ON con.company_code = codes.company_code
+        ''')
+
+        if own_transaction:
+            conn.execute("COMMIT")
+    except Exception:
+        if own_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    return get_table_counts(conn)
+
+
+def get_table_counts(conn):
+    """
+    테이블별 레코드 수 조회 (요약 테이블에서 O(1) 조회)
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+
+    Returns:
+        dict: {테이블명: 레코드 수}
+    """
+    counts = {table: 0 for table in STATS_TABLES}
+    try:
+        for table_name, row_count in conn.execute("SELECT table_name, row_count FROM stats"):
+            counts[table_name] = row_count
+    except sqlite3.OperationalError:
+        # 통계 테이블이 아직 없는 경우 (마이그레이션 이전)
+        for table in STATS_TABLES:
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return counts
+
+
+def create_table_version_schema(conn):
+    """
+    stats에 테이블별 변경 버전 컬럼과 버전 증가 트리거 추가
+
+    행이 추가/수정/삭제될 때마다 같은 트랜잭션에서 version이 증가하므로,
+    (쿼리, 테이블 버전)을 키로 쓰면 재시작 후에도 캐시가 최신인지 알 수 있습니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(stats)")]
+    if 'version' not in columns:
+        conn.execute("ALTER TABLE stats ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    for table in STATS_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE stats SET version = version + 1 WHERE table_name = '{table}';
+                END
+            ''')
+
+
+def get_table_versions(conn, tables=STATS_TABLES):
+    """
+    테이블별 변경 버전 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        tables (iterable): 조회할 테이블명
+
+    Returns:
+        tuple: tables 순서의 버전 (버전 컬럼이 아직 없으면 None)
+    """
+    try:
+        versions = dict(conn.execute("SELECT table_name, version FROM stats"))
+    except sqlite3.OperationalError:
+        return None
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def get_company_stats(conn, company_code):
+    """
+    기업별 요약 통계 조회
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        company_code (str): 업체코드
+
+    Returns:
+        dict: 연락처 수, 상담 건수, 최근 상담일
+    """
+    row = conn.execute('''
+        SELECT contact_count, consultation_count, last_consultation_date
+        FROM company_stats WHERE company_code = ?
+    ''', (company_code,)).fetchone()
+
+    if not row:
+        return {'contact_count': 0, 'consultation_count': 0, 'last_consultation_date': None}
+
+    return {
+        'contact_count': row[0],
+        'consultation_count': row[1],
+        'last_consultation_date': row[2]
+    }
+
+
+if __name__ == "__main__":
+    # 직접 실행 시 통계 재계산
+    from database.connection import get_writable_connection
+
+    rebuild_conn = get_writable_connection()
+    for table, count in rebuild_stats(rebuild_conn).items():
+        print(f"{table}: {count}개 레코드")
+    rebuild_conn.close()
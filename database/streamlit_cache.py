@@ -0,0 +1,66 @@
+"""
+database/streamlit_cache.py
+
+Streamlit 캐시 데코레이터 지연 적용
+- streamlit은 함수가 처음 호출될 때 import (CLI/배치 작업은 streamlit 없이 실행)
+- streamlit이 설치되지 않은 환경에서는 캐시 없이 원래 함수 호출
+- .clear()는 아직 한 번도 호출되지 않았으면 아무것도 하지 않음 (비울 캐시 없음)
+"""
+
+import functools
+import threading
+
+
+def _lazy(decorate_name, decorator_kwargs, func):
+    """처음 호출될 때 st.<decorate_name>(**decorator_kwargs)를 적용한 함수"""
+    lock = threading.Lock()
+    state = {'cached': None}
+
+    def get_cached():
+        with lock:
+            if state['cached'] is None:
+                try:
+                    import streamlit as st
+                except ImportError:
+                    state['cached'] = func
+                else:
+                    state['cached'] = getattr(st, decorate_name)(**decorator_kwargs)(func)
+            return state['cached']
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return get_cached()(*args, **kwargs)
+
+    def clear():
+        cached = state['cached']
+        if cached is not None and hasattr(cached, 'clear'):
+            cached.clear()
+
+    wrapper.clear = clear
+    return wrapper
+
+
+def cache_data(**kwargs):
+    """
+    st.cache_data와 같은 인자의 지연 데코레이터
+
+    Args:
+        **kwargs: st.cache_data 인자 (ttl 등)
+
+    Returns:
+        callable: 데코레이터
+    """
+    return lambda func: _lazy('cache_data', kwargs, func)
+
+
+def cache_resource(func):
+    """
+    st.cache_resource 지연 데코레이터 (인자 없이 사용)
+
+    Args:
+        func (callable): 프로세스당 한 번 생성할 자원을 반환하는 함수
+
+    Returns:
+        callable: 데코레이터가 적용된 함수
+    """
+    return _lazy('cache_resource', {}, func)
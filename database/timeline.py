@@ -0,0 +1,134 @@
+"""
+database/timeline.py
+
+기업 타임라인 (연락처 등록 + 상담 이력을 하나의 시간순 목록으로)
+- 종류별로 (업체코드, 일시) 인덱스 범위 조회 후 병합
+- 커서 기반 페이지 이동 (OFFSET 없음, 기업 규모와 무관한 비용)
+- 커서: (일시, 종류 순위, ID) - 내림차순 정렬 키와 동일
+"""
+
+import pandas as pd
+
+from .stats import CONSULTATION_SORT_DATE
+
+
+DEFAULT_TIMELINE_LIMIT = 50
+
+# 종류: (순위, 테이블, 정렬 일시 식, 표시 일시, 고객명, 내용, 프로젝트명)
+# 같은 일시에서는 순위가 높은 종류가 먼저 표시됩니다.
+TIMELINE_SOURCES = {
+    '상담': (
+        1, 'consultations', CONSULTATION_SORT_DATE,
+        'consultation_date', 'customer_name', 'consultation_content', 'project_name'
+    ),
+    '연락처 등록': (
+        0, 'customer_contacts', 'created_at',
+        'created_at', 'customer_name',
+        "trim(COALESCE(position, '') || ' ' || COALESCE(phone, '') || ' ' || COALESCE(email, ''))",
+        'NULL'
+    ),
+}
+
+TIMELINE_COLUMNS = ['일시', '유형', '고객명', '내용', '프로젝트명', 'ID']
+
+# 커서의 ID 상한 (같은 일시의 모든 행 포함)
+_MAX_ID = 2 ** 63 - 1
+
+
+def create_timeline_schema(conn):
+    """
+    타임라인 조회용 인덱스 생성
+
+    상담 이력은 stats의 idx_consultations_company_date를 그대로 사용합니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_contacts_company_created
+        ON customer_contacts (company_code, created_at)
+    ''')
+
+
+def _fetch_events(conn, kind, company_code, before, limit):
+    """한 종류의 이벤트를 커서 이전부터 최대 limit건 조회 (정렬 키 내림차순)"""
+    rank, table, sort_date, shown_date, customer, content, project = TIMELINE_SOURCES[kind]
+
+    select = f'''
+        SELECT {sort_date}, id, {shown_date}, {customer}, {content}, {project}
+        FROM {table}
+        WHERE company_code = ?
+    '''
+
+    # 커서와 종류 순위로 같은 일시 안의 ID 상한 결정
+    if before is None:
+        before_date, id_bound = None, _MAX_ID
+    else:
+        before_date, before_rank, before_id = before
+        if rank < before_rank:
+            id_bound = _MAX_ID
+        elif rank == before_rank:
+            id_bound = before_id
+        else:
+            id_bound = 0
+
+    rows = []
+    # 일시가 있는 이벤트 (인덱스 범위 조회, 식 인덱스는 행 값 비교만으로는
+    # 범위를 잡지 못하므로 일시 상한을 함께 지정)
+    if before is None:
+        rows = conn.execute(f'''
+            {select} AND {sort_date} IS NOT NULL
+            ORDER BY {sort_date} DESC, id DESC
+            LIMIT ?
+        ''', (company_code, limit)).fetchall()
+    elif before_date != '':
+        rows = conn.execute(f'''
+            {select} AND {sort_date} <= ? AND ({sort_date}, id) < (?, ?)
+            ORDER BY {sort_date} DESC, id DESC
+            LIMIT ?
+        ''', (company_code, before_date, before_date, id_bound, limit)).fetchall()
+
+    # 일시가 없는 이벤트는 맨 뒤 (커서 일시는 빈 문자열)
+    if len(rows) < limit:
+        undated_bound = id_bound if before is not None and before_date == '' else _MAX_ID
+        rows += conn.execute(f'''
+            {select} AND {sort_date} IS NULL AND id < ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (company_code, undated_bound, limit - len(rows))).fetchall()
+
+    return [
+        ((row[0] or '', rank, row[1]), [row[2], kind, row[3], row[4], row[5], row[1]])
+        for row in rows
+    ]
+
+
+def get_company_timeline(conn, company_code, before=None, limit=DEFAULT_TIMELINE_LIMIT):
+    """
+    기업의 연락처 등록과 상담 이력을 최신순 하나의 목록으로 조회
+
+    종류마다 커서 이전의 limit+1건만 인덱스로 읽어 병합하므로,
+    이벤트가 10건인 기업과 1만 건인 기업의 조회 비용이 같습니다.
+
+    Args:
+        conn (sqlite3.Connection): 데이터베이스 연결
+        company_code (str): 업체코드
+        before (tuple): 이전 페이지의 next_cursor (None이면 처음부터)
+        limit (int): 페이지 크기
+
+    Returns:
+        pd.DataFrame: 일시, 유형, 고객명, 내용, 프로젝트명, ID
+            (df.attrs['next_cursor']: 다음 페이지 커서, 마지막 페이지면 None)
+    """
+    if before is not None:
+        before = tuple(before)
+
+    events = []
+    for kind in TIMELINE_SOURCES:
+        events.extend(_fetch_events(conn, kind, company_code, before, limit + 1))
+    events.sort(key=lambda event: event[0], reverse=True)
+
+    page = events[:limit]
+    df = pd.DataFrame([values for _, values in page], columns=TIMELINE_COLUMNS)
+    df.attrs['next_cursor'] = page[-1][0] if len(events) > limit else None
+    return df
@@ -16,29 +16,45 @@ st.set_page_config(
 
 # 데이터베이스 초기화
 try:
-    from database.connection import init_database, check_database_health
+    from database.connection import init_database, get_writable_connection, get_write_capability
+    from database.health import quick_health_check, start_audit_scheduler
     conn = init_database()
     
-    # 데이터베이스 상태 확인
-    health = check_database_health(conn)
+    # 데이터베이스 상태 확인 (빠른 점검, 전체 점검은 백그라운드 주기 실행)
+    health = quick_health_check(conn)
     if health['status'] != 'healthy':
         st.error(f"데이터베이스 상태: {health['status']}")
+    start_audit_scheduler(get_writable_connection)
+    
+    # 변경 로그 압축 (키별 마지막 변경만 유지, 처리된 구간 삭제)
+    from database.changelog import start_compaction_scheduler
+    start_compaction_scheduler(get_writable_connection)
+    
+    # 다른 세션/프로세스의 변경 알림 (data_version 확인 → 프로세스 내 캐시 무효화)
+    from database.settings import create_connection
+    from database.notifier import start_change_notifier
+    start_change_notifier(lambda: create_connection(readonly=True))
+    
+    # 디스크 결과 캐시 미리 생성 (자동완성 목록, 목록 다운로드 엑셀)
+    # 결과를 등록하는 모듈은 백그라운드 스레드에서 import (시작 경로에서 제외)
+    from database.result_cache import start_cache_prewarm
+    start_cache_prewarm(modules=('database.operations', 'utils.file_handlers'))
+    
+    # 쓰기 가능 여부는 시작 시 한 번 확인 (이후 쓰기 실패 시에만 재확인)
+    if not get_write_capability()['writable']:
+        st.warning("⚠️ 데이터베이스가 읽기 전용 상태입니다. 편집 기능이 제한됩니다.")
 except Exception as e:
     st.error(f"데이터베이스 연결 오류: {str(e)}")
     st.stop()
 
-# 페이지 import
-try:
-    from pages import company_page, contact_page, consultation_page, integration_page
-except ImportError as e:
-    st.error(f"페이지 모듈 import 오류: {str(e)}")
-    st.stop()
+# 페이지 레지스트리 (페이지 모듈은 선택될 때 import)
+from pages import PAGE_REGISTRY, load_page
 
 # 사이드바 메뉴
 st.sidebar.title("📋 메뉴")
 menu = st.sidebar.selectbox(
     "작업을 선택하세요",
-    ["기업 목록 관리", "고객 연락처 관리", "상담 이력 관리", "통합 데이터 조회", "데이터 다운로드"]
+    list(PAGE_REGISTRY)
 )
 
 # 메인 타이틀
@@ -46,38 +62,76 @@ st.title("🏢 기업 상담 관리 시스템")
 st.markdown("---")
 
 # 페이지 라우팅
-if menu == "기업 목록 관리":
-    company_page.show_page(conn)
-elif menu == "고객 연락처 관리":
-    contact_page.show_page(conn)
-elif menu == "상담 이력 관리":
-    consultation_page.show_page(conn)
-elif menu == "통합 데이터 조회":
-    integration_page.show_page(conn)
-elif menu == "데이터 다운로드":
-    integration_page.show_download_page(conn)
+try:
+    show_page = load_page(menu)
+except ImportError as e:
+    st.error(f"페이지 모듈 import 오류: {str(e)}")
+    st.stop()
+
+show_page(conn)
 
 # 사이드바 시스템 정보
 st.sidebar.markdown("---")
 st.sidebar.subheader("📈 시스템 현황")
 
 try:
-    # 현재 데이터 통계
-    companies_count = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
-    contacts_count = conn.execute("SELECT COUNT(*) FROM customer_contacts").fetchone()[0]
-    consultations_count = conn.execute("SELECT COUNT(*) FROM consultations").fetchone()[0]
+    # 현재 데이터 통계 (트리거로 유지되는 요약 테이블에서 조회)
+    from database.stats import get_table_counts
+    table_counts = get_table_counts(conn)
     
-    st.sidebar.metric("등록된 기업 수", companies_count)
-    st.sidebar.metric("등록된 연락처 수", contacts_count)
-    st.sidebar.metric("등록된 상담 건수", consultations_count)
+    st.sidebar.metric("등록된 기업 수", table_counts['companies'])
+    st.sidebar.metric("등록된 연락처 수", table_counts['customer_contacts'])
+    st.sidebar.metric("등록된 상담 건수", table_counts['consultations'])
     
     # 데이터베이스 파일 정보
-    db_size = os.path.getsize('crm_database.db') if os.path.exists('crm_database.db') else 0
+    from database.settings import get_db_file_path
+    db_path = get_db_file_path()
+    db_size = os.path.getsize(db_path) if db_path and os.path.exists(db_path) else 0
     st.sidebar.metric("DB 파일 크기", f"{db_size / 1024:.1f} KB")
     
 except Exception as e:
     st.sidebar.error("시스템 정보를 불러올 수 없습니다.")
 
+# 데이터베이스 점검 현황 (마지막 전체 점검 결과)
+with st.sidebar.expander("🩺 DB 점검 현황"):
+    from database.health import get_last_audit, format_audit_age
+    last_audit = get_last_audit(conn)
+    if last_audit:
+        st.write(f"**마지막 전체 점검:** {format_audit_age(last_audit['age_seconds'])} ({last_audit['finished_at']})")
+        st.write(f"**결과:** {last_audit['status']} ({last_audit['duration_ms']}ms)")
+        st.write(f"**무결성:** {'정상' if last_audit['integrity_ok'] else '오류'}")
+        st.write(f"**외래키 오류:** {last_audit['foreign_key_errors']}건")
+        for message in last_audit['integrity_messages']:
+            st.caption(message)
+    else:
+        st.info("전체 점검이 아직 실행되지 않았습니다.")
+
+    # 기업명 → 업체코드 캐시 적중률
+    from database.companies import get_name_cache_stats
+    name_cache = get_name_cache_stats()
+    st.write(f"**기업명 캐시:** {name_cache['size']:,}/{name_cache['capacity']:,}개, "
+             f"적중률 {name_cache['hit_rate']:.0%} ({name_cache['hits']:,}/{name_cache['hits'] + name_cache['misses']:,})")
+
+    # 디스크 결과 캐시 (재시작 후에도 유지)
+    from database.result_cache import get_result_cache_stats
+    result_cache = get_result_cache_stats()
+    st.write(f"**결과 캐시:** {result_cache['files']:,}개 파일, "
+             f"{result_cache['bytes'] / 2 ** 20:.1f}/{result_cache['budget_bytes'] / 2 ** 20:.0f} MB, "
+             f"적중률 {result_cache['hit_rate']:.0%}")
+
+    # 변경 데이터 캡처 로그
+    from database.changelog import get_change_log_stats
+    change_log = get_change_log_stats(conn)
+    st.write(f"**변경 로그:** 최대 {change_log['span']:,}건 (순번 {change_log['floor']:,}~{change_log['head']:,})")
+    for consumer, pending in change_log['consumers'].items():
+        st.caption(f"{consumer}: 미처리 최대 {pending:,}건")
+
+    # 변경 알림 (다른 세션/프로세스 변경 감지)
+    from database.notifier import get_notifier_stats
+    notifier = get_notifier_stats()
+    st.write(f"**변경 알림:** {'실행 중' if notifier['running'] else '중지'}, "
+             f"확인 {notifier['polls']:,}회, 알림 {notifier['events']:,}회")
+
 st.sidebar.markdown("---")
 st.sidebar.info("""
 **사용법:**
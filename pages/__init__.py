@@ -2,24 +2,43 @@
 pages 패키지 초기화
 
 CRM 애플리케이션의 페이지 모듈들
+- 메뉴별 페이지 레지스트리
+- 페이지 모듈은 처음 사용될 때 import (시작 시간 단축)
 """
 
-# 페이지 모듈들을 import
-try:
-    from . import company_page
-    from . import contact_page
-    from . import consultation_page
-    from . import integration_page
-except ImportError:
-    # 백업 import 방식
-    import company_page
-    import contact_page
-    import consultation_page
-    import integration_page
+import importlib
+
+
+# 메뉴명: (페이지 모듈명, 표시 함수명)
+PAGE_REGISTRY = {
+    "기업 목록 관리": ("company_page", "show_page"),
+    "고객 연락처 관리": ("contact_page", "show_page"),
+    "상담 이력 관리": ("consultation_page", "show_page"),
+    "통합 데이터 조회": ("integration_page", "show_page"),
+    "통합 검색": ("search_page", "show_page"),
+    "데이터 다운로드": ("integration_page", "show_download_page"),
+}
+
+
+def load_page(menu_name):
+    """
+    메뉴명에 해당하는 페이지 표시 함수 반환
+
+    페이지 모듈은 처음 요청될 때 import되며, 이후에는 sys.modules에
+    캐시된 모듈을 그대로 사용합니다.
+
+    Args:
+        menu_name (str): PAGE_REGISTRY에 등록된 메뉴명
+
+    Returns:
+        callable: conn을 인자로 받는 페이지 표시 함수
+    """
+    module_name, func_name = PAGE_REGISTRY[menu_name]
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, func_name)
+
 
 __all__ = [
-    'company_page',
-    'contact_page', 
-    'consultation_page',
-    'integration_page'
+    'PAGE_REGISTRY',
+    'load_page'
 ]
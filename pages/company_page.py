@@ -20,6 +20,7 @@ from database.operations import (
     insert_contact_batch, 
     clear_all_caches
 )
+from database.companies import clear_name_cache
 from components.autocomplete import (
     company_name_selector,
     customer_name_selector,
@@ -129,6 +130,7 @@ def show_management_section(conn):
                     st.success(f"✅ 전체 데이터베이스가 초기화되었습니다! (총 {total_deleted}개 레코드 삭제)")
                     st.session_state.confirm_delete_all = False
                     clear_all_caches()
+                    clear_name_cache()
                     st.rerun()
                 except Exception as e:
                     st.error(f"초기화 실패: {str(e)}")
@@ -17,15 +17,17 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from database.operations import (
-    get_consultations_data, 
     insert_consultation_batch, 
     insert_new_consultation,
+    get_data_stats,
     clear_all_caches
 )
 from components.autocomplete import (
     company_name_selector,
     customer_name_selector
 )
+from database.search import search_consultations
+from database.snapshots import get_shared_data
 from components.data_grid import display_data_with_stats
 from utils.validators import validate_consultation_content
 
@@ -34,7 +36,7 @@ def show_page(conn):
     """상담 이력 관리 페이지 표시"""
     st.header("📞 상담 이력 관리")
     
-    tab1, tab2, tab3 = st.tabs(["엑셀 업로드", "직접 입력", "상담 이력 조회"])
+    tab1, tab2, tab3, tab4 = st.tabs(["엑셀 업로드", "직접 입력", "상담 이력 조회", "🔍 상담 검색"])
     
     with tab1:
         show_upload_section(conn)
@@ -44,6 +46,9 @@ def show_page(conn):
     
     with tab3:
         show_current_consultations(conn)
+    
+    with tab4:
+        show_search_section(conn)
 
 
 def show_upload_section(conn):
@@ -181,7 +186,8 @@ def show_direct_input_section(conn):
 def show_current_consultations(conn):
     """현재 상담 이력 섹션"""
     try:
-        consultations_df = get_consultations_data(conn)
+        # 프로세스 공유 스냅샷 (세션마다 다시 읽지 않음, 필터링만 세션별)
+        consultations_df = get_shared_data('consultations')
         
         if not consultations_df.empty:
             # 최근 상담 이력 강조 표시
@@ -208,8 +214,9 @@ def show_current_consultations(conn):
                     projects = ["전체"] + [p for p in consultations_df['프로젝트명'].dropna().unique() if p]
                     selected_project = st.selectbox("프로젝트 선택", projects)
             
-            # 필터 적용
-            filtered_df = consultations_df.copy()
+            # 필터 적용 (불리언 인덱싱은 새 DataFrame을 만들므로 원본 복사 불필요)
+            filtered_df = consultations_df
+            cutoff_date = None
             
             if selected_company != "전체":
                 filtered_df = filtered_df[filtered_df['기업명'] == selected_company]
@@ -227,11 +234,10 @@ def show_current_consultations(conn):
                 elif date_filter == "최근 6개월":
                     cutoff_date = today - timedelta(days=180)
                 
-                # 날짜 컬럼을 datetime으로 변환 후 필터링
+                # 날짜 컬럼을 datetime으로 변환 후 필터링 (원본에 임시 컬럼을 추가하지 않음)
                 try:
-                    filtered_df['상담날짜_datetime'] = pd.to_datetime(filtered_df['상담날짜'], errors='coerce')
-                    filtered_df = filtered_df[filtered_df['상담날짜_datetime'].dt.date >= cutoff_date]
-                    filtered_df = filtered_df.drop('상담날짜_datetime', axis=1)
+                    consultation_dates = pd.to_datetime(filtered_df['상담날짜'], errors='coerce')
+                    filtered_df = filtered_df[consultation_dates.dt.date >= cutoff_date]
                 except:
                     pass  # 날짜 변환 실패 시 필터링 건너뛰기
             
@@ -241,7 +247,13 @@ def show_current_consultations(conn):
             # 결과 표시
             if not filtered_df.empty:
                 st.write(f"**총 {len(filtered_df)}건의 상담 이력**")
-                display_data_with_stats(filtered_df, "", "consultations")
+                filtered_stats = get_data_stats(
+                    conn, 'consultations',
+                    company_names=[selected_company] if selected_company != "전체" else None,
+                    project_name=selected_project if selected_project != "전체" else None,
+                    date_from=cutoff_date.isoformat() if cutoff_date else None
+                )
+                display_data_with_stats(filtered_df, "", "consultations", stats=filtered_stats)
                 
                 # 최근 상담 내용 미리보기
                 if len(filtered_df) > 0:
@@ -260,3 +272,58 @@ def show_current_consultations(conn):
             
     except Exception as e:
         st.error(f"상담 이력 데이터 조회 오류: {str(e)}")
+
+
+def show_search_section(conn, page_size=20):
+    """상담 내용 전문 검색 섹션"""
+    st.subheader("🔍 상담 내용 검색")
+    
+    query = st.text_input(
+        "검색어",
+        placeholder="예: 견적 일정, 스마트팩토리",
+        help="상담 내역과 프로젝트명에서 검색합니다. 여러 단어는 모두 포함된 결과만 표시합니다.",
+        key="consultation_search_query"
+    )
+    
+    # 검색어가 바뀌면 첫 페이지로
+    if st.session_state.get('consultation_search_last') != query:
+        st.session_state.consultation_search_last = query
+        st.session_state.consultation_search_page = 0
+    
+    if not query.strip():
+        st.info("검색어를 입력하세요.")
+        return
+    
+    page = st.session_state.get('consultation_search_page', 0)
+    
+    try:
+        results_df, has_more = search_consultations(conn, query, limit=page_size, offset=page * page_size)
+    except Exception as e:
+        st.error(f"검색 오류: {str(e)}")
+        return
+    
+    if results_df.empty:
+        st.info("검색 결과가 없습니다.")
+        return
+    
+    # 일치 건수가 많으면 관련도 대신 최근 등록 순 (점수 없음)
+    order_label = "관련도 순" if results_df['점수'].notna().any() else "최근 등록 순 - 검색어를 더 구체적으로 입력하면 관련도 순"
+    st.write(f"**{page + 1}페이지** ({order_label})")
+    for _, hit in results_df.iterrows():
+        st.markdown(
+            f"**{hit['기업명'] or '-'}** · {hit['고객명'] or '-'} · "
+            f"{hit['상담날짜'] or '-'} · {hit['프로젝트명'] or '-'}"
+        )
+        st.markdown(f"> {hit['스니펫']}")
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    
+    with col1:
+        if page > 0 and st.button("⬅️ 이전", key="consultation_search_prev"):
+            st.session_state.consultation_search_page = page - 1
+            st.rerun()
+    
+    with col2:
+        if has_more and st.button("다음 ➡️", key="consultation_search_next"):
+            st.session_state.consultation_search_page = page + 1
+            st.rerun()
@@ -16,10 +16,20 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from database.operations import (
-    get_contacts_data, 
     insert_contact_batch, 
+    get_data_stats,
     clear_all_caches
 )
+from database.companies import clear_name_cache
+from database.stats import get_table_counts, rebuild_stats
+from database.snapshots import get_shared_data
+from database.dedup import (
+    DEFAULT_THRESHOLD,
+    start_dedup_job,
+    get_dedup_job,
+    merge_contacts,
+    discard_duplicate
+)
 from components.autocomplete import (
     company_name_selector,
     customer_name_selector,
@@ -56,7 +66,7 @@ def show_management_section(conn):
     
     # 현재 상태 표시
     try:
-        total_contacts = conn.execute("SELECT COUNT(*) FROM customer_contacts").fetchone()[0]
+        total_contacts = get_table_counts(conn)['customer_contacts']
         st.metric("현재 저장된 연락처 수", total_contacts)
         
         if total_contacts > 0:
@@ -95,7 +105,7 @@ def show_management_section(conn):
                 st.rerun()
             else:
                 try:
-                    deleted_count = conn.execute("SELECT COUNT(*) FROM customer_contacts").fetchone()[0]
+                    deleted_count = get_table_counts(conn)['customer_contacts']
                     conn.execute("DELETE FROM customer_contacts")
                     conn.commit()
                     st.success(f"✅ {deleted_count}개의 연락처가 모두 삭제되었습니다!")
@@ -119,26 +129,108 @@ def show_management_section(conn):
                 try:
                     # 모든 테이블 데이터 삭제
                     tables = ['consultations', 'customer_contacts', 'companies']
+                    table_counts = get_table_counts(conn)
                     total_deleted = 0
                     
                     for table in tables:
-                        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
                         conn.execute(f"DELETE FROM {table}")
-                        total_deleted += count
+                        total_deleted += table_counts[table]
                     
                     conn.commit()
                     st.success(f"✅ 전체 데이터베이스가 초기화되었습니다! (총 {total_deleted}개 레코드 삭제)")
                     st.session_state.confirm_delete_all = False
                     clear_all_caches()
+                    clear_name_cache()
                     st.rerun()
                 except Exception as e:
                     st.error(f"초기화 실패: {str(e)}")
     
+    st.markdown("---")
+    
+    # 요약 통계 재계산
+    st.subheader("📊 요약 통계 재계산")
+    st.write("사이드바와 요약 지표의 레코드 수가 실제와 다를 경우 원본 테이블에서 다시 계산합니다.")
+    if st.button("🔄 통계 재계산"):
+        try:
+            counts = rebuild_stats(conn)
+            st.success(
+                f"✅ 통계를 재계산했습니다! (기업 {counts['companies']}개, "
+                f"연락처 {counts['customer_contacts']}개, 상담 {counts['consultations']}건)"
+            )
+        except Exception as e:
+            st.error(f"통계 재계산 실패: {str(e)}")
+    
+    st.markdown("---")
+    
+    # 중복 연락처 탐지/병합
+    show_dedup_section(conn)
+    
     # 초기화 후 안내
     if total_contacts == 0:
         st.info("📝 **다음 단계:** '엑셀 업로드' 탭에서 올바른 매핑으로 연락처를 다시 업로드하세요.")
 
 
+def show_dedup_section(conn):
+    """중복 연락처 탐지 및 병합 섹션"""
+    st.subheader("👯 중복 연락처 정리")
+    st.write("기업+고객명, 전화번호, 이메일이 같은 연락처끼리 비교하여 중복 후보를 찾습니다.")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        threshold = st.slider("중복 판단 유사도", 0.5, 1.0, DEFAULT_THRESHOLD, 0.05, key="dedup_threshold")
+        if st.button("🔍 중복 탐지 시작"):
+            start_dedup_job(threshold=threshold)
+            st.rerun()
+    
+    job = get_dedup_job()
+    
+    with col2:
+        if job['status'] == 'running':
+            st.info("⏳ 중복 탐지 중입니다... 잠시 후 새로고침하세요.")
+            if st.button("🔄 새로고침", key="dedup_refresh"):
+                st.rerun()
+        elif job['status'] == 'error':
+            st.error(f"중복 탐지 실패: {job['error']}")
+        elif job['status'] == 'done':
+            stats = job['stats']
+            st.success(
+                f"✅ 연락처 {stats['contacts']:,}개, 후보 쌍 {stats['candidate_pairs']:,}개 비교 → "
+                f"중복 {stats['duplicates']:,}쌍 ({stats['elapsed_seconds']:.1f}초, "
+                f"초당 {stats['contacts_per_second']:,.0f}개)"
+            )
+    
+    if job['status'] != 'done' or job['result'].empty:
+        return
+    
+    duplicates = job['result']
+    st.dataframe(duplicates, use_container_width=True, hide_index=True)
+    
+    pair_index = st.selectbox(
+        "병합할 후보",
+        options=list(duplicates.index),
+        format_func=lambda i: (
+            f"#{duplicates.at[i, '연락처ID']} {duplicates.at[i, '고객명']} ← "
+            f"#{duplicates.at[i, '중복ID']} {duplicates.at[i, '중복고객명']} ({duplicates.at[i, '점수']})"
+        ),
+        key="dedup_pair"
+    )
+    
+    if st.button("🔗 선택한 후보 병합", type="primary"):
+        keep_id = int(duplicates.at[pair_index, '연락처ID'])
+        duplicate_id = int(duplicates.at[pair_index, '중복ID'])
+        try:
+            result = merge_contacts(conn, keep_id, [duplicate_id])
+            discard_duplicate([duplicate_id])
+            st.success(
+                f"✅ 연락처 #{duplicate_id}를 #{keep_id}에 병합했습니다! "
+                f"(상담 이력 {result['consultations_moved']}건 이동)"
+            )
+            clear_all_caches()
+        except Exception as e:
+            st.error(f"병합 실패: {str(e)}")
+
+
 def show_upload_section(conn):
     """파일 업로드 섹션"""
     st.subheader("고객 연락처 파일 업로드")
@@ -313,8 +405,11 @@ def show_direct_input_section(conn):
 def show_current_contacts(conn):
     """현재 연락처 목록 섹션"""
     try:
-        contacts_df = get_contacts_data(conn)
-        display_data_with_stats(contacts_df, "현재 저장된 연락처 목록", "contacts")
+        contacts_df = get_shared_data('contacts')
+        display_data_with_stats(
+            contacts_df, "현재 저장된 연락처 목록", "contacts",
+            stats=get_data_stats(conn, 'contacts')
+        )
         
         # 삭제 기능 추가
         if not contacts_df.empty:
@@ -22,18 +22,30 @@ from database.operations import (
     get_contacts_data,
     get_consultations_data,
     insert_new_consultation,
+    get_company_names,
+    get_data_stats,
     clear_all_caches
 )
+from database.stats import get_table_counts
+from database.companies import find_duplicate_companies, merge_companies
+from database.timeline import get_company_timeline
+from database.snapshots import get_shared_data
 from components.data_grid import (
     editable_companies_grid,
     simple_company_editor,
-    display_data_with_stats
+    display_data_with_stats,
+    keyset_page_cursor,
+    keyset_page_buttons
 )
 from components.autocomplete import (
     company_name_selector,
     customer_name_selector
 )
-from utils.file_handlers import create_excel_file, generate_download_filename
+from utils.file_handlers import create_excel_file, create_dataset_excel, generate_download_filename
+
+
+# 통합 데이터 조회 페이지당 기업 수
+INTEGRATED_PAGE_COMPANIES = 100
 
 
 def show_page(conn):
@@ -43,7 +55,7 @@ def show_page(conn):
     # 편집 모드 선택
     edit_mode = st.radio(
         "모드 선택",
-        ["조회만", "편집 모드", "새 상담 추가"],
+        ["조회만", "편집 모드", "새 상담 추가", "중복 기업 병합", "기업 타임라인"],
         horizontal=True
     )
     
@@ -53,6 +65,10 @@ def show_page(conn):
         show_edit_mode(conn)
     elif edit_mode == "새 상담 추가":
         show_quick_consultation_mode(conn)
+    elif edit_mode == "중복 기업 병합":
+        show_company_merge_mode(conn)
+    elif edit_mode == "기업 타임라인":
+        show_company_timeline_mode(conn)
 
 
 def show_view_only_mode(conn):
@@ -60,26 +76,31 @@ def show_view_only_mode(conn):
     st.subheader("통합 데이터 조회")
     
     try:
-        integrated_df = get_integrated_data(conn)
+        table_counts = get_table_counts(conn)
         
-        if not integrated_df.empty:
-            # 요약 통계
+        if table_counts['companies'] > 0:
+            # 요약 통계 (요약 테이블과 SQL 집계, 전체 데이터를 불러오지 않음)
             st.subheader("📈 요약 통계")
+            integrated_stats = get_data_stats(conn, 'integrated')
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("총 기업 수", integrated_df['기업명'].nunique())
+                st.metric("총 기업 수", table_counts['companies'])
             with col2:
-                st.metric("총 연락처 수", integrated_df['고객명'].count())
+                st.metric("총 연락처 수", table_counts['customer_contacts'])
             with col3:
-                st.metric("총 상담 건수", integrated_df['상담내역'].count())
+                st.metric("총 상담 건수", table_counts['consultations'])
             with col4:
-                if not integrated_df['매출액_2024'].isna().all():
-                    avg_revenue = integrated_df['매출액_2024'].mean()
-                    st.metric("평균 매출액", f"{avg_revenue:,.0f}" if not pd.isna(avg_revenue) else "N/A")
+                if integrated_stats['avg_revenue'] is not None:
+                    st.metric("평균 매출액", f"{integrated_stats['avg_revenue']:,.0f}")
             
-            # 데이터 표시
-            display_data_with_stats(integrated_df, "통합 데이터", "integrated")
+            # 데이터 표시 (기업 단위 키셋 페이지)
+            cursor = keyset_page_cursor("integrated_cursors")
+            integrated_df = get_integrated_data(
+                conn, cursor=cursor, page_size=INTEGRATED_PAGE_COMPANIES
+            )
+            display_data_with_stats(integrated_df, "통합 데이터", "integrated", stats=integrated_stats)
+            keyset_page_buttons("integrated_cursors", integrated_df.attrs['next_cursor'])
             
         else:
             st.info("통합할 데이터가 없습니다.")
@@ -101,7 +122,8 @@ def show_edit_mode(conn):
     )
     
     try:
-        companies_df = get_companies_data(conn)
+        # 편집 그리드는 원래 dtype 유지 (category면 새 업종/구분 입력 불가)
+        companies_df = get_companies_data(conn, compact=False)
         
         if not companies_df.empty:
             if edit_style == "그리드 편집 (고급)":
@@ -123,6 +145,103 @@ def show_edit_mode(conn):
     show_recent_consultations(conn)
 
 
+def show_company_merge_mode(conn):
+    """중복 기업 병합 모드"""
+    st.subheader("🏢 중복 기업 병합")
+    st.info("💡 '(주)한빛', '한빛 주식회사'처럼 법인 표기나 띄어쓰기만 다른 기업을 찾아 하나로 합칩니다.")
+    
+    try:
+        duplicates_df = find_duplicate_companies(conn)
+    except Exception as e:
+        st.error(f"중복 기업 조회 오류: {str(e)}")
+        return
+    
+    if duplicates_df.empty:
+        st.success("✅ 중복으로 보이는 기업이 없습니다.")
+        return
+    
+    groups = list(duplicates_df['비교키'].unique())
+    st.write(f"**중복 후보 {len(groups)}개 그룹** (기업 {len(duplicates_df)}개)")
+    st.dataframe(duplicates_df, use_container_width=True, hide_index=True)
+    
+    group_key = st.selectbox("병합할 그룹", options=groups, key="merge_company_group")
+    group_df = duplicates_df[duplicates_df['비교키'] == group_key]
+    
+    codes = list(group_df['업체코드'])
+    names = dict(zip(group_df['업체코드'], group_df['기업명']))
+    keep_code = st.radio(
+        "남길 기업",
+        options=codes,
+        format_func=lambda code: f"{names[code]} ({code})",
+        key="merge_company_keep"
+    )
+    
+    if st.button("🔗 그룹 병합", type="primary"):
+        duplicate_codes = [code for code in codes if code != keep_code]
+        try:
+            result = merge_companies(conn, keep_code, duplicate_codes)
+            st.success(
+                f"✅ {result['merged']}개 기업을 '{names[keep_code]}'에 병합했습니다! "
+                f"(연락처 {result['contacts_moved']}개, 상담 이력 {result['consultations_moved']}건 이동)"
+            )
+            clear_all_caches()
+            st.rerun()
+        except Exception as e:
+            st.error(f"병합 실패: {str(e)}")
+
+
+def show_company_timeline_mode(conn):
+    """기업 타임라인 모드 (연락처 등록 + 상담 이력 시간순)"""
+    st.subheader("🕒 기업 타임라인")
+    
+    company_name = st.selectbox(
+        "기업 선택",
+        options=[""] + get_company_names(),
+        key="timeline_company_name"
+    )
+    if not company_name:
+        st.info("타임라인을 볼 기업을 선택하세요.")
+        return
+    
+    company = conn.execute('''
+        SELECT c.company_code, c.industry, c.customer_category,
+               COALESCE(cs.contact_count, 0), COALESCE(cs.consultation_count, 0)
+        FROM companies c
+        LEFT JOIN company_stats cs ON cs.company_code = c.company_code
+        WHERE c.company_name = ?
+        ORDER BY c.rowid
+        LIMIT 1
+    ''', (company_name,)).fetchone()
+    if company is None:
+        st.warning("기업을 찾을 수 없습니다.")
+        return
+    
+    company_code = company[0]
+    st.caption(
+        f"업체코드 {company_code} · {company[1] or '업종 미입력'} · {company[2] or '구분 미입력'} · "
+        f"연락처 {company[3]}명 · 상담 {company[4]}건"
+    )
+    
+    # 페이지 커서 (기업이 바뀌면 처음부터)
+    cursor = keyset_page_cursor("timeline_cursors", reset_token=company_code)
+    
+    try:
+        timeline_df = get_company_timeline(conn, company_code, before=cursor)
+    except Exception as e:
+        st.error(f"타임라인 조회 오류: {str(e)}")
+        return
+    
+    if timeline_df.empty:
+        st.info("등록된 연락처나 상담 이력이 없습니다.")
+        return
+    
+    st.dataframe(timeline_df, use_container_width=True, hide_index=True)
+    keyset_page_buttons(
+        "timeline_cursors", timeline_df.attrs['next_cursor'],
+        prev_label="⬅️ 최근", next_label="이전 ➡️"
+    )
+
+
 def show_add_new_company_section(conn):
     """새 기업 추가 섹션"""
     st.markdown("---")
@@ -146,7 +265,7 @@ def show_add_new_company_section(conn):
             if add_company_name.strip():
                 try:
                     from database.connection import generate_company_code
-                    new_code = generate_company_code()
+                    new_code = generate_company_code(conn)
                     
                     conn.execute('''
                         INSERT INTO companies 
@@ -324,13 +443,13 @@ def show_companies_download(conn):
     """기업 목록 다운로드"""
     st.subheader("🏢 기업 목록 다운로드")
     
-    companies_df = get_companies_data(conn)
+    companies_df = get_shared_data('companies')
     
     if not companies_df.empty:
         st.dataframe(companies_df.head(), use_container_width=True)
         st.info(f"총 {len(companies_df)}개의 기업이 있습니다.")
         
-        excel_data = create_excel_file({"기업목록": companies_df})
+        excel_data = create_dataset_excel('companies')
         
         st.download_button(
             label="📥 기업 목록 엑셀 다운로드",
@@ -346,13 +465,13 @@ def show_contacts_download(conn):
     """고객 연락처 다운로드"""
     st.subheader("👥 고객 연락처 다운로드")
     
-    contacts_df = get_contacts_data(conn)
+    contacts_df = get_shared_data('contacts')
     
     if not contacts_df.empty:
         st.dataframe(contacts_df.head(), use_container_width=True)
         st.info(f"총 {len(contacts_df)}개의 연락처가 있습니다.")
         
-        excel_data = create_excel_file({"고객연락처": contacts_df})
+        excel_data = create_dataset_excel('contacts')
         
         st.download_button(
             label="📥 고객 연락처 엑셀 다운로드",
@@ -368,13 +487,13 @@ def show_consultations_download(conn):
     """상담 이력 다운로드"""
     st.subheader("📞 상담 이력 다운로드")
     
-    consultations_df = get_consultations_data(conn)
+    consultations_df = get_shared_data('consultations')
     
     if not consultations_df.empty:
         st.dataframe(consultations_df.head(), use_container_width=True)
         st.info(f"총 {len(consultations_df)}개의 상담 이력이 있습니다.")
         
-        excel_data = create_excel_file({"상담이력": consultations_df})
+        excel_data = create_dataset_excel('consultations')
         
         st.download_button(
             label="📥 상담 이력 엑셀 다운로드",
@@ -391,6 +510,8 @@ def show_full_backup_download(conn):
     st.markdown("---")
     st.subheader("💾 전체 데이터 백업")
     st.write("모든 데이터를 하나의 엑셀 파일로 다운로드합니다.")
+    st.caption("정기 추출은 마지막 추출 이후 변경분만 기록하는 "
+               "`python -m database.exports --consumer <이름>`을 사용하세요.")
     
     if st.button("전체 데이터 백업 다운로드"):
         try:
@@ -0,0 +1,80 @@
+"""
+pages/search_page.py
+
+통합 검색 페이지 (기업 / 연락처 / 상담 이력)
+"""
+
+import streamlit as st
+import sys
+import os
+
+# 상위 디렉토리를 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from database.search import search_all, DEFAULT_SEARCH_LIMITS
+
+
+# 엔티티별 표시 제목
+ENTITY_LABELS = {
+    'companies': "🏢 기업",
+    'contacts': "👥 연락처",
+    'consultations': "📞 상담 이력",
+}
+
+
+def show_page(conn):
+    """통합 검색 페이지 표시"""
+    st.header("🔎 통합 검색")
+    
+    query = st.text_input(
+        "검색어",
+        placeholder="예: 삼성, 홍길동, 견적 일정",
+        help="기업명/주소/상품, 고객명/이메일/전화, 상담 내역을 한 번에 검색합니다.",
+        key="global_search_query"
+    )
+    
+    limit = st.selectbox(
+        "유형별 최대 결과 수",
+        options=[5, 10, 20, 50],
+        index=1,
+        key="global_search_limit"
+    )
+    
+    if not query.strip():
+        st.info("검색어를 입력하세요.")
+        return
+    
+    limits = {entity: limit for entity in DEFAULT_SEARCH_LIMITS}
+    
+    try:
+        results = search_all(query, limits=limits)
+    except Exception as e:
+        st.error(f"검색 오류: {str(e)}")
+        return
+    
+    if all(df.empty for df in results.values()):
+        st.info("검색 결과가 없습니다.")
+        return
+    
+    for entity, label in ENTITY_LABELS.items():
+        df = results.get(entity)
+        if df is None:
+            continue
+        
+        st.subheader(f"{label} ({len(df)}건)")
+        if df.empty:
+            st.caption("결과 없음")
+            continue
+        
+        if entity == 'consultations':
+            for _, hit in df.iterrows():
+                st.markdown(
+                    f"**{hit['기업명'] or '-'}** · {hit['고객명'] or '-'} · "
+                    f"{hit['상담날짜'] or '-'} · {hit['프로젝트명'] or '-'}"
+                )
+                st.markdown(f"> {hit['스니펫']}")
+        else:
+            st.dataframe(df.drop(columns=['점수']), use_container_width=True, hide_index=True)
@@ -0,0 +1,37 @@
+"""
+tests/conftest.py
+
+공통 fixture: 스키마를 초기화한 인메모리 데이터베이스
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# 프로젝트 루트를 import 경로에 추가 (pages와 같은 방식)
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from database.migrations import initialize_schema
+
+
+@pytest.fixture
+def conn():
+    """autocommit 인메모리 연결 (모든 마이그레이션 적용)"""
+    connection = sqlite3.connect(':memory:', isolation_level=None)
+    initialize_schema(connection)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """스키마를 초기화한 파일 데이터베이스 경로 (연결 간 변경 감지 확인용)"""
+    path = str(tmp_path / 'crm_test.db')
+    connection = sqlite3.connect(path, isolation_level=None)
+    initialize_schema(connection)
+    connection.close()
+    return path
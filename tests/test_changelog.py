@@ -0,0 +1,73 @@
+"""
+tests/test_changelog.py
+
+변경 로그 압축, 소비자 커서 동작 확인
+"""
+
+from database.changelog import (
+    compact_change_log,
+    commit_consumer_cursor,
+    get_change_log_stats,
+    read_changes,
+    read_consumer_changes,
+    register_consumer
+)
+
+
+def _add_company(conn, code, name):
+    conn.execute("INSERT INTO companies (company_code, company_name) VALUES (?, ?)", (code, name))
+
+
+def test_compaction_keeps_last_operation_per_key(conn):
+    _add_company(conn, 'C1', 'A')
+    _add_company(conn, 'C2', 'B')
+    conn.execute("UPDATE companies SET company_name = 'A2' WHERE company_code = 'C1'")
+    conn.execute("UPDATE companies SET company_name = 'A3' WHERE company_code = 'C1'")
+    conn.execute("DELETE FROM companies WHERE company_code = 'C2'")
+
+    result = compact_change_log(conn)
+
+    changes = read_changes(conn, 0, 100, tables=['companies'])
+    assert [(change['key'], change['operation']) for change in changes] == [('C1', 'U'), ('C2', 'D')]
+    assert result['deduplicated'] == 3
+
+
+def test_consumed_range_is_deleted_but_cursor_stays_valid(conn):
+    register_consumer(conn, 'nightly', start_seq=0)
+    _add_company(conn, 'C1', 'A')
+    _add_company(conn, 'C2', 'B')
+    batch = read_consumer_changes(conn, 'nightly')
+    commit_consumer_cursor(conn, 'nightly', batch['next_cursor'])
+    _add_company(conn, 'C3', 'C')
+
+    result = compact_change_log(conn)
+
+    assert result['consumed'] == 2
+    batch = read_consumer_changes(conn, 'nightly')
+    assert not batch['expired']
+    assert [change['key'] for change in batch['changes']] == ['C3']
+
+
+def test_cursor_below_floor_is_expired(conn):
+    register_consumer(conn, 'slow', start_seq=0)
+    for i in range(5):
+        _add_company(conn, f'C{i}', f'기업{i}')
+
+    result = compact_change_log(conn, max_rows=2)
+
+    assert result['trimmed'] == 3
+    batch = read_consumer_changes(conn, 'slow')
+    assert batch['expired']
+    assert len(batch['changes']) == 2
+
+
+def test_stats_use_sequence_bounds(conn):
+    register_consumer(conn, 'slow', start_seq=0)
+    for i in range(5):
+        _add_company(conn, f'C{i}', f'기업{i}')
+    compact_change_log(conn, max_rows=2)
+
+    stats = get_change_log_stats(conn)
+
+    assert (stats['floor'], stats['head'], stats['span']) == (3, 5, 2)
+    assert stats['consumers'] == {'slow': 5}
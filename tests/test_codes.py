@@ -0,0 +1,49 @@
+"""
+tests/test_codes.py
+
+업체코드 순번 할당 확인
+"""
+
+from database.codes import allocate_company_codes, reserve_sequence
+from database.operations import insert_company_batch
+
+
+def _sequence_writes(conn):
+    """code_sequences 쓰기 횟수를 세는 트리거 설치"""
+    conn.execute("CREATE TEMP TABLE sequence_writes (n INTEGER)")
+    conn.execute('''
+        CREATE TEMP TRIGGER count_sequence_writes AFTER UPDATE ON main.code_sequences
+        BEGIN INSERT INTO sequence_writes VALUES (1); END
+    ''')
+    return lambda: conn.execute("SELECT COUNT(*) FROM sequence_writes").fetchone()[0]
+
+
+def test_reserved_ranges_do_not_overlap(conn):
+    first = reserve_sequence(conn, 3)
+    second = reserve_sequence(conn, 2)
+
+    assert list(first) + list(second) == list(range(first.start, first.start + 5))
+    assert reserve_sequence(conn, 0) == range(0)
+
+
+def test_allocation_rolls_back_with_caller_transaction(conn):
+    conn.execute("BEGIN")
+    rolled_back = allocate_company_codes(conn, 2)
+    conn.execute("ROLLBACK")
+
+    assert allocate_company_codes(conn, 2) == rolled_back
+
+
+def test_company_batch_reserves_codes_once(conn):
+    writes = _sequence_writes(conn)
+    ok, _ = insert_company_batch(conn, [
+        {'company_name': '(주)한빛전자'},
+        {'company_name': '푸른물산'},
+        {'company_name': '한빛전자', 'industry': '제조'},
+        {'company_name': '새솔기계', 'company_code': 'C0000050'},
+    ])
+
+    assert ok
+    assert writes() == 2  # 지정 코드 반영 1회 + 새 코드 예약 1회
+    rows = conn.execute("SELECT company_code, industry FROM companies ORDER BY company_code").fetchall()
+    assert rows == [('C0000050', None), ('C0000051', '제조'), ('C0000052', None)]
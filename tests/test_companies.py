@@ -0,0 +1,69 @@
+"""
+tests/test_companies.py
+
+기업명 비교키 (Python/SQL 규칙 일치)와 기업명 일괄 변환 확인
+"""
+
+import pytest
+
+from database.companies import normalize_company_name, rebuild_company_keys, resolve_company_codes
+
+
+COMPANY_NAMES = [
+    '(주)한빛', '한빛 주식회사', '㈜ 한빛', ' 한빛\t', 'HanBit Co., Ltd.', 'ACME Inc.',
+    'Ärzte-Gruppe', '주식회사', '(주) 푸른·바다 & Co.', "O'Neil", '한빛.전자_1',
+]
+
+
+def _name_keys(conn):
+    return dict(conn.execute("SELECT company_name, name_key FROM companies"))
+
+
+@pytest.fixture
+def named_companies(conn):
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [(f'C{i}', name) for i, name in enumerate(COMPANY_NAMES)]
+    )
+    return conn
+
+
+def test_insert_trigger_matches_normalize(named_companies):
+    assert _name_keys(named_companies) == {name: normalize_company_name(name) for name in COMPANY_NAMES}
+
+
+def test_rename_and_rebuild_match_normalize(named_companies):
+    named_companies.execute("UPDATE companies SET company_name = 'Blue Sea Corp.' WHERE company_code = 'C0'")
+    expected = {name: normalize_company_name(name) for name in COMPANY_NAMES[1:] + ['Blue Sea Corp.']}
+    assert _name_keys(named_companies) == expected
+
+    named_companies.execute("UPDATE companies SET name_key = NULL")
+    rebuild_company_keys(named_companies)
+    assert _name_keys(named_companies) == expected
+
+
+def test_resolve_reuses_existing_and_creates_one_company_per_key(conn):
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [('OLD1', '한빛 주식회사'), ('OLD2', '(주)한빛')]
+    )
+
+    resolved = resolve_company_codes(conn, ['(주)한빛', '한빛', '푸른물산', '(주) 푸른물산', '푸른물산', '', None])
+
+    # 기업명이 정확히 같은 기업 우선, 없으면 먼저 등록된 기업
+    assert resolved['(주)한빛'] == 'OLD2'
+    assert resolved['한빛'] == 'OLD1'
+    # 비교키가 같은 새 기업명은 하나의 기업으로 생성 (처음 나온 기업명 사용)
+    assert resolved['푸른물산'] == resolved['(주) 푸른물산']
+    assert set(resolved) == {'(주)한빛', '한빛', '푸른물산', '(주) 푸른물산'}
+    assert conn.execute(
+        "SELECT company_name FROM companies WHERE company_code = ?", (resolved['푸른물산'],)
+    ).fetchone() == ('푸른물산',)
+    assert conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 3
+
+
+def test_resolve_is_stable_across_calls(conn):
+    first = resolve_company_codes(conn, ['한빛전자'])
+    second = resolve_company_codes(conn, ['(주)한빛전자', '한빛전자'])
+
+    assert second == {'(주)한빛전자': first['한빛전자'], '한빛전자': first['한빛전자']}
@@ -0,0 +1,59 @@
+"""
+tests/test_dedup.py
+
+중복 연락처 병합 동작 확인
+"""
+
+from database.contacts import normalize_email, normalize_phone
+from database.dedup import merge_contacts
+
+
+def _add_contact(conn, name, phone=None, email=None, position=None):
+    return conn.execute('''
+        INSERT INTO customer_contacts
+        (company_code, customer_name, position, phone, email, phone_key, email_key)
+        VALUES ('C1', ?, ?, ?, ?, ?, ?)
+    ''', (name, position, phone, email, normalize_phone(phone), normalize_email(email))).lastrowid
+
+
+def test_merge_fills_value_and_key_from_same_duplicate(conn):
+    conn.execute("INSERT INTO companies (company_code, company_name) VALUES ('C1', '한빛')")
+    keep_id = _add_contact(conn, '김철수')
+    older_id = _add_contact(conn, '김 철수', phone='010-1234-5678', email='kim@old.com')
+    newer_id = _add_contact(conn, '김철수', email='Kim@New.com', position='팀장')
+    # 값 없이 키만 남은 행 (이전 버전 데이터)
+    conn.execute("UPDATE customer_contacts SET phone_key = '01099998888' WHERE id = ?", (newer_id,))
+
+    result = merge_contacts(conn, keep_id, [older_id, newer_id])
+
+    assert result['merged'] == 2
+    row = conn.execute('''
+        SELECT phone, phone_key, email, email_key, position FROM customer_contacts WHERE id = ?
+    ''', (keep_id,)).fetchone()
+    assert row == (
+        '010-1234-5678', normalize_phone('010-1234-5678'),
+        'Kim@New.com', normalize_email('Kim@New.com'),
+        '팀장'
+    )
+
+
+def test_merge_keeps_consultation_company_for_cross_company_duplicate(conn):
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [('C1', '한빛'), ('C2', '푸른')]
+    )
+    keep_id = _add_contact(conn, '김철수', phone='010-1234-5678')
+    other_id = conn.execute('''
+        INSERT INTO customer_contacts (company_code, customer_name, phone, phone_key)
+        VALUES ('C2', '김 철수', '010-1234-5678', ?)
+    ''', (normalize_phone('010-1234-5678'),)).lastrowid
+    conn.execute('''
+        INSERT INTO consultations (company_code, customer_name, consultation_date, consultation_content)
+        VALUES ('C2', '김 철수', '2024-01-01', '견적 문의')
+    ''')
+
+    result = merge_contacts(conn, keep_id, [other_id])
+
+    assert result['consultations_moved'] == 1
+    row = conn.execute("SELECT company_code, customer_name, contact_id FROM consultations").fetchone()
+    assert row == ('C2', '김 철수', keep_id)
@@ -0,0 +1,63 @@
+"""
+tests/test_exports.py
+
+변경분 내보내기 동작 확인
+"""
+
+import io
+import json
+
+import pytest
+
+from database.changelog import get_consumer_cursor
+from database.exports import export_changes
+
+
+def _add_company(conn, code, name):
+    conn.execute("INSERT INTO companies (company_code, company_name) VALUES (?, ?)", (code, name))
+
+
+def _export(conn, consumer):
+    """ndjson으로 내보낸 레코드 목록과 요약"""
+    out = io.StringIO()
+    summary = export_changes(conn, consumer, out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    return records, summary
+
+
+class _FailingOutput(io.StringIO):
+    """첫 기록에서 실패하는 출력 (디스크 부족 등)"""
+
+    def write(self, text):
+        raise OSError("disk full")
+
+
+def test_changed_then_deleted_key_exports_single_tombstone(conn):
+    _add_company(conn, 'C1', 'A')
+    _add_company(conn, 'C2', 'B')
+    _export(conn, 'nightly')
+
+    conn.execute("UPDATE companies SET company_name = 'A2' WHERE company_code = 'C1'")
+    conn.execute("DELETE FROM companies WHERE company_code = 'C1'")
+    records, summary = _export(conn, 'nightly')
+
+    assert summary['mode'] == 'changes'
+    assert [(record['table'], record['op'], record['key']) for record in records] == [
+        ('companies', 'delete', 'C1')
+    ]
+    assert (summary['upserts'], summary['deletes']) == (0, 1)
+
+
+def test_failed_export_does_not_advance_watermark(conn):
+    _add_company(conn, 'C1', 'A')
+    _, first = _export(conn, 'nightly')
+    _add_company(conn, 'C2', 'B')
+
+    with pytest.raises(OSError):
+        export_changes(conn, 'nightly', _FailingOutput())
+
+    assert not conn.in_transaction
+    assert get_consumer_cursor(conn, 'nightly') == first['next_cursor']
+    records, summary = _export(conn, 'nightly')
+    assert summary['cursor'] == first['next_cursor']
+    assert [record['key'] for record in records] == ['C2']
@@ -0,0 +1,48 @@
+"""
+tests/test_health.py
+
+기업 검색 인덱스의 rowid 독립성과 전체 점검의 검색 인덱스 복구 확인
+"""
+
+from database.health import run_full_audit
+from database.search import search_companies
+
+
+def _add_companies(conn):
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [('C1', '한빛전자'), ('C2', '푸른물산'), ('C3', '새솔기계')]
+    )
+
+
+def test_company_search_survives_rowid_change(conn):
+    _add_companies(conn)
+    # VACUUM처럼 rowid만 바뀌고 검색 인덱스 트리거는 실행되지 않는 경우
+    conn.execute("UPDATE companies SET rowid = rowid + 10")
+
+    assert list(search_companies(conn, '푸른')['업체코드']) == ['C2']
+
+
+def test_new_companies_get_distinct_search_ids(conn):
+    _add_companies(conn)
+    conn.execute("DELETE FROM companies WHERE company_code = 'C3'")
+    conn.execute("INSERT INTO companies (company_code, company_name) VALUES ('C4', '푸른바다')")
+
+    search_ids = [row[0] for row in conn.execute("SELECT search_id FROM companies ORDER BY company_code")]
+    assert len(set(search_ids)) == 3 and None not in search_ids
+    assert sorted(search_companies(conn, '푸른')['업체코드']) == ['C2', 'C4']
+
+
+def test_full_audit_rebuilds_out_of_sync_search_index(conn):
+    _add_companies(conn)
+    # 원본은 그대로 두고 인덱스에서만 한 기업을 지움
+    conn.execute('''
+        INSERT INTO companies_fts (companies_fts, rowid, company_name, address, products)
+        SELECT 'delete', search_id, company_name, address, products FROM companies WHERE company_code = 'C2'
+    ''')
+    assert search_companies(conn, '푸른').empty
+
+    audit = run_full_audit(conn)
+
+    assert audit['status'] == 'healthy'
+    assert list(search_companies(conn, '푸른')['업체코드']) == ['C2']
@@ -0,0 +1,68 @@
+"""
+tests/test_notifier.py
+
+변경 알림: 다른 연결의 커밋 감지, 구독자 전달 확인
+"""
+
+import sqlite3
+
+import pytest
+
+from database import notifier
+from database.changelog import CHANGE_LOG_TABLES, compact_change_log
+from database.notifier import get_table_generation, poll_changes, publish_changes, subscribe
+
+
+@pytest.fixture
+def connections(db_path, monkeypatch):
+    """(알림 전용 연결, 쓰기 연결) - 확인 기준점은 테스트마다 새로 시작"""
+    monkeypatch.setitem(notifier._poll_state, 'data_version', None)
+    monkeypatch.setitem(notifier._poll_state, 'seq', None)
+    reader = sqlite3.connect(db_path, isolation_level=None)
+    writer = sqlite3.connect(db_path, isolation_level=None)
+    yield reader, writer
+    reader.close()
+    writer.close()
+
+
+def test_poll_reports_changed_keys_from_other_connection(connections):
+    reader, writer = connections
+    assert poll_changes(reader) == {}  # 기준점 기록
+
+    writer.execute("INSERT INTO companies (company_code, company_name) VALUES ('C1', '한빛')")
+    writer.execute("UPDATE companies SET company_name = '한빛전자' WHERE company_code = 'C1'")
+    writer.execute("INSERT INTO companies (company_code, company_name) VALUES ('C2', '푸른')")
+
+    assert poll_changes(reader) == {'companies': {'C1', 'C2'}}
+    assert poll_changes(reader) == {}
+
+
+def test_poll_invalidates_everything_after_compaction_gap(connections):
+    reader, writer = connections
+    poll_changes(reader)
+
+    for i in range(5):
+        writer.execute("INSERT INTO companies (company_code, company_name) VALUES (?, ?)", (f'C{i}', f'기업{i}'))
+    compact_change_log(writer, max_rows=2)
+
+    assert poll_changes(reader) == {table: None for table in CHANGE_LOG_TABLES}
+
+
+def test_publish_filters_tables_and_isolates_failing_subscriber():
+    received = []
+
+    def failing(changes):
+        raise RuntimeError("boom")
+
+    unsubscribe_failing = subscribe(failing)
+    unsubscribe = subscribe(received.append, tables=['customer_contacts'])
+    generation = get_table_generation('customer_contacts')
+    try:
+        publish_changes({'companies': {'C1'}})
+        publish_changes({'companies': None, 'customer_contacts': {1}})
+    finally:
+        unsubscribe()
+        unsubscribe_failing()
+
+    assert received == [{'customer_contacts': {1}}]
+    assert get_table_generation('customer_contacts') == generation + 1
@@ -0,0 +1,59 @@
+"""
+tests/test_paging.py
+
+키셋 페이지 순회 결과가 전체 조회와 같은지 확인
+"""
+
+import pandas as pd
+import pytest
+
+from database.operations import (
+    get_companies_data,
+    get_consultations_data,
+    get_contacts_data,
+    get_integrated_data
+)
+from database.paging import iter_pages, keyset_condition
+
+
+def _rows(df):
+    """행 목록 (페이지마다 다를 수 있는 빈 값 표현/dtype 차이 제거)"""
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+@pytest.fixture
+def filled(conn):
+    # 같은 기업명, 같은 상담날짜, 날짜 없음처럼 정렬 키가 겹치는 행 포함
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [('C1', '한빛'), ('C2', '한빛'), ('C3', '가람'), ('C4', '푸른'), ('C5', '나래')]
+    )
+    conn.executemany(
+        "INSERT INTO customer_contacts (company_code, customer_name) VALUES (?, ?)",
+        [('C1', '김'), ('C1', '김'), ('C2', '이'), ('C3', '박'), ('C4', '최'), ('C4', '정')]
+    )
+    conn.executemany('''
+        INSERT INTO consultations (company_code, customer_name, consultation_date, consultation_content)
+        VALUES (?, '김', ?, '상담')
+    ''', [('C1', '2024-01-01'), ('C2', '2024-01-01'), ('C3', None), ('C4', '2024.02.01'),
+          ('C1', '2024-01-01'), ('C5', None), ('C3', '2023-12-31')])
+    return conn
+
+
+@pytest.mark.parametrize('loader', [
+    get_companies_data, get_contacts_data, get_consultations_data, get_integrated_data
+])
+def test_pages_concatenate_to_full_result(filled, loader):
+    full = loader(filled, compact=False)
+    pages = list(iter_pages(lambda c, **kwargs: loader(c, compact=False, **kwargs), filled, page_size=2))
+
+    assert len(pages) > 1
+    assert pages[-1].attrs['next_cursor'] is None
+    paged = pd.concat(pages, ignore_index=True)
+    assert list(paged.columns) == list(full.columns)
+    assert _rows(paged) == _rows(full)
+
+
+def test_cursor_must_match_keys():
+    with pytest.raises(ValueError):
+        keyset_condition(['company_name', 'company_code'], ('한빛',))
@@ -0,0 +1,58 @@
+"""
+tests/test_result_cache.py
+
+디스크 결과 캐시의 적중/테이블 버전 무효화 확인
+"""
+
+import sqlite3
+
+import pytest
+
+from database.result_cache import cached_result, get_cache_dir
+from database.settings import configure_database
+
+
+@pytest.fixture
+def file_database(db_path, tmp_path, monkeypatch):
+    """결과 캐시를 쓰는 파일 DB로 프로세스 설정 전환"""
+    monkeypatch.setenv('CRM_RESULT_CACHE_DIR', str(tmp_path / 'cache'))
+    configure_database(path=db_path)
+    yield db_path
+    configure_database(path=None)
+
+
+def _company_count(calls):
+    def compute(conn):
+        calls.append(1)
+        return conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+    return compute
+
+
+def test_cached_result_reused_until_table_changes(file_database):
+    calls = []
+    compute = _company_count(calls)
+
+    assert cached_result('company_count', ('companies',), compute) == 0
+    assert cached_result('company_count', ('companies',), compute) == 0
+    assert len(calls) == 1
+    assert get_cache_dir() is not None
+
+    writer = sqlite3.connect(file_database, isolation_level=None)
+    writer.execute("INSERT INTO companies (company_code, company_name) VALUES ('C1', '한빛')")
+    writer.close()
+
+    assert cached_result('company_count', ('companies',), compute) == 1
+    assert len(calls) == 2
+
+
+def test_unrelated_table_change_keeps_cached_result(file_database):
+    calls = []
+    compute = _company_count(calls)
+    cached_result('company_count', ('companies',), compute)
+
+    writer = sqlite3.connect(file_database, isolation_level=None)
+    writer.execute("INSERT INTO customer_contacts (customer_name) VALUES ('김철수')")
+    writer.close()
+
+    cached_result('company_count', ('companies',), compute)
+    assert len(calls) == 1
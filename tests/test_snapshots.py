@@ -0,0 +1,56 @@
+"""
+tests/test_snapshots.py
+
+테이블 스냅샷 증분 갱신 확인
+"""
+
+import sqlite3
+
+import pytest
+
+from database.contacts import link_consultation_contacts
+from database.snapshots import clear_snapshots, get_snapshot_stats, get_table_snapshot
+
+
+@pytest.fixture
+def writer(db_path):
+    """스냅샷과 다른 쓰기 연결 (커밋하면 스냅샷 연결의 data_version이 바뀜)"""
+    clear_snapshots()
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    connection.execute("INSERT INTO companies (company_code, company_name) VALUES ('C1', '한빛')")
+    connection.execute('''
+        INSERT INTO consultations (company_code, customer_name, consultation_date, consultation_content)
+        VALUES ('C1', '김철수', '2024-01-01', '견적 문의')
+    ''')
+    # 지난 시각으로 맞춰 두면 스냅샷은 그 이후(>) 변경만 읽음
+    connection.execute("UPDATE consultations SET updated_at = '2024-01-01 00:00:00'")
+    yield connection
+    connection.close()
+    clear_snapshots()
+
+
+def _snapshot(db_path, table):
+    return get_table_snapshot(table, connect=lambda: sqlite3.connect(db_path, isolation_level=None))
+
+
+def test_snapshot_picks_up_linked_contact_incrementally(db_path, writer):
+    assert _snapshot(db_path, 'consultations')['contact_id'].isna().all()
+
+    contact_id = writer.execute('''
+        INSERT INTO customer_contacts (company_code, customer_name) VALUES ('C1', '김철수')
+    ''').lastrowid
+    link_consultation_contacts(writer)
+
+    assert list(_snapshot(db_path, 'consultations')['contact_id']) == [contact_id]
+    stats = get_snapshot_stats()['consultations']
+    assert (stats['full_loads'], stats['incremental_loads']) == (1, 1)
+
+
+def test_snapshot_drops_unlinked_contact_after_delete(db_path, writer):
+    writer.execute("INSERT INTO customer_contacts (company_code, customer_name) VALUES ('C1', '김철수')")
+    link_consultation_contacts(writer)
+    assert _snapshot(db_path, 'consultations')['contact_id'].notna().all()
+
+    writer.execute("DELETE FROM customer_contacts")
+
+    assert _snapshot(db_path, 'consultations')['contact_id'].isna().all()
@@ -0,0 +1,54 @@
+"""
+tests/test_stats.py
+
+트리거로 유지되는 요약 통계와 재계산 결과 일치 확인
+"""
+
+from database.stats import get_company_stats, get_table_counts, rebuild_stats
+
+
+def _add_consultation(conn, company_code, date):
+    conn.execute('''
+        INSERT INTO consultations (company_code, customer_name, consultation_date, consultation_content)
+        VALUES (?, '김철수', ?, '상담')
+    ''', (company_code, date))
+
+
+def _snapshot(conn, company_codes):
+    return get_table_counts(conn), {code: get_company_stats(conn, code) for code in company_codes}
+
+
+def test_triggers_match_rebuild(conn):
+    conn.executemany(
+        "INSERT INTO companies (company_code, company_name) VALUES (?, ?)",
+        [('C1', '한빛'), ('C2', '푸른')]
+    )
+    conn.execute("INSERT INTO customer_contacts (company_code, customer_name) VALUES ('C1', '김철수')")
+    _add_consultation(conn, 'C1', '2024.05.01')
+    _add_consultation(conn, 'C1', '2024-03-01')
+    _add_consultation(conn, 'C2', '2024-01-01')
+    # 상담 이동과 삭제도 양쪽 기업 통계에 반영
+    conn.execute("UPDATE consultations SET company_code = 'C2' WHERE consultation_date = '2024-03-01'")
+    conn.execute("DELETE FROM consultations WHERE consultation_date = '2024-01-01'")
+
+    by_triggers = _snapshot(conn, ['C1', 'C2'])
+    assert by_triggers[0] == {'companies': 2, 'customer_contacts': 1, 'consultations': 2}
+    assert by_triggers[1]['C1'] == {
+        'contact_count': 1, 'consultation_count': 1, 'last_consultation_date': '2024.05.01'
+    }
+    assert by_triggers[1]['C2']['last_consultation_date'] == '2024-03-01'
+
+    rebuild_stats(conn)
+    assert _snapshot(conn, ['C1', 'C2']) == by_triggers
+
+
+def test_rebuild_corrects_drift(conn):
+    conn.execute("INSERT INTO companies (company_code, company_name) VALUES ('C1', '한빛')")
+    _add_consultation(conn, 'C1', '2024-01-01')
+    conn.execute("UPDATE stats SET row_count = 99 WHERE table_name = 'consultations'")
+    conn.execute("DELETE FROM company_stats")
+
+    counts = rebuild_stats(conn)
+
+    assert counts['consultations'] == 1
+    assert get_company_stats(conn, 'C1')['consultation_count'] == 1
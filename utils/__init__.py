@@ -6,5 +6,6 @@ CRM 애플리케이션의 유틸리티 모듈들
 
 __all__ = [
     'validators',
-    'file_handlers'
+    'file_handlers',
+    'import_budget'
 ]
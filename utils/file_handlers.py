@@ -8,6 +8,25 @@ import pandas as pd
 import io
 from datetime import datetime
 
+from database.result_cache import cached_result, register_warmer
+from database.snapshots import SNAPSHOT_VIEWS
+from database.operations import get_companies_data, get_contacts_data, get_consultations_data
+
+
+# 목록 다운로드: 데이터셋 → 시트명
+EXPORT_SHEETS = {
+    'companies': '기업목록',
+    'contacts': '고객연락처',
+    'consultations': '상담이력',
+}
+
+# 목록 다운로드: 데이터셋 → 조회 함수 (목록 화면과 같은 컬럼/정렬)
+EXPORT_LOADERS = {
+    'companies': get_companies_data,
+    'contacts': get_contacts_data,
+    'consultations': get_consultations_data,
+}
+
 
 def process_excel_file(uploaded_file):
     """
@@ -70,6 +89,34 @@ def create_excel_file(dataframes_dict):
     return output.getvalue()
 
 
+def _dataset_excel_builder(dataset):
+    """목록 엑셀 생성 함수 (cached_result의 compute, 버전을 읽은 트랜잭션의 conn으로 조회)"""
+    def build(conn):
+        return create_excel_file({EXPORT_SHEETS[dataset]: EXPORT_LOADERS[dataset](conn, compact=False)})
+    return build
+
+
+def create_dataset_excel(dataset):
+    """
+    목록 다운로드용 엑셀 파일 (디스크 결과 캐시)
+    
+    관련 테이블이 바뀌지 않았으면 재시작 후에도 저장된 파일을 그대로 사용합니다.
+    
+    Args:
+        dataset (str): 'companies', 'contacts', 'consultations'
+        
+    Returns:
+        bytes: 엑셀 파일의 바이트 데이터
+    """
+    tables = SNAPSHOT_VIEWS[dataset][0]
+    return cached_result(f"excel_{dataset}", tables, _dataset_excel_builder(dataset))
+
+
+# 시작 시 미리 생성 (start_cache_prewarm)
+for _dataset in EXPORT_SHEETS:
+    register_warmer(f"excel_{_dataset}", SNAPSHOT_VIEWS[_dataset][0], _dataset_excel_builder(_dataset))
+
+
 def generate_download_filename(base_name):
     """
     다운로드용 파일명 생성
@@ -0,0 +1,115 @@
+"""
+utils/import_budget.py
+
+시작 시 import 시간 예산 점검 (개발/배포 점검용)
+- python -X importtime 출력 파싱
+- 애플리케이션 모듈의 import 시간 합계를 예산과 비교
+- 페이지 모듈이 시작 시점에 미리 import되지 않는지 확인
+"""
+
+import os
+import subprocess
+import sys
+
+
+# 애플리케이션 패키지 (외부 라이브러리 import 시간은 제외)
+APP_PACKAGES = ('database', 'pages', 'components', 'utils')
+
+# main.py 시작 시 import 되는 모듈 (streamlit, pandas는 기준선으로 먼저 import)
+# main.py의 import를 바꾸면 함께 수정 (결과 캐시 등록 모듈은 백그라운드 스레드에서 import)
+STARTUP_STATEMENT = (
+    "import streamlit, pandas; "
+    "import database.connection, database.health, database.changelog, database.settings, "
+    "database.notifier, database.result_cache, pages, database.stats, database.companies"
+)
+
+# 애플리케이션 모듈 import 시간 예산 (밀리초)
+DEFAULT_BUDGET_MS = 150
+
+
+def measure_import_times(statement, cwd=None):
+    """
+    python -X importtime 으로 import 시간 측정
+
+    Args:
+        statement (str): 측정할 import 문
+        cwd (str): 실행 디렉토리 (기본값: 프로젝트 루트)
+
+    Returns:
+        list: (모듈명, 중첩 깊이, self_us, cumulative_us) 튜플 리스트
+    """
+    if cwd is None:
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=cwd,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        # 오류 메시지가 없으면 (출력 없이 종료, 시그널 등) 종료 코드로 보고
+        messages = [
+            line for line in result.stderr.strip().splitlines()
+            if not line.startswith('import time:')
+        ]
+        detail = messages[-1] if messages else f"종료 코드 {result.returncode}"
+        raise Exception(f"import 실패: {detail}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # 모듈명 앞 공백 2칸이 중첩 한 단계
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    return entries
+
+
+def check_import_budget(budget_ms=DEFAULT_BUDGET_MS, statement=STARTUP_STATEMENT):
+    """
+    애플리케이션 시작 import 시간이 예산 이내인지 점검
+
+    Args:
+        budget_ms (float): 애플리케이션 모듈 import 시간 예산 (밀리초)
+        statement (str): 측정할 import 문
+
+    Returns:
+        dict: 점검 결과 (총 시간, 예산, 미리 import된 페이지 모듈, 느린 모듈 목록)
+    """
+    entries = measure_import_times(statement)
+
+    app_entries = [e for e in entries if e[0].split('.')[0] in APP_PACKAGES]
+    # 최상위 애플리케이션 모듈의 누적 시간만 합산 (중복 집계 방지)
+    total_us = sum(e[3] for e in app_entries if e[1] == 0)
+
+    eager_pages = [e[0] for e in app_entries if e[0].startswith('pages.')]
+    slowest = sorted(app_entries, key=lambda e: e[2], reverse=True)[:10]
+
+    total_ms = total_us / 1000
+    return {
+        'total_ms': total_ms,
+        'budget_ms': budget_ms,
+        'eager_pages': eager_pages,
+        'slowest': [(name, self_us / 1000) for name, _, self_us, _ in slowest],
+        'passed': total_ms <= budget_ms and not eager_pages
+    }
+
+
+if __name__ == "__main__":
+    # 직접 실행 시 점검 (예산 초과 시 종료 코드 1)
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    report = check_import_budget(budget)
+
+    print("=== 시작 import 시간 점검 ===")
+    print(f"애플리케이션 모듈: {report['total_ms']:.1f}ms / 예산 {report['budget_ms']:.0f}ms")
+    if report['eager_pages']:
+        print(f"시작 시 import된 페이지 모듈: {', '.join(report['eager_pages'])}")
+    print("\n=== 느린 모듈 (self) ===")
+    for name, self_ms in report['slowest']:
+        print(f"{name}: {self_ms:.1f}ms")
+
+    sys.exit(0 if report['passed'] else 1)